@@ -3,62 +3,64 @@
 Script to analyze time-absence-ontology.yaml and identify entities missing:
 1. SCD Type 2 fields (effective_start_date, effective_end_date, is_current_flag)
 2. Audit fields (created_by, updated_by)
+
+The file is read in one streaming pass: the `entities:` section is split into
+blocks as lines arrive and each block is checked as soon as it ends, so only
+one entity is held in memory (merged multi-megabyte ontologies included).
+
+Usage: python3 analyze-missing-fields.py [ontology.yaml]
 """
 
-import yaml
-import re
+import sys
+import time
+from pathlib import Path
 
-# Read the ontology file
-with open('time-absence-ontology.yaml', 'r', encoding='utf-8') as f:
-    content = f.read()
+TOOLS_DIR = next((p / '_tools' for p in Path(__file__).resolve().parents if (p / '_tools').is_dir()), None)
+if TOOLS_DIR is not None:
+    sys.path.insert(0, str(TOOLS_DIR))
 
-# Extract entity names from the entities section
-entity_pattern = r'^  (\w+):\s*$'
-entities = re.findall(entity_pattern, content, re.MULTILINE)
+from onto_index import iter_outline_entities
 
-print("=" * 80)
-print("ENTITY AUDIT ANALYSIS")
-print("=" * 80)
-print(f"\nTotal entities found: {len(entities)}\n")
+ontology_file = Path(sys.argv[1] if len(sys.argv) > 1 else 'time-absence-ontology.yaml')
 
-# Check each entity for missing fields
+SCD2_FIELDS = {'effective_start_date', 'effective_end_date', 'is_current_flag'}
+TEMPORAL_HINTS = {'effectiveStart', 'effectiveDate'}
+
+# Check each entity block for missing fields as it is streamed
+entities = []
 missing_scd2 = []
 missing_audit_created_by = []
 missing_audit_updated_by = []
 has_all_fields = []
 
-for entity in entities:
-    # Find entity block
-    entity_pattern = rf'^  {entity}:\s*\n(.*?)(?=^  \w+:|^architecture:|^design_patterns:|$)'
-    match = re.search(entity_pattern, content, re.MULTILINE | re.DOTALL)
-    
-    if match:
-        entity_block = match.group(1)
-        
-        # Check for SCD Type 2 fields
-        has_effective_start = 'effective_start_date:' in entity_block
-        has_effective_end = 'effective_end_date:' in entity_block
-        has_current_flag = 'is_current_flag:' in entity_block
-        
-        # Check for audit fields
-        has_created_by = 'created_by:' in entity_block
-        has_updated_by = 'updated_by:' in entity_block
-        
-        # Categorize
-        if not (has_effective_start and has_effective_end and has_current_flag):
-            # Check if it should have SCD2 (temporal entities)
-            # Entities with effectiveStart/effectiveEnd or effective dates should have SCD2
-            if 'effectiveStart:' in entity_block or 'effectiveDate:' in entity_block:
-                missing_scd2.append(entity)
-        
+started = time.perf_counter()
+with open(ontology_file, 'r', encoding='utf-8') as f:
+    for entity, _, _, _, attrs, _ in iter_outline_entities(f):
+        entities.append(entity)
+        attributes = {attr[0] for attr in attrs}
+
+        # SCD Type 2: temporal entities (effectiveStart/effectiveDate) need the full set
+        if not SCD2_FIELDS <= attributes and attributes & TEMPORAL_HINTS:
+            missing_scd2.append(entity)
+
+        # Audit fields
+        has_created_by = 'created_by' in attributes
+        has_updated_by = 'updated_by' in attributes
         if not has_created_by:
             missing_audit_created_by.append(entity)
-        
         if not has_updated_by:
             missing_audit_updated_by.append(entity)
-        
         if has_created_by and has_updated_by:
             has_all_fields.append(entity)
+elapsed = time.perf_counter() - started
+
+if not entities:
+    sys.exit(f"No entities found in {ontology_file}")
+
+print("=" * 80)
+print("ENTITY AUDIT ANALYSIS")
+print("=" * 80)
+print(f"\nTotal entities found: {len(entities)}\n")
 
 print("✅ ENTITIES WITH COMPLETE AUDIT TRAIL:")
 print("-" * 80)
@@ -92,4 +94,5 @@ print(f"Complete Audit Trail: {len(has_all_fields)} ({len(has_all_fields)*100//l
 print(f"Missing created_by: {len(missing_audit_created_by)} ({len(missing_audit_created_by)*100//len(entities)}%)")
 print(f"Missing updated_by: {len(missing_audit_updated_by)} ({len(missing_audit_updated_by)*100//len(entities)}%)")
 print(f"Potentially need SCD2: {len(missing_scd2)}")
+print(f"Scanned {ontology_file.stat().st_size / 1024:.1f} KB in {elapsed * 1000:.1f}ms (single streaming pass)")
 print("=" * 80)
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """
-Fix all issues identified in ONTOLOGY-REVIEW.md for time-absence-ontology.yaml
+Fix all issues identified in ONTOLOGY-REVIEW.md for time-absence-ontology.yaml,
+and apply the generic fix rules to any other module ontology (CO, TR, PR, ...)
 
 This script:
 1. Converts all list-format attributes to dictionary format
@@ -10,87 +11,184 @@ This script:
 5. Adds missing entities
 6. Standardizes relationship notation
 7. Adds notes and metadata sections
+
+Steps 1-4 are fix rules (see RULE ENGINE below) applied to every entity in a
+single traversal; add a rule by decorating a function with @rule. Steps 5-7
+are specific to the TA ontology (`code: TA`).
+
+Usage:
+    python3 fix-ontology.py                                   # TA ontology
+    python3 fix-ontology.py '01-modules/*/**/00-ontology/*.yaml' -j 4
+    python3 fix-ontology.py a.yaml b.yaml --in-place
+    python3 fix-ontology.py --dry-run --format diff           # review the minimal edit
+    python3 fix-ontology.py --dry-run --format json > fixes.json
+
+Each file is fixed in its own worker process and written atomically to
+<name>-fixed.yaml (or in place). Files are edited round-trip
+(docs/_tools/yaml_roundtrip.py): the structural changes are recorded as a JSON
+patch and only the changed nodes are spliced into the original text, so
+comments, key order and formatting elsewhere are kept. --dry-run writes
+nothing and can print the patch (a saved patch can be applied later with
+docs/_tools/yaml_patch.py); the run ends with a per-file summary.
 """
 
-import yaml
+import argparse
+import contextlib
+import difflib
+import glob
+import io
+import json
+import os
 import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime
-from collections import OrderDict
+from typing import Callable
+
+TOOLS_DIR = next((p / '_tools' for p in Path(__file__).resolve().parents if (p / '_tools').is_dir()), None)
+if TOOLS_DIR is not None:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+from yaml_loader import YAMLError
+from yaml_patch import PatchError, summarize
+from yaml_roundtrip import RoundTripDocument
+
+DEFAULT_INPUT = Path(__file__).resolve().parents[1] / "time-absence-ontology.yaml"
+
+# =============================================================================
+# RULE ENGINE
+# =============================================================================
+# Fix rules are registered with @rule and applied to every entity in a single
+# traversal. Match predicates (entity names, required keys, attribute shape)
+# are declared on the rule; RuleEngine compiles them into a per-entity-name
+# dispatch table so each entity only visits the rules that can apply to it.
+# A rule returns True when it changed the entity (counted as a hit).
+
+SCD2_ENTITIES = frozenset([
+    'ShiftDefinition', 'PatternTemplate', 'ScheduleAssignment',
+    'LeaveType', 'LeaveBalance', 'DayModel', 'TimeSegment'
+])
+
+FK_INDEX_COLUMNS = ['worker_id', 'employee_id', 'leave_type_id', 'shift_id', 'pattern_id']
+
+
+@dataclass
+class Rule:
+    name: str
+    fn: Callable[[str, dict], bool]
+    entities: frozenset | None = None   # only these entity names (None = all)
+    requires: tuple = ()                # keys the entity must have
+    attributes: str | None = None       # 'dict' / 'list': required attributes shape
+    when: Callable[[str, dict], bool] | None = None
+
+    def matches(self, entity_data):
+        if any(key not in entity_data for key in self.requires):
+            return False
+        if self.attributes == 'dict' and not isinstance(entity_data.get('attributes'), dict):
+            return False
+        if self.attributes == 'list' and not isinstance(entity_data.get('attributes'), list):
+            return False
+        return True
+
+
+RULES = []
+
+
+def rule(name=None, entities=None, requires=(), attributes=None, when=None):
+    """Register a fix rule; rules run in registration order."""
+    def register(fn):
+        RULES.append(Rule(
+            name or fn.__name__, fn,
+            frozenset(entities) if entities is not None else None,
+            tuple(requires), attributes, when,
+        ))
+        return fn
+    return register
 
-def load_yaml_preserve_order(filepath):
-    """Load YAML file preserving order."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
 
-def convert_list_attributes_to_dict(entity_data):
+class RuleEngine:
+    """Apply registered rules to entities, collecting per-rule timing and hits."""
+
+    def __init__(self, rules=None):
+        self.rules = list(RULES if rules is None else rules)
+        self._dispatch = {}
+        self.calls = {r.name: 0 for r in self.rules}
+        self.hits = {r.name: 0 for r in self.rules}
+        self.seconds = {r.name: 0.0 for r in self.rules}
+
+    def rules_for(self, entity_name):
+        """Rules that can apply to this entity name (compiled once per name)."""
+        rules = self._dispatch.get(entity_name)
+        if rules is None:
+            rules = tuple(r for r in self.rules if r.entities is None or entity_name in r.entities)
+            self._dispatch[entity_name] = rules
+        return rules
+
+    def apply(self, entity_name, entity_data):
+        """Run every matching rule on one entity; returns the names of rules that changed it."""
+        changed = []
+        for r in self.rules_for(entity_name):
+            if not r.matches(entity_data) or (r.when is not None and not r.when(entity_name, entity_data)):
+                continue
+            started = time.perf_counter()
+            hit = r.fn(entity_name, entity_data)
+            self.seconds[r.name] += time.perf_counter() - started
+            self.calls[r.name] += 1
+            if hit:
+                self.hits[r.name] += 1
+                changed.append(r.name)
+        return changed
+
+    def report(self):
+        print(f"\n⏱️  Rule statistics:")
+        print(f"   {'rule':<32} {'calls':>6} {'hits':>6} {'ms':>8}")
+        for r in self.rules:
+            print(f"   {r.name:<32} {self.calls[r.name]:>6} {self.hits[r.name]:>6} {self.seconds[r.name] * 1000:>8.2f}")
+
+
+def _parse_attribute_spec(attr_name, attr_spec):
+    """Parse a "string (UUID)" style spec into an attribute definition."""
+    return {
+        'type': attr_spec.split('(')[0].strip(),
+        'required': 'nullable' not in attr_spec.lower(),
+        'description': f"{attr_name} field"
+    }
+
+
+@rule(name='convert_list_attributes', attributes='list')
+def convert_list_attributes_to_dict(entity_name, entity_data):
     """Convert list-format attributes to dictionary format."""
-    if 'attributes' not in entity_data:
-        return entity_data
-    
-    attributes = entity_data['attributes']
-    
-    # Check if already in dict format
-    if isinstance(attributes, dict):
-        return entity_data
-    
-    # Convert from list to dict
     new_attributes = {}
-    
-    for attr_item in attributes:
+
+    for attr_item in entity_data['attributes']:
         if isinstance(attr_item, str):
             # Parse string like "id: string (UUID)"
             parts = attr_item.split(':', 1)
             if len(parts) == 2:
                 attr_name = parts[0].strip()
-                attr_spec = parts[1].strip()
-                
-                # Extract type and other info
-                type_info = attr_spec.split('(')[0].strip()
-                
-                new_attributes[attr_name] = {
-                    'type': type_info,
-                    'required': 'nullable' not in attr_spec.lower(),
-                    'description': f"{attr_name} field"
-                }
+                new_attributes[attr_name] = _parse_attribute_spec(attr_name, parts[1].strip())
         elif isinstance(attr_item, dict):
             # Already partially structured
             for attr_name, attr_value in attr_item.items():
                 if isinstance(attr_value, str):
                     # Parse "string (UUID)" format
-                    type_info = attr_value.split('(')[0].strip()
-                    new_attributes[attr_name] = {
-                        'type': type_info,
-                        'required': 'nullable' not in attr_value.lower(),
-                        'description': f"{attr_name} field"
-                    }
+                    new_attributes[attr_name] = _parse_attribute_spec(attr_name, attr_value)
                 else:
                     new_attributes[attr_name] = attr_value
-    
+
     entity_data['attributes'] = new_attributes
-    return entity_data
-
-def add_scd2_fields(entity_data, entity_name):
-    """Add SCD Type 2 fields if entity should have them."""
-    scd2_entities = [
-        'ShiftDefinition', 'PatternTemplate', 'ScheduleAssignment',
-        'LeaveType', 'LeaveBalance', 'DayModel', 'TimeSegment'
-    ]
-    
-    if entity_name not in scd2_entities:
-        return entity_data
-    
-    if 'attributes' not in entity_data or not isinstance(entity_data['attributes'], dict):
-        return entity_data
-    
-    attributes = entity_data['attributes']
-    
-    # Check if already has SCD2 fields
-    if 'effective_start_date' in attributes:
-        return entity_data
-    
-    # Add SCD Type 2 fields
-    scd2_fields = {
+    return True
+
+
+@rule(name='scd2_fields', entities=SCD2_ENTITIES, attributes='dict',
+      when=lambda name, data: 'effective_start_date' not in data['attributes'])
+def add_scd2_fields(entity_name, entity_data):
+    """Add SCD Type 2 fields to temporal entities."""
+    # Add after other fields but before audit fields
+    entity_data['attributes'].update({
         'effective_start_date': {
             'type': 'date',
             'required': True,
@@ -107,20 +205,16 @@ def add_scd2_fields(entity_data, entity_name):
             'default': True,
             'description': 'Flag indicating if this is the current version'
         }
-    }
-    
-    # Add after other fields but before audit fields
-    attributes.update(scd2_fields)
-    
-    return entity_data
+    })
+    return True
+
 
-def add_audit_fields(entity_data):
+@rule(name='audit_fields', attributes='dict')
+def add_audit_fields(entity_name, entity_data):
     """Add complete audit trail fields."""
-    if 'attributes' not in entity_data or not isinstance(entity_data['attributes'], dict):
-        return entity_data
-    
     attributes = entity_data['attributes']
-    
+    changed = False
+
     # Add created_by if missing
     if 'created_by' not in attributes and 'createdBy' not in attributes:
         attributes['created_by'] = {
@@ -128,7 +222,8 @@ def add_audit_fields(entity_data):
             'required': True,
             'description': 'User who created this record'
         }
-    
+        changed = True
+
     # Add updated_by if missing
     if 'updated_by' not in attributes and 'updatedBy' not in attributes:
         attributes['updated_by'] = {
@@ -136,61 +231,62 @@ def add_audit_fields(entity_data):
             'required': False,
             'description': 'User who last updated this record'
         }
-    
-    return entity_data
+        changed = True
+
+    return changed
+
 
-def add_indexes(entity_data, entity_name):
+@rule(name='indexes', requires=('attributes',))
+def add_indexes(entity_name, entity_data):
     """Add index definitions."""
-    if 'attributes' not in entity_data:
-        return entity_data
-    
     indexes = []
-    attributes = entity_data.get('attributes', {})
-    
+    attributes = entity_data['attributes']
+    table = entity_name.lower()
+
     # Primary key index
     if 'id' in attributes:
         indexes.append({
-            'name': f"pk_{entity_name.lower()}",
+            'name': f"pk_{table}",
             'columns': ['id'],
             'type': 'primary_key'
         })
-    
+
     # Unique code index
     if 'code' in attributes:
         indexes.append({
-            'name': f"uq_{entity_name.lower()}_code",
+            'name': f"uq_{table}_code",
             'columns': ['code'],
             'unique': True
         })
-    
+
     # SCD Type 2 current version index
     if 'is_current_flag' in attributes and 'code' in attributes:
         indexes.append({
-            'name': f"idx_{entity_name.lower()}_current",
+            'name': f"idx_{table}_current",
             'columns': ['code', 'is_current_flag'],
             'where': 'is_current_flag = TRUE'
         })
-    
+
     # Effective dates index
     if 'effective_start_date' in attributes:
         indexes.append({
-            'name': f"idx_{entity_name.lower()}_dates",
+            'name': f"idx_{table}_dates",
             'columns': ['effective_start_date', 'effective_end_date']
         })
-    
+
     # Foreign key indexes (common patterns)
-    fk_patterns = ['worker_id', 'employee_id', 'leave_type_id', 'shift_id', 'pattern_id']
-    for fk in fk_patterns:
+    for fk in FK_INDEX_COLUMNS:
         if fk in attributes:
             indexes.append({
-                'name': f"idx_{entity_name.lower()}_{fk}",
+                'name': f"idx_{table}_{fk}",
                 'columns': [fk]
             })
-    
-    if indexes:
-        entity_data['indexes'] = indexes
-    
-    return entity_data
+
+    if not indexes or entity_data.get('indexes') == indexes:
+        return False
+    entity_data['indexes'] = indexes
+    return True
+
 
 def create_missing_entities():
     """Create definitions for missing entities."""
@@ -361,61 +457,27 @@ def create_missing_entities():
     
     return missing_entities
 
-def main():
-    """Main execution function."""
-    print("🔧 Starting Time & Absence Ontology Fix Process...")
-    print("="*80)
-    
-    # Define file paths
-    base_path = Path("c:/Users/LAP15399-local/OneDrive - VNG Corporation/Apps/mygit/a4b-doc-xtalent/product/xTalent/docs/01-modules/TA/00-ontology")
-    
-    input_file = base_path / "time-absence-ontology.yaml"
-    output_file = base_path / "time-absence-ontology-fixed.yaml"
-    
-    # Load current ontology
-    print(f"\n📖 Loading ontology from: {input_file.name}")
-    data = load_yaml_preserve_order(input_file)
-    
-    # Process each entity
-    print(f"\n🔄 Processing entities...")
-    entities = data.get('entities', {})
-    processed_count = 0
-    
-    for entity_name, entity_data in entities.items():
-        print(f"   Processing: {entity_name}")
-        
-        # 1. Convert list attributes to dict
-        entity_data = convert_list_attributes_to_dict(entity_data)
-        
-        # 2. Add SCD Type 2 fields
-        entity_data = add_scd2_fields(entity_data, entity_name)
-        
-        # 3. Add audit fields
-        entity_data = add_audit_fields(entity_data)
-        
-        # 4. Add indexes
-        entity_data = add_indexes(entity_data, entity_name)
-        
-        entities[entity_name] = entity_data
-        processed_count += 1
-    
-    print(f"   ✅ Processed {processed_count} entities")
-    
-    # Add missing entities
+def fix_ta_document(data, entities):
+    """TA-specific fixes from ONTOLOGY-REVIEW.md: missing entities, notes, design patterns.
+
+    Returns (added, replaced) entity counts.
+    """
     print(f"\n➕ Adding missing entities...")
     missing = create_missing_entities()
+    replaced = 0
     for entity_name, entity_data in missing.items():
         print(f"   Adding: {entity_name}")
+        replaced += entity_name in entities
         entities[entity_name] = entity_data
-        
+
         # Update sub_modules
         if entity_name in ['HolidayCalendar', 'TimeException', 'ClockEvent', 'Timesheet', 'TimesheetEntry']:
-            if 'TimeAttendance' in data['sub_modules']:
+            if 'TimeAttendance' in data.get('sub_modules', {}):
                 if entity_name not in data['sub_modules']['TimeAttendance']['entities']:
                     data['sub_modules']['TimeAttendance']['entities'].append(entity_name)
-    
-    print(f"   ✅ Added {len(missing)} entities")
-    
+
+    print(f"   ✅ Added {len(missing)} entities ({replaced} replaced existing definitions)")
+
     # Add notes section
     data['notes'] = {
         'version': '2.0',
@@ -434,41 +496,219 @@ def main():
             'description': 'TA module depends on Core module for worker and organizational data'
         }
     }
-    
+
     # Update design patterns
-    if 'design_patterns' in data:
+    if 'ledger_pattern' in data.get('design_patterns', {}):
         # Fix ledger pattern references
         data['design_patterns']['ledger_pattern']['applies_to'] = [
             'LeaveBalance',
             'LeaveMovement'
         ]
-    
-    # Save fixed ontology
-    print(f"\n💾 Saving fixed ontology to: {output_file.name}")
-    
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(f"# Time & Absence Module (TA) - Ontology (Fixed)\n")
-        f.write(f"# Version: 2.0\n")
-        f.write(f"# Last Updated: {datetime.now().strftime('%Y-%m-%d')}\n")
-        f.write(f"# Status: All ONTOLOGY-REVIEW issues fixed\n\n")
-        
-        yaml.dump(data, f,
-                 default_flow_style=False,
-                 allow_unicode=True,
-                 sort_keys=False,
-                 width=100,
-                 indent=2)
-    
-    print(f"\n✅ Fix completed successfully!")
-    print(f"\n📊 Summary:")
-    print(f"   - Entities processed: {processed_count}")
-    print(f"   - Entities added: {len(missing)}")
-    print(f"   - Total entities: {len(entities)}")
-    print(f"\n📝 Next steps:")
-    print(f"   1. Review the fixed file: {output_file}")
-    print(f"   2. Test YAML parsing")
-    print(f"   3. Validate against standards")
-    print(f"   4. Replace original file if satisfied")
+
+    return len(missing) - replaced, replaced
+
+
+def output_path_for(input_file, mode='fixed'):
+    """Where the fixed ontology is written: in place, or <name>-fixed.yaml beside it."""
+    if mode == 'in-place':
+        return input_file
+    return input_file.with_name(f"{input_file.stem}-fixed{input_file.suffix}")
+
+
+def fix_file(input_file, mode='fixed', fmt='summary'):
+    """Process-pool worker: fix one ontology file. Returns (log, result).
+
+    mode: 'fixed' (write <name>-fixed.yaml), 'in-place' (patch the input) or
+    'dry-run' (write nothing). Files are written by splicing only the changed
+    nodes into the original text.
+    """
+    input_file = Path(input_file)
+    output_file = output_path_for(input_file, mode)
+    result = {
+        'file': str(input_file), 'output': None, 'status': 'ok', 'error': None,
+        'processed': 0, 'added': 0, 'replaced': 0, 'total': 0, 'seconds': 0.0,
+        'rules': {}, 'patch': [], 'diff': '',
+    }
+    started = time.perf_counter()
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        try:
+            _fix_file(input_file, output_file, mode, fmt, result)
+        except YAMLError as e:
+            mark = getattr(e, 'problem_mark', None)
+            where = f" at line {mark.line + 1}" if mark else ""
+            result['status'], result['error'] = 'error', f"YAML error{where}: {getattr(e, 'problem', None) or e}"
+            print(f"   ❌ {result['error']}")
+        except PatchError as e:
+            result['status'], result['error'] = 'error', f"Patch error: {e}"
+            print(f"   ❌ {result['error']}")
+        except Exception:
+            result['status'], result['error'] = 'error', traceback.format_exc().strip().splitlines()[-1]
+            print(f"   ❌ Fix crashed:\n{traceback.format_exc()}")
+    result['seconds'] = time.perf_counter() - started
+    return buffer.getvalue(), result
+
+
+def _fix_file(input_file, output_file, mode, fmt, result):
+    print(f"\n{'='*80}")
+    print(f"📖 Loading ontology from: {input_file}")
+    doc = RoundTripDocument.load(input_file)
+    data = doc.data
+
+    entities = data.get('entities') if isinstance(data, dict) else None
+    if not isinstance(entities, dict):
+        result['status'] = 'skipped'
+        print(f"   ⏭️  No 'entities:' mapping; nothing to fix")
+        return
+
+    # Process each entity: one traversal, every matching rule applied per entity
+    print(f"\n🔄 Processing entities...")
+    engine = RuleEngine()
+    for entity_name, entity_data in entities.items():
+        changed = engine.apply(entity_name, entity_data)
+        print(f"   Processing: {entity_name}" + (f" ({', '.join(changed)})" if changed else ""))
+        result['processed'] += 1
+
+    print(f"   ✅ Processed {result['processed']} entities")
+    engine.report()
+    result['rules'] = {r.name: (engine.calls[r.name], engine.hits[r.name], engine.seconds[r.name]) for r in engine.rules}
+
+    if data.get('code') == 'TA':
+        result['added'], result['replaced'] = fix_ta_document(data, entities)
+    result['total'] = len(entities)
+
+    # Structural changes only: a JSON patch spliced into the original text,
+    # so comments, key order and formatting outside the changed nodes survive
+    ops = doc.changes()
+    result['patch'] = ops
+    print(f"\n🧩 {len(ops)} change(s):")
+    for group, changes in summarize(ops).items():
+        print(f"   {group}: {len(changes)} ({', '.join(changes[:4])}{', ...' if len(changes) > 4 else ''})")
+    if fmt == 'diff':
+        patched = doc.dumps()
+        result['diff'] = ''.join(difflib.unified_diff(
+            doc.text.replace('\r\n', '\n').splitlines(True), patched.replace('\r\n', '\n').splitlines(True),
+            fromfile=f"{input_file} (original)", tofile=f"{input_file} (fixed)"))
+    if mode == 'dry-run':
+        return
+
+    # Temp file + rename, never a half-written file; in place only when something changed
+    print(f"\n💾 Saving fixed ontology to: {output_file}")
+    if doc.save(output_file, force=(mode == 'fixed')):
+        result['output'] = str(output_file)
+
+
+def expand_inputs(patterns):
+    """Expand file arguments and glob patterns (`**` allowed), keeping order, no duplicates."""
+    files = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        if not matches:
+            print(f"⚠️  No files match: {pattern}")
+        for match in matches:
+            path = Path(match)
+            if path.stem.endswith('-fixed') or path in files:
+                continue
+            files.append(path)
+    return files
+
+
+def print_batch_summary(results, elapsed):
+    print(f"\n{'='*80}")
+    print(f"📊 Summary:")
+    print(f"   {'file':<60} {'status':<8} {'processed':>9} {'added':>6} {'total':>6} {'seconds':>8}")
+    for r in results:
+        label = r['file'] if len(r['file']) <= 60 else '...' + r['file'][-57:]
+        print(f"   {label:<60} {r['status']:<8} {r['processed']:>9} {r['added']:>6} {r['total']:>6} {r['seconds']:>8.2f}")
+    print(f"   {'-'*102}")
+    ok = [r for r in results if r['status'] == 'ok']
+    print(f"   - Files fixed: {len(ok)}/{len(results)}"
+          f" ({sum(r['status'] == 'skipped' for r in results)} skipped,"
+          f" {sum(r['status'] == 'error' for r in results)} failed)")
+    print(f"   - Entities processed: {sum(r['processed'] for r in results)}")
+    print(f"   - Entities added: {sum(r['added'] for r in results)}")
+    print(f"   - Elapsed: {elapsed:.2f}s (slowest file {max((r['seconds'] for r in results), default=0):.2f}s)")
+
+    # Aggregate rule statistics over every file
+    totals = {}
+    for r in results:
+        for name, (calls, hits, seconds) in r['rules'].items():
+            c, h, s = totals.get(name, (0, 0, 0.0))
+            totals[name] = (c + calls, h + hits, s + seconds)
+    if len(results) > 1 and totals:
+        print(f"\n⏱️  Rule statistics (all files):")
+        print(f"   {'rule':<32} {'calls':>6} {'hits':>6} {'ms':>8}")
+        for name, (calls, hits, seconds) in totals.items():
+            print(f"   {name:<32} {calls:>6} {hits:>6} {seconds * 1000:>8.2f}")
+
+    for r in results:
+        if r['output']:
+            print(f"   ✅ {r['output']}")
+        elif r['error']:
+            print(f"   ❌ {r['file']}: {r['error']}")
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(
+        description="Fix ontology review issues in one or more ontology YAML files.")
+    parser.add_argument('files', nargs='*',
+                        help="Ontology files or glob patterns, e.g. '01-modules/*/**/00-ontology/*.yaml' "
+                             "(default: time-absence-ontology.yaml next to this directory)")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--in-place', action='store_true',
+                      help="Patch the input files instead of writing <name>-fixed.yaml "
+                           "(comments and formatting elsewhere are kept)")
+    mode.add_argument('--dry-run', action='store_true',
+                      help="Write nothing; report the structural changes per entity")
+    parser.add_argument('--format', choices=['summary', 'json', 'diff'], default='summary',
+                        help="With --dry-run/--in-place: also print a JSON patch ({file: [ops]}) "
+                             "or a unified diff of the minimal edit")
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help="Worker processes (default: CPU count, 1 = no pool)")
+    parser.add_argument('-q', '--quiet', action='store_true', help="Only print the summary")
+    args = parser.parse_args()
+
+    mode = 'in-place' if args.in_place else 'dry-run' if args.dry_run else 'fixed'
+    files = expand_inputs(args.files or [str(DEFAULT_INPUT)])
+    if not files:
+        print("❌ No ontology files to process")
+        return 1
+
+    # With --format json/diff stdout carries only the patch; progress goes to stderr
+    log_stream = sys.stdout if args.format == 'summary' else sys.stderr
+    print(f"🔧 Starting Ontology Fix Process ({len(files)} file(s))...", file=log_stream)
+    print("="*80, file=log_stream)
+
+    started = time.perf_counter()
+    jobs = min(args.jobs or os.cpu_count() or 1, len(files))
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            outcomes = list(pool.map(fix_file, files, [mode] * len(files), [args.format] * len(files)))
+    else:
+        outcomes = [fix_file(f, mode, args.format) for f in files]
+    elapsed = time.perf_counter() - started
+
+    results = []
+    for log, result in outcomes:
+        if not args.quiet and args.format == 'summary':
+            print(log, end='')
+        results.append(result)
+
+    for r in results:
+        if r['status'] == 'error' and args.format != 'summary':
+            print(f"❌ {r['file']}: {r['error']}", file=sys.stderr)
+    if args.format == 'json':
+        # Every file that was checked gets an entry, [] when it needs no fixes
+        json.dump({r['file']: r['patch'] for r in results if r['status'] != 'error'}, sys.stdout, indent=2, ensure_ascii=False, default=str)
+        print()
+        return 1 if any(r['status'] == 'error' for r in results) else 0
+    if args.format == 'diff':
+        sys.stdout.write(''.join(r['diff'] for r in results))
+        return 1 if any(r['status'] == 'error' for r in results) else 0
+
+    print_batch_summary(results, elapsed)
+    return 1 if any(r['status'] == 'error' for r in results) else 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
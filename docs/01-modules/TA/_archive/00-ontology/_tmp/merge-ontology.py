@@ -1,152 +1,359 @@
 #!/usr/bin/env python3
 """
-Merge Time & Attendance and Absence ontology files into a single unified ontology.
-This script reads both YAML files and creates a consolidated ontology following
-the MODULE-DOCUMENTATION-STANDARDS.md template.
+Merge module ontology files into a single unified ontology.
+
+With no arguments, merge the Time & Attendance and Absence ontologies into
+time-absence-ontology.yaml, following the MODULE-DOCUMENTATION-STANDARDS.md
+template. You can instead pass any number of module ontologies, e.g. the
+CO and TR legacy ones:
+
+    python3 merge-ontology.py
+    python3 merge-ontology.py a.yaml b.yaml c.yaml -o unified.yaml --module Unified --code UN
+    python3 merge-ontology.py a.yaml b.yaml --on-conflict fail --dry-run
+
+Inputs are loaded in parallel, one process per file. Entities are indexed by
+name and by a canonical content hash:
+- an entity defined identically in several files is kept once;
+- an entity with differing definitions is a conflict. Conflicts are reported
+  with a field-level diff and resolved by --on-conflict.
 """
 
-import yaml
+import argparse
+import os
+import re
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 from datetime import datetime
 
-def load_yaml_file(filepath):
-    """Load YAML file and return parsed content."""
+TOOLS_DIR = next((p / '_tools' for p in Path(__file__).resolve().parents if (p / '_tools').is_dir()), None)
+if TOOLS_DIR is not None:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+from content_cache import hash_key
+from yaml_loader import YAMLError, safe_load
+from yaml_patch import PatchError, make_patch
+from yaml_roundtrip import RoundTripDocument
+
+ONTOLOGY_DIR = Path(__file__).resolve().parents[1]
+TA_FILE = ONTOLOGY_DIR / "time-attendance-ontology.yaml"
+ABSENCE_FILE = ONTOLOGY_DIR / "absence-ontology.yaml"
+OUTPUT_FILE = ONTOLOGY_DIR / "time-absence-ontology.yaml"
+
+TA_DESCRIPTION = '''Time & Absence module manages employee work time, attendance tracking, 
+  leave requests, and absence management. It includes shift scheduling, time capture,
+  timesheet processing, leave balances, and approval workflows.'''
+
+# Sub-module name and description for the default TA merge; other inputs are
+# named after their `module` field
+TA_SUB_MODULES = {
+    TA_FILE.name: ('TimeAttendance', 'Time tracking and attendance management'),
+    ABSENCE_FILE.name: ('Absence', 'Leave and absence management'),
+}
+
+TA_DESIGN_PATTERNS = {
+    'scd_type_2': {
+        'description': 'Slowly Changing Dimensions Type 2 for historical tracking',
+        'applies_to': [
+            'ShiftDefinition', 'PatternTemplate', 'ScheduleAssignment',
+            'LeaveType', 'LeavePolicy', 'LeaveBalance'
+        ]
+    },
+    'hierarchical_data': {
+        'description': '6-level hierarchical model for time scheduling',
+        'applies_to': [
+            'TimeSegment', 'ShiftDefinition', 'DayModel',
+            'PatternTemplate', 'ScheduleAssignment', 'GeneratedRoster'
+        ]
+    },
+    'ledger_pattern': {
+        'description': 'Double-entry ledger for leave balance tracking',
+        'applies_to': ['LeaveBalance', 'LeaveTransaction', 'LeaveAdjustment']
+    }
+}
+
+# Field-level diff lines shown per conflict
+MAX_DIFF_LINES = 12
+
+
+def make_header(module, code, description, sources):
+    """Comment header for an output file written from scratch."""
+    today = datetime.now().strftime('%Y-%m-%d')
+    if [s.name for s in sources] == [TA_FILE.name, ABSENCE_FILE.name]:
+        return (
+            "# Time & Absence Module (TA) - Ontology\n"
+            "# Version: 2.0\n"
+            f"# Last Updated: {today}\n"
+            "# Module: Time & Absence (TA)\n"
+            "# Description: Comprehensive ontology for time tracking, attendance, and absence management\n\n"
+        )
+    return (
+        f"# {module} ({code}) - Ontology\n"
+        f"# Last Updated: {today}\n"
+        f"# Merged from: {', '.join(s.name for s in sources)}\n"
+        f"# Description: {' '.join(description.split())}\n\n"
+    )
+
+
+@dataclass
+class Source:
+    """One loaded input ontology."""
+    path: Path
+    data: dict
+    hashes: dict  # entity name -> canonical content hash
+    seconds: float
+
+    @property
+    def name(self):
+        return self.path.name
+
+    @property
+    def entities(self):
+        return self.data.get('entities') or {}
+
+
+@dataclass
+class Conflict:
+    entity: str
+    kept: str      # file whose definition was in the merge so far
+    incoming: str  # file with the differing definition
+    ops: list      # yaml_patch operations turning the kept definition into the incoming one
+
+
+@dataclass
+class MergeReport:
+    duplicates: dict = field(default_factory=dict)  # entity -> files with the identical definition
+    conflicts: list = field(default_factory=list)
+    aliases: list = field(default_factory=list)     # (name, other name) with identical definitions
+
+
+def load_ontology(path):
+    """Process-pool worker: load one ontology and hash each entity definition."""
+    started = time.perf_counter()
+    with open(path, 'r', encoding='utf-8') as f:
+        data = safe_load(f)
+    if not isinstance(data, dict):
+        raise YAMLError(f"{path}: top level is not a mapping")
+    entities = data.get('entities') or {}
+    if not isinstance(entities, dict):
+        raise YAMLError(f"{path}: 'entities' is not a mapping of name -> definition")
+    # hash_key serializes with sorted keys, so key order does not change the hash
+    hashes = {name: hash_key(body) for name, body in entities.items()}
+    return Source(Path(path), data, hashes, time.perf_counter() - started)
+
+
+def load_ontologies(paths, jobs=None):
+    """Load every input (in parallel when there are several); returns (sources, errors)."""
+    sources, errors = [], []
+    if len(paths) == 1:
+        results = [(paths[0], _try(load_ontology, paths[0]))]
+    else:
+        workers = min(jobs or os.cpu_count() or 1, len(paths))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [(path, pool.submit(load_ontology, str(path))) for path in paths]
+            results = [(path, _try(future.result)) for path, future in futures]
+    for path, result in results:
+        if isinstance(result, Source):
+            sources.append(result)
+        else:
+            errors.append((path, result))
+    return sources, errors
+
+
+def _try(fn, *args):
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
-    except Exception as e:
-        print(f"Error loading {filepath}: {e}")
-        sys.exit(1)
+        return fn(*args)
+    except (OSError, YAMLError) as e:
+        return e
 
-def merge_ontologies(ta_data, absence_data):
-    """Merge two ontology files into a unified structure."""
-    
-    # Create unified ontology structure following Core module template
+
+def _sub_module(source, taken):
+    """Sub-module (name, description) for an input, unique among `taken`."""
+    if source.name in TA_SUB_MODULES:
+        name, description = TA_SUB_MODULES[source.name]
+    else:
+        name = str(source.data.get('module') or source.path.stem)
+        description = ' '.join(str(source.data.get('description') or f'Entities from {source.name}').split())
+    if name in taken:
+        name = f"{name} ({source.path.stem})"
+    return name, description
+
+
+def merge_ontologies(sources, module, code, description, on_conflict='last'):
+    """Merge any number of ontologies into a unified structure; returns (unified, report).
+
+    Entities are indexed by name and by canonical content hash. A name seen again
+    with the same hash is a duplicate and is dropped. A name seen again with a
+    different hash is a conflict: the first or last definition wins, by
+    `on_conflict`.
+    """
     unified = {
-        '# Time & Absence Module (TA) - Ontology': None,
-        '# Version': '2.0',
-        '# Last Updated': datetime.now().strftime('%Y-%m-%d'),
-        '# Module': 'Time & Absence (TA)',
-        '# Description': 'Comprehensive ontology for time tracking, attendance management, and absence/leave management',
-        
-        'module': 'TimeAndAbsence',
-        'code': 'TA',
-        'description': '''Time & Absence module manages employee work time, attendance tracking, 
-  leave requests, and absence management. It includes shift scheduling, time capture,
-  timesheet processing, leave balances, and approval workflows.''',
-        
-        'sub_modules': {
-            'TimeAttendance': {
-                'description': 'Time tracking and attendance management',
-                'entities': []
-            },
-            'Absence': {
-                'description': 'Leave and absence management',
-                'entities': []
-            }
-        },
-        
+        'module': module,
+        'code': code,
+        'description': description,
+        'sub_modules': {},
         'entities': {}
     }
-    
-    # Extract entities from Time & Attendance
-    if 'entities' in ta_data:
-        ta_entities = ta_data['entities']
-        unified['sub_modules']['TimeAttendance']['entities'] = list(ta_entities.keys())
-        
-        # Add TA entities to unified entities
-        for entity_name, entity_data in ta_entities.items():
-            unified['entities'][entity_name] = entity_data
-    
-    # Extract entities from Absence
-    if 'entities' in absence_data:
-        absence_entities = absence_data['entities']
-        unified['sub_modules']['Absence']['entities'] = list(absence_entities.keys())
-        
-        # Add Absence entities to unified entities
-        for entity_name, entity_data in absence_entities.items():
-            unified['entities'][entity_name] = entity_data
-    
-    # Add architecture info if present
-    if 'architecture' in ta_data:
-        unified['architecture'] = ta_data['architecture']
-    
-    # Add design patterns
-    unified['design_patterns'] = {
-        'scd_type_2': {
-            'description': 'Slowly Changing Dimensions Type 2 for historical tracking',
-            'applies_to': [
-                'ShiftDefinition', 'PatternTemplate', 'ScheduleAssignment',
-                'LeaveType', 'LeavePolicy', 'LeaveBalance'
-            ]
-        },
-        'hierarchical_data': {
-            'description': '6-level hierarchical model for time scheduling',
-            'applies_to': [
-                'TimeSegment', 'ShiftDefinition', 'DayModel', 
-                'PatternTemplate', 'ScheduleAssignment', 'GeneratedRoster'
-            ]
-        },
-        'ledger_pattern': {
-            'description': 'Double-entry ledger for leave balance tracking',
-            'applies_to': ['LeaveBalance', 'LeaveTransaction', 'LeaveAdjustment']
-        }
-    }
-    
-    # Add version history
-    unified['version_history'] = [
-        {
-            'version': '2.0',
-            'date': datetime.now().strftime('%Y-%m-%d'),
-            'changes': 'Unified Time & Attendance and Absence ontologies into single module'
-        },
-        {
-            'version': '1.0',
-            'date': '2025-11-28',
-            'changes': 'Initial separate ontologies for TA and Absence'
+    report = MergeReport()
+    by_name = {}  # entity name -> (hash, file) of the definition in the merge
+    by_hash = {}  # content hash -> first entity name with that definition
+
+    for source in sources:
+        sub_name, sub_description = _sub_module(source, unified['sub_modules'])
+        unified['sub_modules'][sub_name] = {
+            'description': sub_description,
+            'entities': list(source.entities.keys())
         }
-    ]
-    
-    return unified
 
-def save_yaml_file(data, filepath):
-    """Save data to YAML file with proper formatting."""
+        for entity_name, entity_data in source.entities.items():
+            digest = source.hashes[entity_name]
+            seen = by_name.get(entity_name)
+            if seen is None:
+                by_name[entity_name] = (digest, source.name)
+                unified['entities'][entity_name] = entity_data
+                first = by_hash.setdefault(digest, entity_name)
+                if first != entity_name:
+                    report.aliases.append((entity_name, first))
+            elif seen[0] == digest:
+                report.duplicates.setdefault(entity_name, [seen[1]]).append(source.name)
+            else:
+                ops = make_patch(unified['entities'][entity_name], entity_data)
+                report.conflicts.append(Conflict(entity_name, seen[1], source.name, ops))
+                if on_conflict == 'last':
+                    by_name[entity_name] = (digest, source.name)
+                    unified['entities'][entity_name] = entity_data
+
+    # Architecture and design patterns: the first input that defines each wins
+    for source in sources:
+        if 'architecture' in source.data and 'architecture' not in unified:
+            unified['architecture'] = source.data['architecture']
+
+    is_ta_merge = [s.name for s in sources] == [TA_FILE.name, ABSENCE_FILE.name]
+    design_patterns = dict(TA_DESIGN_PATTERNS) if is_ta_merge else {}
+    for source in sources:
+        for pattern_name, pattern_data in (source.data.get('design_patterns') or {}).items():
+            design_patterns.setdefault(pattern_name, pattern_data)
+    if design_patterns:
+        unified['design_patterns'] = design_patterns
+
+    today = datetime.now().strftime('%Y-%m-%d')
+    if is_ta_merge:
+        unified['version_history'] = [
+            {
+                'version': '2.0',
+                'date': today,
+                'changes': 'Unified Time & Attendance and Absence ontologies into single module'
+            },
+            {
+                'version': '1.0',
+                'date': '2025-11-28',
+                'changes': 'Initial separate ontologies for TA and Absence'
+            }
+        ]
+    else:
+        unified['version_history'] = [
+            {
+                'version': '1.0',
+                'date': today,
+                'changes': f"Merged {', '.join(unified['sub_modules'])} ontologies into single module"
+            }
+        ]
+
+    return unified, report
+
+
+def load_output(filepath, data):
+    """The existing output loaded round-trip with `data` assigned, or None.
+
+    The output is generated, so an existing file that does not parse, or
+    whose top-level keys are not the merged ones, is rewritten from scratch
+    rather than patched.
+    """
+    if not filepath.exists():
+        return None
+    try:
+        doc = RoundTripDocument.load(filepath)
+    except YAMLError as e:
+        mark = getattr(e, 'problem_mark', None)
+        where = f" (line {mark.line + 1})" if mark else ""
+        print(f"⚠️  Existing {filepath.name} is not valid YAML{where}; rewriting it")
+        return None
+    if not isinstance(doc.data, dict) or list(doc.data) != list(data):
+        print(f"⚠️  Existing {filepath.name} has different top-level keys; rewriting it")
+        return None
+    doc.data = data
+    return doc
+
+
+def save_yaml_file(data, filepath, header):
+    """Save data to YAML file, editing an existing file round-trip.
+
+    A new file gets the standard comment header. If the file already exists
+    only the nodes that differ from `data` are rewritten, so its comments
+    and formatting are kept; the header's "Last Updated" date is refreshed
+    whenever the content changes.
+    """
+    filepath = Path(filepath)
     try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            # Write header comments manually for better formatting
-            f.write(f"# Time & Absence Module (TA) - Ontology\n")
-            f.write(f"# Version: 2.0\n")
-            f.write(f"# Last Updated: {datetime.now().strftime('%Y-%m-%d')}\n")
-            f.write(f"# Module: Time & Absence (TA)\n")
-            f.write(f"# Description: Comprehensive ontology for time tracking, attendance, and absence management\n\n")
-            
-            # Remove header comments from data before dumping
-            clean_data = {k: v for k, v in data.items() if not k.startswith('#')}
-            
-            # Write YAML content
-            yaml.dump(clean_data, f, 
-                     default_flow_style=False,
-                     allow_unicode=True,
-                     sort_keys=False,
-                     width=100,
-                     indent=2)
-        
-        print(f"✅ Successfully saved merged ontology to: {filepath}")
+        doc = load_output(filepath, data)
+        if doc is not None:
+            if doc.modified:
+                today = datetime.now().strftime('%Y-%m-%d')
+                doc.text = re.sub(r'^(# Last Updated:).*?(\r?)$', rf'\g<1> {today}\g<2>', doc.text,
+                                  count=1, flags=re.M)
+            try:
+                saved = doc.save(filepath)
+            except PatchError as e:
+                print(f"⚠️  Cannot patch {filepath.name} ({e}); rewriting it")
+                doc = None
+        if doc is None:
+            newline = '\r\n' if filepath.exists() and b'\r\n' in filepath.read_bytes() else '\n'
+            saved = RoundTripDocument.new(data, filepath, header, newline=newline).save(filepath, force=True)
+        if saved:
+            print(f"✅ Successfully saved merged ontology to: {filepath}")
+        else:
+            print(f"✅ Merged ontology is already up to date: {filepath}")
         return True
     except Exception as e:
         print(f"❌ Error saving {filepath}: {e}")
         return False
 
+
+def print_report(report, on_conflict):
+    """Print the dedupe and conflict report."""
+    if report.duplicates:
+        print(f"\n♻️  Identical definitions merged ({len(report.duplicates)}):")
+        for entity, files in report.duplicates.items():
+            print(f"   - {entity}: {', '.join(files)}")
+
+    if report.aliases:
+        print(f"\n🔗 Same definition under different names ({len(report.aliases)}):")
+        for entity, first in report.aliases:
+            print(f"   - {entity} = {first}")
+
+    if report.conflicts:
+        print(f"\n⚠️  Conflicting definitions ({len(report.conflicts)}, {on_conflict} wins):")
+        for conflict in report.conflicts:
+            print(f"   - {conflict.entity}: {conflict.kept} → {conflict.incoming} ({len(conflict.ops)} field changes)")
+            for op in conflict.ops[:MAX_DIFF_LINES]:
+                print(f"       {op['op']:<7} {op['path'] or '/'}")
+            if len(conflict.ops) > MAX_DIFF_LINES:
+                print(f"       ... and {len(conflict.ops) - MAX_DIFF_LINES} more")
+    elif not report.duplicates:
+        print(f"\n✅ No duplicate or conflicting entities")
+
+
 def print_summary(unified):
     """Print summary of merged ontology."""
     print("\n" + "="*80)
     print("📊 MERGE SUMMARY")
     print("="*80)
-    
+
     print(f"\n📦 Module: {unified.get('module', 'N/A')}")
     print(f"📝 Code: {unified.get('code', 'N/A')}")
-    
+
     print(f"\n📂 Sub-modules:")
     for sub_name, sub_data in unified.get('sub_modules', {}).items():
         entity_count = len(sub_data.get('entities', []))
@@ -155,56 +362,88 @@ def print_summary(unified):
             print(f"     • {entity}")
         if entity_count > 5:
             print(f"     ... and {entity_count - 5} more")
-    
+
     total_entities = len(unified.get('entities', {}))
     print(f"\n📊 Total Entities: {total_entities}")
-    
+
     print(f"\n🎨 Design Patterns:")
     for pattern_name, pattern_data in unified.get('design_patterns', {}).items():
         applies_count = len(pattern_data.get('applies_to', []))
         print(f"   - {pattern_name}: applies to {applies_count} entities")
-    
+
     print("\n" + "="*80)
 
+
 def main():
     """Main execution function."""
-    print("🔄 Starting Time & Absence Ontology Merge Process...")
+    parser = argparse.ArgumentParser(description="Merge module ontology files into a single unified ontology.")
+    parser.add_argument('inputs', nargs='*', type=Path,
+                        help=f"Ontology files to merge, in priority order (default: {TA_FILE.name} {ABSENCE_FILE.name})")
+    parser.add_argument('-o', '--output', type=Path, default=None,
+                        help=f"Output file (default: {OUTPUT_FILE.name} for the default inputs)")
+    parser.add_argument('--module', default=None, help="Unified module name (default: TimeAndAbsence for the TA merge)")
+    parser.add_argument('--code', default=None, help="Unified module code (default: TA for the TA merge)")
+    parser.add_argument('--description', default=None, help="Unified module description")
+    parser.add_argument('--on-conflict', choices=['last', 'first', 'fail'], default='last',
+                        help="Which definition wins when an entity differs between inputs (default: last)")
+    parser.add_argument('--skip-invalid', action='store_true', help="Merge the remaining inputs when some fail to load")
+    parser.add_argument('--dry-run', action='store_true', help="Report the merge without writing the output")
+    parser.add_argument('--jobs', '-j', type=int, default=None, help="Loader processes (default: one per input, up to CPU count)")
+    args = parser.parse_args()
+
+    inputs = [p.resolve() for p in args.inputs] or [TA_FILE, ABSENCE_FILE]
+    default_merge = [p.name for p in inputs] == [TA_FILE.name, ABSENCE_FILE.name]
+    output_file = args.output or (OUTPUT_FILE if default_merge else None)
+    if output_file is None and not args.dry_run:
+        parser.error("--output is required when merging files other than the TA defaults")
+    module = args.module or ('TimeAndAbsence' if default_merge else 'Unified')
+    code = args.code or ('TA' if default_merge else 'UN')
+    description = args.description or (TA_DESCRIPTION if default_merge else f"Unified ontology merged from {len(inputs)} module ontologies.")
+
+    print(f"🔄 Starting Ontology Merge Process ({len(inputs)} files)...")
     print("="*80)
-    
-    # Define file paths
-    base_path = Path("c:/Users/LAP15399-local/OneDrive - VNG Corporation/Apps/mygit/a4b-doc-xtalent/product/xTalent/docs/01-modules/TA/00-ontology")
-    
-    ta_file = base_path / "time-attendance-ontology.yaml"
-    absence_file = base_path / "absence-ontology.yaml"
-    output_file = base_path / "time-absence-ontology.yaml"
-    
+
     # Check if files exist
-    if not ta_file.exists():
-        print(f"❌ Error: Time & Attendance ontology not found: {ta_file}")
+    missing = [p for p in inputs if not p.exists()]
+    for path in missing:
+        print(f"❌ Error: Ontology not found: {path}")
+    if missing:
         sys.exit(1)
-    
-    if not absence_file.exists():
-        print(f"❌ Error: Absence ontology not found: {absence_file}")
+
+    # Load all ontology files
+    started = time.perf_counter()
+    sources, errors = load_ontologies(inputs, args.jobs)
+    load_seconds = time.perf_counter() - started
+    for source in sources:
+        print(f"📖 Loaded {source.name}: {len(source.entities)} entities ({source.seconds:.2f}s)")
+    for path, error in errors:
+        print(f"❌ Error loading {path}: {error}")
+    if errors and not (args.skip_invalid and sources):
         sys.exit(1)
-    
-    # Load both ontology files
-    print(f"\n📖 Loading Time & Attendance ontology from: {ta_file.name}")
-    ta_data = load_yaml_file(ta_file)
-    
-    print(f"📖 Loading Absence ontology from: {absence_file.name}")
-    absence_data = load_yaml_file(absence_file)
-    
+
     # Merge ontologies
-    print(f"\n🔀 Merging ontologies...")
-    unified = merge_ontologies(ta_data, absence_data)
-    
+    print(f"\n🔀 Merging {len(sources)} ontologies...")
+    started = time.perf_counter()
+    unified, report = merge_ontologies(sources, module, code, description, args.on_conflict)
+    merge_seconds = time.perf_counter() - started
+    print(f"   Loaded in {load_seconds:.2f}s, merged in {merge_seconds:.2f}s")
+
+    print_report(report, args.on_conflict)
+
     # Print summary
     print_summary(unified)
-    
+
+    if report.conflicts and args.on_conflict == 'fail':
+        print(f"\n❌ {len(report.conflicts)} conflicting entities; nothing written (--on-conflict fail)")
+        sys.exit(1)
+    if args.dry_run:
+        print(f"\n🔍 Dry run: {output_file or 'output'} not written")
+        return
+
     # Save merged ontology
     print(f"\n💾 Saving merged ontology to: {output_file.name}")
-    success = save_yaml_file(unified, output_file)
-    
+    success = save_yaml_file(unified, output_file, make_header(module, code, description, sources))
+
     if success:
         print(f"\n✅ Merge completed successfully!")
         print(f"\n📝 Next steps:")
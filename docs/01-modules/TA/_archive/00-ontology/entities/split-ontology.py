@@ -1,17 +1,47 @@
 #!/usr/bin/env python3
 """
 Split the monolithic time-attendance-ontology.yaml into individual entity files.
-This avoids external dependencies (PyYAML not required) by using a lightweight
-indent-based parser tailored to the current ontology file structure.
+
+Entity blocks are extracted with the codec shared with sync-ontology.py
+(docs/_tools/entity_files.py): each block is copied verbatim from the
+source lines, blank lines and comments included, dedented by exactly the
+four columns of its place under `entities:`. An existing entity file keeps
+its header; a new one gets `entity`/`version`/`layer`. Both scripts
+therefore write the same bytes for the same entity.
+
+Entity files whose bytes already match are not rewritten. Writes are atomic
+and run on a small thread pool; a file that cannot be written is reported
+without stopping the others.
+
+The files written for each source, and the body hash both sides then share,
+are recorded in the state file shared with sync-ontology.py
+(.ontology-entities.json in the output directory). A file recorded on an
+earlier run whose entity is gone from the source is removed; files from
+other sources are never touched. On the first run for a source, the
+existing files that carry exactly the header this script writes (and are
+not recorded for another source) are taken as its earlier output.
 """
 
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import sys
 
-# Base locations
-BASE_DIR = Path("/Users/nguyenhuyvu/Library/CloudStorage/OneDrive-VNGCorporation/Apps/mygit/a4b-doc-xtalent/product/xTalent/docs/01-modules/TA/00-ontology")
+TOOLS_DIR = next((p / '_tools' for p in Path(__file__).resolve().parents if (p / '_tools').is_dir()), None)
+if TOOLS_DIR is not None:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+from entity_files import (CodecError, Monolith, body_hash, entity_header, file_name, header_entity,
+                          load_state, parse_entity_file, render_entity_file, save_state)
+from fsutil import atomic_write
+
+# Base locations (the entity files live next to this script)
+BASE_DIR = Path(__file__).resolve().parents[1]
 INPUT_FILE = BASE_DIR / "time-attendance-ontology.yaml"
-OUTPUT_DIR = BASE_DIR
+OUTPUT_DIR = Path(__file__).resolve().parent
+
+# Writer threads (file I/O bound; small to stay gentle on synced folders)
+WRITE_WORKERS = 4
 
 # Default metadata
 VERSION = "1.0"
@@ -37,98 +67,128 @@ LAYER_MAP = {
 }
 
 
-def camel_to_kebab(name: str) -> str:
-    """Convert CamelCase names to kebab-case file names."""
-    result = []
-    for char in name:
-        if char.isupper() and result:
-            result.append("-")
-        result.append(char.lower())
-    return "".join(result)
-
-
-def parse_entities(raw_lines):
-    """
-    Extract entity blocks from the ontology file by inspecting indentation.
-    Expects entities to be defined under an 'entities:' root with two-space
-    indentation and each entity starting with '  EntityName:'.
-    """
-    entities = {}
-    in_entities_section = False
-    current_entity = None
-    current_lines = []
-
-    for line in raw_lines:
-        if not in_entities_section:
-            if line.strip() == "entities:":
-                in_entities_section = True
-            continue
+def default_header(entity_name):
+    return entity_header(entity_name, VERSION, LAYER_MAP.get(entity_name))
 
-        # Entities section ends when indentation returns to column 0 and is not blank/comment
-        if line and not line.startswith("  "):
-            break
 
-        # Skip comments or blank lines at the entity root level
-        if line.startswith("  #") or line.strip() == "":
-            continue
+def render_entity(path, entity_name, body):
+    """Content of the entity file at `path`: its existing header if it has
+    one for this entity, else the default one, followed by `body`."""
+    header = []
+    if path.exists():
+        header, _ = parse_entity_file(path.read_text(encoding="utf-8"))
+    if header_entity(header) != entity_name:
+        header = default_header(entity_name)
+    return render_entity_file(header, body)
 
-        stripped = line.strip()
-        is_entity_header = line.startswith("  ") and not line.startswith("    ") and stripped.endswith(":")
 
-        if is_entity_header:
-            # Save previous entity if present
-            if current_entity:
-                entities[current_entity] = current_lines
-            current_entity = stripped[:-1]  # Remove trailing colon
-            current_lines = []
-            continue
+def write_entity_file(path, entity_name, body):
+    """Returns "written" or "unchanged"; a file that already holds the bytes is left alone."""
+    content = render_entity(path, entity_name, body)
+    if path.exists() and path.read_bytes() == content.encode("utf-8"):
+        return "unchanged"
+    atomic_write(path, content)
+    return "written"
 
-        if current_entity:
-            # Remove four spaces (entity indent + property indent) to make the block top-level
-            if line.startswith("    "):
-                cleaned = line[4:]
-            else:
-                cleaned = line.lstrip()
-            current_lines.append(cleaned)
 
-    if current_entity:
-        entities[current_entity] = current_lines
+def generated_files(output_dir, claimed):
+    """{entity: file} of the entity files that start with exactly the header
+    this script writes for the entity they name, except those in `claimed`."""
+    found = {}
+    for path in sorted(output_dir.glob("*.yaml")):
+        if path.name in claimed:
+            continue
+        try:
+            header, _ = parse_entity_file(path.read_text(encoding="utf-8"))
+        except (OSError, UnicodeDecodeError):
+            continue
+        name = header_entity(header)
+        if name and header == default_header(name):
+            found[name] = path.name
+    return found
+
 
-    return entities
+def remove_orphans(output_dir, previous, current):
+    """Delete files written for this source on an earlier run whose entity is gone."""
+    removed = []
+    for name in sorted(set(previous) - set(current)):
+        path = output_dir / previous[name]["file"]
+        if path.is_file() and path.read_text(encoding="utf-8").startswith("entity: "):
+            path.unlink()
+            removed.append(name)
+    return removed
 
 
-def split_ontology():
-    if not INPUT_FILE.exists():
-        sys.exit(f"Input file not found: {INPUT_FILE}")
+def split_ontology(input_file=INPUT_FILE, output_dir=OUTPUT_DIR, prune=True):
+    if not input_file.exists():
+        sys.exit(f"Input file not found: {input_file}")
 
-    raw_lines = INPUT_FILE.read_text(encoding="utf-8").splitlines()
-    entities = parse_entities(raw_lines)
+    try:
+        monolith = Monolith(input_file.read_text(encoding="utf-8"))
+        entities = {name: monolith.body(name) for name in monolith.blocks}
+    except CodecError as e:
+        sys.exit(f"{input_file.name}: {e}")
 
     if not entities:
         sys.exit("No entities found in the ontology file.")
 
-    written = []
-    for entity_name, entity_lines in entities.items():
-        output_filename = f"{camel_to_kebab(entity_name)}.yaml"
-        output_path = OUTPUT_DIR / output_filename
-
-        layer = LAYER_MAP.get(entity_name)
-        header = [
-            f"entity: {entity_name}",
-            f'version: "{VERSION}"',
-        ]
-        if layer:
-            header.append(f"layer: {layer}")
-        header.append("")  # Blank line before body
-
-        output_content = "\n".join(header + entity_lines) + "\n"
-        output_path.write_text(output_content, encoding="utf-8")
-        written.append(output_path.name)
-        print(f"✓ Wrote {output_path}")
-
+    def write(item):
+        # One file that cannot be written must not abort the rest of the batch
+        name, body = item
+        try:
+            return write_entity_file(output_dir / file_name(name), name, body)
+        except OSError as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=WRITE_WORKERS) as pool:
+        results = dict(zip(entities, pool.map(write, entities.items())))
+
+    for name, result in results.items():
+        path = output_dir / file_name(name)
+        if isinstance(result, Exception):
+            print(f"❌ Failed {path}: {result}")
+        else:
+            print(f"✓ Wrote {path}" if result == "written" else f"= Unchanged {path}")
+
+    recorded = load_state(output_dir)
+    previous = recorded.get(input_file.name)
+    if previous is None:
+        # First run for this source: files written before the state existed
+        claimed = {entry.get("file") for source in recorded.values() for entry in source.values()}
+        previous = {name: {"file": path} for name, path in generated_files(output_dir, claimed).items()}
+    else:
+        previous = dict(previous)
+    removed = remove_orphans(output_dir, previous, entities) if prune else []
+    for name in removed:
+        print(f"✗ Removed {output_dir / previous[name]['file']} (entity no longer in {input_file.name})")
+
+    current = {name: entry for name, entry in previous.items() if name not in entities and name not in removed}
+    for name, body in entities.items():
+        if not isinstance(results[name], Exception):
+            current[name] = {"file": file_name(name), "hash": body_hash(body)}
+        elif name in previous:
+            current[name] = previous[name]
+    save_state(output_dir, {**recorded, input_file.name: current}, recorded)
+
+    written = sum(result == "written" for result in results.values())
+    failed = sum(isinstance(result, Exception) for result in results.values())
     print("-" * 60)
-    print(f"Completed splitting {INPUT_FILE.name} into {len(written)} files.")
+    print(
+        f"Completed splitting {input_file.name} into {len(entities)} files: "
+        f"{written} written, {len(entities) - written - failed} unchanged, {failed} failed, {len(removed)} removed."
+    )
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Split an ontology file into one YAML file per entity.")
+    parser.add_argument("--input", type=Path, default=INPUT_FILE, help=f"Ontology to split (default: {INPUT_FILE.name})")
+    parser.add_argument("--output-dir", type=Path, default=OUTPUT_DIR, help="Directory for the entity files (default: next to this script)")
+    parser.add_argument("--keep-orphans", action="store_true", help="Do not remove entity files whose entity is gone from the source")
+    args = parser.parse_args()
+    if split_ontology(args.input.resolve(), args.output_dir.resolve(), prune=not args.keep_orphans):
+        sys.exit(1)
 
 
 if __name__ == "__main__":
-    split_ontology()
+    main()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Keep absence-ontology.yaml and its per-entity files in sync.
+
+The entity files, and their order, come from absence-ontology-index.yaml.
+Both directions use the codec shared with split-ontology.py
+(docs/_tools/entity_files.py):
+- an entity file is its metadata header (entity/version/layer, then a
+  blank line) followed by the body;
+- in the monolith, the body sits under `  <Entity>:` indented by exactly
+  four more spaces.
+Blank lines and comments inside a body are kept. Comments between entities
+(section banners) and everything outside `entities:` stay in the monolith.
+
+    python3 sync-ontology.py status      # what differs, per entity
+    python3 sync-ontology.py sync        # apply edits from either side
+    python3 sync-ontology.py merge       # entity files -> monolith
+    python3 sync-ontology.py split       # monolith -> entity files
+    python3 sync-ontology.py check       # prove split + merge is byte-identical
+
+Only entities whose content differs are re-assembled or re-split. `sync`
+compares both sides with the body hashes recorded at the last sync or split
+(.ontology-entities.json, shared with split-ontology.py) to tell which side
+changed. An entity edited on both sides is a conflict and is left alone
+unless --prefer is given.
+"""
+
+import argparse
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+TOOLS_DIR = next((p / '_tools' for p in Path(__file__).resolve().parents if (p / '_tools').is_dir()), None)
+if TOOLS_DIR is not None:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+from entity_files import (CodecError, Monolith, body_hash, decode_block, encode_block, entity_header, file_name,
+                          header_entity, load_state, parse_entity_file, render_entity_file, save_state)
+from fsutil import atomic_write
+from yaml_loader import safe_load
+
+ENTITIES_DIR = Path(__file__).resolve().parent
+INDEX_FILE = ENTITIES_DIR / "absence-ontology-index.yaml"
+MONOLITH_FILE = ENTITIES_DIR.parent / "absence-ontology.yaml"
+
+# Metadata for entity files created by a split
+DEFAULT_VERSION = "2.0"
+
+
+class SyncError(Exception):
+    """An index that does not list the entity files."""
+
+
+def default_header(name):
+    return entity_header(name, DEFAULT_VERSION)
+
+
+# =============================================================================
+# SYNC
+# =============================================================================
+
+
+@dataclass
+class Entity:
+    name: str
+    path: Path
+    header: list
+    file_body: list | None      # None when the file does not exist
+    monolith_body: list | None  # None when the monolith does not define it
+    synced: str | None          # body hash recorded at the last sync
+
+    @property
+    def status(self):
+        f, m = self.file_body, self.monolith_body
+        if f is None and m is None:
+            return "missing"
+        if f is None:
+            return "only in monolith"
+        if m is None:
+            return "only in file"
+        if f == m:
+            return "in sync"
+        file_changed = body_hash(f) != self.synced
+        monolith_changed = body_hash(m) != self.synced
+        if self.synced and file_changed and not monolith_changed:
+            return "file changed"
+        if self.synced and monolith_changed and not file_changed:
+            return "monolith changed"
+        return "conflict"
+
+
+def load_index(index_file):
+    data = safe_load(index_file.read_text(encoding="utf-8")) or {}
+    files = data.get("entities") or []
+    if not isinstance(files, list):
+        raise SyncError(f"{index_file.name}: `entities` is not a list of files")
+    return files
+
+
+def collect(index_file, monolith_file):
+    """(monolith, [Entity] in index order, monolith entities missing from the index)."""
+    entities_dir = index_file.parent
+    monolith = Monolith(monolith_file.read_text(encoding="utf-8"))
+    by_file = {file_name(name): name for name in monolith.blocks}
+    state = load_state(entities_dir).get(monolith_file.name) or {}
+
+    entities = []
+    for filename in load_index(index_file):
+        path = entities_dir / filename
+        header, body = [], None
+        if path.exists():
+            header, body = parse_entity_file(path.read_text(encoding="utf-8"))
+        name = header_entity(header) or by_file.get(filename)
+        if name is None:
+            name = "".join(part.capitalize() for part in Path(filename).stem.split("-"))
+        if not header:
+            header = default_header(name)
+        monolith_body = monolith.body(name) if name in monolith.blocks else None
+        entities.append(Entity(name, path, header, body, monolith_body, (state.get(name) or {}).get("hash")))
+
+    indexed = {e.name for e in entities}
+    unindexed = [name for name in monolith.blocks if name not in indexed]
+    return monolith, entities, unindexed
+
+
+def apply(monolith, entities, monolith_file, to_monolith, to_files):
+    """Write the chosen bodies: monolith blocks spliced in place, files rewritten.
+    Returns (blocks written, files written)."""
+    if to_monolith:
+        text = monolith.text_with({e.name: e.file_body for e in to_monolith}, [e.name for e in entities])
+        atomic_write(monolith_file, text)
+        for entity in to_monolith:
+            entity.monolith_body = entity.file_body
+    for entity in to_files:
+        atomic_write(entity.path, render_entity_file(entity.header, entity.monolith_body))
+        entity.file_body = entity.monolith_body
+    return len(to_monolith), len(to_files)
+
+
+def record_state(entities_dir, monolith_file, entities):
+    """Record the file and body hash of every entity that is now the same on both sides."""
+    recorded = load_state(entities_dir)
+    synced = dict(recorded.get(monolith_file.name) or {})
+    for entity in entities:
+        if entity.file_body is not None and entity.file_body == entity.monolith_body:
+            synced[entity.name] = {"file": entity.path.name, "hash": body_hash(entity.file_body)}
+    save_state(entities_dir, {**recorded, monolith_file.name: synced}, recorded)
+
+
+def print_status(entities, unindexed):
+    width = max((len(e.name) for e in entities), default=10)
+    for entity in entities:
+        mark = "=" if entity.status == "in sync" else "≠"
+        print(f"{mark} {entity.name:<{width}}  {entity.status:<17} {entity.path.name}")
+    for name in unindexed:
+        print(f"? {name:<{width}}  not in index")
+
+
+def check_round_trip(monolith_file, monolith, entities):
+    """Split every entity in memory, render and re-read its file, merge it back,
+    and compare with the monolith byte for byte. Returns a list of problems."""
+    original = monolith_file.read_text(encoding="utf-8")
+    problems = []
+    bodies = {}
+    for name in monolith.blocks:
+        header = default_header(name)
+        body = monolith.body(name)
+        _, reread = parse_entity_file(render_entity_file(header, body))
+        if reread != body:
+            problems.append(f"{name}: entity file does not read back to the same body")
+        bodies[name] = reread
+    rebuilt = monolith.text_with(bodies, list(monolith.blocks))
+    if rebuilt != original:
+        a, b = original.split("\n"), rebuilt.split("\n")
+        line = next((i for i, (x, y) in enumerate(zip(a, b)) if x != y), min(len(a), len(b)))
+        problems.append(f"monolith differs after split + merge from line {line + 1}")
+    for entity in entities:
+        if entity.file_body is not None and encode_block(decode_block(entity.file_body)) != entity.file_body:
+            problems.append(f"{entity.path.name}: body does not survive merge + split")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keep the absence ontology monolith and its entity files in sync.")
+    parser.add_argument("command", nargs="?", default="status", choices=["status", "sync", "merge", "split", "check"])
+    parser.add_argument("--index", type=Path, default=INDEX_FILE, help=f"Entity index (default: {INDEX_FILE.name})")
+    parser.add_argument("--monolith", type=Path, default=MONOLITH_FILE, help=f"Monolith (default: ../{MONOLITH_FILE.name})")
+    parser.add_argument("--prefer", choices=["files", "monolith"], default=None,
+                        help="Resolve `sync` conflicts (and entities never synced before) in favour of one side")
+    args = parser.parse_args()
+
+    try:
+        monolith, entities, unindexed = collect(args.index.resolve(), args.monolith.resolve())
+    except (OSError, CodecError, SyncError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    if args.command == "status":
+        print_status(entities, unindexed)
+        return 0
+
+    if args.command == "check":
+        problems = check_round_trip(args.monolith, monolith, entities)
+        for problem in problems:
+            print(f"❌ {problem}")
+        if problems:
+            return 1
+        print(f"✓ split + merge reproduces {args.monolith.name} byte for byte ({len(monolith.blocks)} entities)")
+        diverged = [e for e in entities if e.status != "in sync"]
+        if diverged:
+            print(f"≠ {len(diverged)} entities differ between the files and the monolith:")
+            print_status(diverged, [])
+            return 1
+        print(f"✓ all {len(entities)} indexed entity files match the monolith")
+        return 0
+
+    to_monolith, to_files, conflicts = [], [], []
+    for entity in entities:
+        status = entity.status
+        if status in ("in sync", "missing"):
+            continue
+        if args.command == "merge":
+            if entity.file_body is not None:
+                to_monolith.append(entity)
+        elif args.command == "split":
+            if entity.monolith_body is not None:
+                to_files.append(entity)
+        elif status in ("file changed", "only in file"):
+            to_monolith.append(entity)
+        elif status in ("monolith changed", "only in monolith"):
+            to_files.append(entity)
+        elif args.prefer == "files":
+            to_monolith.append(entity)
+        elif args.prefer == "monolith":
+            to_files.append(entity)
+        else:
+            conflicts.append(entity)
+
+    blocks, files = apply(monolith, entities, args.monolith, to_monolith, to_files)
+    for entity in to_monolith:
+        print(f"✓ Merged {entity.name} into {args.monolith.name}")
+    for entity in to_files:
+        print(f"✓ Split {entity.name} into {entity.path.name}")
+    for entity in conflicts:
+        print(f"⚠️  Conflict: {entity.name} changed in both {entity.path.name} and {args.monolith.name} (use --prefer)")
+    for name in unindexed:
+        print(f"? {name} is in {args.monolith.name} but not in {args.index.name}")
+    record_state(args.index.resolve().parent, args.monolith.resolve(), entities)
+
+    unchanged = len(entities) - blocks - files - len(conflicts)
+    print("-" * 60)
+    print(f"{blocks} merged, {files} split, {unchanged} unchanged, {len(conflicts)} conflicts.")
+    return 1 if conflicts else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
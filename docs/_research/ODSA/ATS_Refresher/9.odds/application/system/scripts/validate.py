@@ -3,18 +3,131 @@
 ODDS System Builder - Validation Script
 Validates generated system files against ontology sources.
 
-Usage: python3 validate.py <context_dir>
+Usage: python3 validate.py <context_dir> [<context_dir> ...]
+       python3 validate.py --all [--root <odds_dir>] [--jobs N]
 Example: python3 validate.py application/
+         python3 validate.py '*/'
+
+Each context reads its expectations (required tables, paths, events, ...)
+from <context_dir>/system/manifest.yaml. Several contexts are validated
+concurrently in a process pool and reported together.
+
+Parsed artifacts and validation results are cached under 9.odds/.odds-cache/,
+keyed by file content hash, VALIDATOR_VERSION and the content hash of the
+shared parsers in docs/_tools, so unchanged files are skipped on the next
+run. --no-cache forces a full run that writes nothing to disk (the ontology
+index is then built in memory instead of docs/.onto-index.sqlite).
 """
 
+import argparse
+import contextlib
+import functools
+import glob
+import io
 import sys
 import os
-import yaml
+import time
+import traceback
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-def validate_dbml(dbml_path):
+# Shared tooling (DBML parser, ...) lives in docs/_tools
+TOOLS_DIR = next((p / '_tools' for p in Path(__file__).resolve().parents if (p / '_tools').is_dir()), None)
+if TOOLS_DIR is not None:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+from content_cache import ContentCache
+from dbml_parser import DBMLSyntaxError, parse_dbml
+from onto_index import open_index
+from openapi_refs import RefResolver
+from xref_check import check_artifacts
+from yaml_loader import YAMLError, iter_items, safe_load
+
+# Bump whenever a check changes so cached results are invalidated
+VALIDATOR_VERSION = '9'
+
+MANIFEST_NAME = 'manifest.yaml'
+# Default root for --all: the 9.odds directory holding every context
+ODDS_DIR = Path(__file__).resolve().parents[3]
+CACHE_DIR = ODDS_DIR / '.odds-cache'
+
+# Per-process cache, set by run_context (None disables caching)
+_cache = None
+_MISSING = object()
+# Files the running check read besides its declared inputs ($ref targets); see run_check
+_extra_inputs = []
+
+
+def load_manifest(system_dir):
+    """Load the per-context validation manifest (empty expectations if absent)."""
+    manifest_path = os.path.join(system_dir, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path, 'r') as f:
+        return safe_load(f) or {}
+
+
+def _parser_digest(parse):
+    """Content hash of the module defining `parse`, so a change to the shared
+    tooling invalidates cached parses and results without a version bump."""
+    module = sys.modules.get(getattr(parse, '__module__', None))
+    source = getattr(module, '__file__', None)
+    return _cache.digest(source) if source else None
+
+
+def read_artifact(path, kind, parse):
+    """Read and parse a file, reusing the cached parse when its content and parser are unchanged."""
+    key = None
+    if _cache is not None:
+        key = _cache.key('parsed', kind, _cache.digest(path), _parser_digest(parse))
+        parsed = _cache.get('parsed', key, _MISSING)
+        if parsed is not _MISSING:
+            return parsed
+
+    with open(path, 'r') as f:
+        content = f.read()
+    parsed = parse(content)
+
+    if key is not None:
+        _cache.put('parsed', key, parsed)
+    return parsed
+
+
+def run_check(kind, paths, expect, check):
+    """Run a check, or replay its cached report when none of its inputs (or the tooling) changed.
+
+    Files a check only discovers while running (added to _extra_inputs) are
+    stored with the result with their digests; the result is reused only
+    while those digests match too.
+    """
+    if _cache is None:
+        return check()
+
+    tooling = [_parser_digest(f) for f in (parse_dbml, safe_load, RefResolver, check_artifacts, open_index)]
+    key = _cache.key('result', kind, [(p, _cache.digest(p)) for p in paths], expect, tooling)
+    hit = _cache.get('results', key)
+    if hit is not None:
+        output, passed, extra = hit
+        if all(_cache.digest(p) == digest for p, digest in extra):
+            print(output, end='')
+            print(f"  [CACHE] Inputs unchanged since last run; result reused")
+            return passed
+
+    del _extra_inputs[:]
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        passed = check()
+    output = buffer.getvalue()
+    print(output, end='')
+    extra = [(p, _cache.digest(p)) for p in dict.fromkeys(_extra_inputs)]
+    _cache.put('results', key, (output, passed, extra))
+    return passed
+
+
+def validate_dbml(dbml_path, expect=None):
     """Validate DBML file syntax and structure."""
+    expect = expect or {}
     print(f"\n{'='*60}")
     print(f"Validating DBML: {dbml_path}")
     print('='*60)
@@ -23,60 +136,64 @@ def validate_dbml(dbml_path):
         print(f"  [ERROR] File not found: {dbml_path}")
         return False
 
-    with open(dbml_path, 'r') as f:
-        content = f.read()
+    try:
+        schema = read_artifact(dbml_path, 'dbml', parse_dbml)
+    except DBMLSyntaxError as e:
+        print(f"  [ERROR] DBML syntax error: {e}")
+        return False
 
     errors = []
-    warnings = []
+    # Lines the parser had to skip (malformed columns, stray braces)
+    warnings = list(schema.warnings)
 
     # Check for required Enums
-    required_enums = [
-        'ApplicationLifecycle', 'GenderEnum', 'MatchTypeEnum',
-        'DuplicateStatusEnum', 'ResolutionMethodEnum', 'FieldTypeEnum',
-        'QuestionTypeEnum', 'AttachmentTypeEnum', 'UploadStatusEnum'
-    ]
+    required_enums = expect.get('required_enums', [])
 
     for enum in required_enums:
-        if f'Enum {enum}' not in content:
+        if enum not in schema.enums:
             errors.append(f"Missing Enum: {enum}")
 
     # Check for required Tables
-    required_tables = [
-        'student', 'application', 'duplicate',
-        'form_field_value', 'question_answer', 'attachment'
-    ]
+    required_tables = expect.get('required_tables', [])
 
     for table in required_tables:
-        if f'Table {table}' not in content:
+        if table not in schema.tables:
             errors.append(f"Missing Table: {table}")
 
-    # Check for PK in each table
-    # Find each Table block and check for [pk]
-    table_pattern = r'Table\s+(\w+)\s*\{([\s\S]*?)\}'
-    tables = re.findall(table_pattern, content)
-
-    for table_name, table_body in tables:
-        if '[pk' not in table_body:
+    # Check PK and audit fields in each table
+    updated_at_exempt = expect.get('updated_at_exempt', [])
+    for table_name, table in schema.tables.items():
+        if not table.primary_key:
             errors.append(f"Table '{table_name}' missing [pk] designation")
-        if 'created_at' not in table_body:
+        if 'created_at' not in table.columns:
             warnings.append(f"Table '{table_name}' missing created_at audit field")
-        if 'updated_at' not in table_body and table_name not in ['form_field_value', 'question_answer', 'duplicate']:
+        if 'updated_at' not in table.columns and table_name not in updated_at_exempt:
             warnings.append(f"Table '{table_name}' missing updated_at audit field")
 
-    # Check for FK references
-    fk_pattern = r'ref:\s*>\s*\w+\.\w+'
-    fks = re.findall(fk_pattern, content)
-    print(f"  [INFO] Found {len(fks)} foreign key references")
-
-    # Validate Enum syntax
-    enum_pattern = r'Enum\s+\w+\s*\{([^}]+)\}'
-    enums = re.findall(enum_pattern, content, re.DOTALL)
-    print(f"  [INFO] Found {len(enums)} Enum definitions")
+    # Check FK references point at known tables and columns
+    for ref in schema.refs:
+        for table_name, columns in ((ref.source_table, ref.source_columns), (ref.target_table, ref.target_columns)):
+            table = schema.table(table_name)
+            if table is None:
+                # Tables owned by another bounded context are referenced by name only
+                warnings.append(f"Ref on line {ref.line} points to external table '{table_name}'")
+                continue
+            for column in columns:
+                if column not in table.columns:
+                    errors.append(f"Ref on line {ref.line} points to unknown column '{table_name}.{column}'")
+
+    # Check Enums are not empty
+    for enum in schema.enums.values():
+        if not enum.values:
+            errors.append(f"Enum '{enum.name}' has no values")
+
+    print(f"  [INFO] Found {len(schema.refs)} foreign key references")
+    print(f"  [INFO] Found {len(schema.enums)} Enum definitions")
 
     # Report
-    print(f"\n  Tables found: {len(tables)}")
-    print(f"  Enums found: {len(enums)}")
-    print(f"  FK references: {len(fks)}")
+    print(f"\n  Tables found: {len(schema.tables)}")
+    print(f"  Enums found: {len(schema.enums)}")
+    print(f"  FK references: {len(schema.refs)}")
 
     if errors:
         print(f"\n  [ERROR] {len(errors)} errors found:")
@@ -93,8 +210,9 @@ def validate_dbml(dbml_path):
     return True
 
 
-def validate_openapi(openapi_path):
+def validate_openapi(openapi_path, expect=None):
     """Validate OpenAPI 3.0 spec."""
+    expect = expect or {}
     print(f"\n{'='*60}")
     print(f"Validating OpenAPI: {openapi_path}")
     print('='*60)
@@ -103,12 +221,9 @@ def validate_openapi(openapi_path):
         print(f"  [ERROR] File not found: {openapi_path}")
         return False
 
-    with open(openapi_path, 'r') as f:
-        content = f.read()
-
     try:
-        spec = yaml.safe_load(content)
-    except yaml.YAMLError as e:
+        spec = read_artifact(openapi_path, 'openapi', safe_load)
+    except YAMLError as e:
         print(f"  [ERROR] YAML syntax error: {e}")
         return False
 
@@ -128,13 +243,7 @@ def validate_openapi(openapi_path):
         errors.append("Missing 'components' section")
 
     # Check required endpoints
-    required_paths = [
-        '/applications/submit',
-        '/applications/{applicationId}',
-        '/applications/{applicationId}/form',
-        '/applications/{applicationId}/withdraw',
-        '/applications/{applicationId}/attachments'
-    ]
+    required_paths = expect.get('required_paths', [])
 
     paths = spec.get('paths', {})
     for path in required_paths:
@@ -145,12 +254,7 @@ def validate_openapi(openapi_path):
 
     # Check schemas
     schemas = spec.get('components', {}).get('schemas', {})
-    required_schemas = [
-        'ApplicationResponse',
-        'StudentResponse',
-        'AttachmentResponse',
-        'ApplicationLifecycleEnum'
-    ]
+    required_schemas = expect.get('required_schemas', [])
 
     for schema in required_schemas:
         if schema not in schemas:
@@ -158,16 +262,23 @@ def validate_openapi(openapi_path):
 
     print(f"  [INFO] Found {len(schemas)} schemas")
 
-    # Check for ApplicationLifecycleEnum values
-    lifecycle_schema = schemas.get('ApplicationLifecycleEnum', {})
-    lifecycle_values = lifecycle_schema.get('enum', [])
-    expected_states = ['DRAFT', 'SUBMITTED', 'SCREENING', 'TEST', 'INTERVIEW', 'OFFER', 'ACCEPTED', 'REJECTED', 'WITHDRAWN']
-
-    for state in expected_states:
-        if state not in lifecycle_values:
-            errors.append(f"Missing lifecycle state in schema: {state}")
-
-    print(f"  [INFO] Lifecycle states: {len(lifecycle_values)}")
+    # Resolve every $ref (shared components once) and check each reachable schema.
+    # The files the references reached are inputs of the cached result too.
+    spec_path = Path(openapi_path).resolve()
+    resolver = RefResolver(lambda p: spec if p == spec_path else read_artifact(p, 'openapi', safe_load))
+    refs = resolver.check(spec_path)
+    _extra_inputs.extend(str(p) for p in resolver.files)
+    errors.extend(refs.errors)
+    warnings.extend(refs.warnings)
+    print(f"  [INFO] Resolved {refs.refs} $refs to {refs.targets} targets, checked {refs.schemas} schemas")
+
+    # Check enum schemas (e.g. lifecycle states) carry the expected values
+    for schema_name, expected_states in expect.get('enum_values', {}).items():
+        enum_values = schemas.get(schema_name, {}).get('enum', [])
+        for state in expected_states:
+            if state not in enum_values:
+                errors.append(f"Missing {schema_name} value in schema: {state}")
+        print(f"  [INFO] {schema_name} values: {len(enum_values)}")
 
     # Report
     if errors:
@@ -185,8 +296,24 @@ def validate_openapi(openapi_path):
     return True
 
 
-def validate_events(events_path):
-    """Validate domain events file."""
+def iter_events(stream, expect):
+    """Yield (event_type, line, event) one event at a time whatever the events
+    file layout, so memory does not grow with the number of events.
+
+    Layouts (from the manifest): one event per YAML document (default), a
+    list of events, or a mapping of name -> event held under `container`
+    (`.` for the document root).
+    """
+    name_key = expect.get('name_key', 'event_type')
+    for index, (name, line, event) in enumerate(iter_items(stream, expect.get('container')), 1):
+        if name is None:
+            name = event.get(name_key) if isinstance(event, dict) else None
+        yield name or f'Event #{index}', line, event
+
+
+def validate_events(events_path, expect=None):
+    """Validate domain events file in a single streaming pass."""
+    expect = expect or {}
     print(f"\n{'='*60}")
     print(f"Validating Events: {events_path}")
     print('='*60)
@@ -195,67 +322,43 @@ def validate_events(events_path):
         print(f"  [ERROR] File not found: {events_path}")
         return False
 
-    with open(events_path, 'r') as f:
-        content = f.read()
+    errors = []
+    naming_warnings = []
+
+    # Expected events based on lifecycle; found ones are crossed off as they stream by
+    missing_events = dict.fromkeys(expect.get('expected', []))
+    required_fields = expect.get('required_fields', ['description', 'payload'])
+    # Check event naming convention: {Entity}{State}d
+    naming_pattern = re.compile(expect.get('naming_pattern', r'^[A-Z][a-zA-Z]+$'))
 
+    count = 0
+    print(f"\n  Events found:")
     try:
-        docs = list(yaml.safe_load_all(content))
-    except yaml.YAMLError as e:
+        with open(events_path, 'r') as f:
+            for event_type, line, event in iter_events(f, expect):
+                count += 1
+                print(f"    - {event_type} (line {line})")
+                missing_events.pop(event_type, None)
+
+                if not naming_pattern.match(str(event_type)):
+                    naming_warnings.append(f"line {line}: Event '{event_type}' may not follow naming convention")
+
+                # Check each event has required fields
+                if not isinstance(event, dict):
+                    errors.append(f"line {line}: {event_type}: Event definition is not a mapping")
+                    continue
+                for field in required_fields:
+                    if field not in event:
+                        errors.append(f"line {line}: {event_type}: Missing required field '{field}'")
+    except YAMLError as e:
         print(f"  [ERROR] YAML syntax error: {e}")
         return False
 
-    # Filter out None documents (empty YAML docs)
-    docs = [d for d in docs if d is not None]
+    print(f"\n  [INFO] Found {count} event definitions")
 
-    errors = []
-    warnings = []
-
-    # Expected events based on lifecycle
-    expected_events = [
-        'ApplicationSubmitted',
-        'ApplicationScreened',
-        'ApplicationMovedToTest',
-        'ApplicationMovedToInterview',
-        'ApplicationOffered',
-        'ApplicationAccepted',
-        'ApplicationRejected',
-        'ApplicationWithdrawn'
-    ]
-
-    found_events = []
-    for doc in docs:
-        event_type = doc.get('event_type')
-        if event_type:
-            found_events.append(event_type)
-
-    print(f"  [INFO] Found {len(found_events)} event definitions")
-
-    for expected in expected_events:
-        if expected not in found_events:
-            warnings.append(f"Missing expected event: {expected}")
-
-    # Check each event has required fields
-    required_fields = ['event_type', 'description', 'trigger', 'source_transition', 'actor', 'payload', 'affects']
-
-    for i, doc in enumerate(docs):
-        if doc is None:
-            continue
-        event_type = doc.get('event_type', f'Event #{i+1}')
-        for field in required_fields:
-            if field not in doc:
-                errors.append(f"{event_type}: Missing required field '{field}'")
-
-    # Check event naming convention: {Entity}{State}d
-    naming_pattern = r'^[A-Z][a-zA-Z]+(Submitted|Screened|MovedToTest|MovedToInterview|Offered|Accepted|Rejected|Withdrawn|Detected|Resolved)$'
-    for event_type in found_events:
-        if not re.match(naming_pattern, event_type):
-            warnings.append(f"Event '{event_type}' may not follow naming convention")
+    warnings = [f"Missing expected event: {name}" for name in missing_events] + naming_warnings
 
     # Report
-    print(f"\n  Events found:")
-    for event in found_events:
-        print(f"    - {event}")
-
     if errors:
         print(f"\n  [ERROR] {len(errors)} errors found:")
         for err in errors:
@@ -271,14 +374,50 @@ def validate_events(events_path):
     return True
 
 
-def validate_tracability(context_dir):
+def validate_consistency(dbml_path, openapi_path, events_path):
+    """Cross-check DBML enums/columns against OpenAPI enums and event payload fields."""
+    print(f"\n{'='*60}")
+    print(f"Validating Consistency: DBML <-> OpenAPI <-> Events")
+    print('='*60)
+
+    if not os.path.exists(dbml_path):
+        print(f"  [ERROR] File not found: {dbml_path}")
+        return False
+
+    openapi_paths = [Path(openapi_path)] if os.path.exists(openapi_path) else []
+    report = check_artifacts(Path(dbml_path), openapi_paths, Path(events_path))
+    print(f"  [INFO] Indexed {report.symbols} symbols, {report.joined} joined across artifacts")
+
+    # Report
+    if report.errors:
+        print(f"\n  [ERROR] {len(report.errors)} errors found:")
+        for err in report.errors:
+            print(f"    - {err}")
+        return False
+
+    if report.warnings:
+        print(f"\n  [WARN] {len(report.warnings)} warnings:")
+        for warn in report.warnings:
+            print(f"    - {warn}")
+
+    print(f"\n  [OK] Consistency validation passed")
+    return True
+
+
+def _entity_key(name):
+    """Case- and separator-insensitive key for matching entity and table names."""
+    return re.sub(r'[^a-z0-9]', '', name.lower())
+
+
+def validate_tracability(context_dir, ontology_dir=None):
     """Validate tracability from ontology to generated files."""
     print(f"\n{'='*60}")
     print(f"Validating Tracability")
     print('='*60)
 
-    # Try multiple ontology locations
-    ontology_dirs = [
+    # Manifest location first, then the historical defaults
+    ontology_dirs = [ontology_dir] if ontology_dir else []
+    ontology_dirs += [
         os.path.join(context_dir, '..', '..', '5.ontology', 'application'),
         os.path.join(os.path.dirname(context_dir), '..', '..', '5.ontology', 'application'),
         '/Users/nguyenhuyvu/Library/CloudStorage/OneDrive-VNGCorporation/Apps/Project/A4B/test-odsa/5.ontology/application'
@@ -294,78 +433,185 @@ def validate_tracability(context_dir):
         print(f"  [WARN] Ontology directory not found")
         return True
 
-    # Read ontology files
-    ontology_entities = []
-    for f in os.listdir(ontology_dir):
-        if f.endswith('.yaml'):
-            with open(os.path.join(ontology_dir, f), 'r') as file:
-                content = file.read()
-                # Extract class names
-                class_match = re.search(r'^(\w+):', content, re.MULTILINE)
-                if class_match:
-                    ontology_entities.append(class_match.group(1))
+    # Ontology entities come from the shared index (files re-parsed only when changed);
+    # without the cache (--no-cache) the index is built in memory and nothing is written
+    ontology_files = sorted(glob.glob(os.path.join(ontology_dir, '*.yaml')))
+    with open_index(':memory:' if _cache is None else None, refresh=False) as index:
+        index.refresh(ontology_files)
+        ontology_entities = [e.name for e in index.entities(under=os.path.abspath(ontology_dir))]
 
     print(f"  [INFO] Ontology entities: {ontology_entities}")
 
-    # Check DBML has all entities
+    # Check DBML has all entities (FormFieldValue ~ form_field_value ~ form_field_values)
     dbml_path = os.path.join(context_dir, 'system', 'db.dbml')
     if os.path.exists(dbml_path):
-        with open(dbml_path, 'r') as f:
-            dbml_content = f.read().lower()
-
-        for entity in ontology_entities:
-            entity_snake = entity.lower()
-            if f'table {entity_snake}' not in dbml_content:
-                print(f"  [WARN] Entity '{entity}' not found as table in DBML")
+        try:
+            schema = read_artifact(dbml_path, 'dbml', parse_dbml)
+        except DBMLSyntaxError as e:
+            print(f"  [WARN] DBML not parsed ({e}); table check skipped")
+            schema = None
+
+        if schema is not None:
+            tables = {_entity_key(t.name) for t in schema.tables.values()}
+            for entity in ontology_entities:
+                key = _entity_key(entity)
+                if not {key, key + 's', key + 'es'} & tables:
+                    print(f"  [WARN] Entity '{entity}' not found as table in DBML")
 
     print(f"\n  [OK] Tracability check completed")
     return True
 
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python3 validate.py <context_dir>")
-        print("Example: python3 validate.py application/")
-        sys.exit(1)
-
-    context_dir = sys.argv[1]
+def validate_context(context_dir):
+    """Run every validation for one context; returns [(name, passed), ...]."""
     system_dir = os.path.join(context_dir, 'system')
+    manifest = load_manifest(system_dir)
+    ontology_dir = manifest.get('ontology_dir')
+    if ontology_dir:
+        ontology_dir = os.path.normpath(os.path.join(system_dir, ontology_dir))
 
     print(f"\n{'#'*60}")
     print(f"# ODDS System Builder - Validation Report")
     print(f"# Context: {context_dir}")
     print(f"{'#'*60}")
 
+    if not manifest:
+        print(f"  [WARN] No {MANIFEST_NAME} in {system_dir}; only structural checks will run")
+
     results = []
 
     # Validate DBML
     dbml_path = os.path.join(system_dir, 'db.dbml')
-    results.append(('DBML', validate_dbml(dbml_path)))
+    expect = manifest.get('dbml')
+    results.append(('DBML', run_check(
+        'dbml', [dbml_path], expect, lambda: validate_dbml(dbml_path, expect))))
 
     # Validate OpenAPI
     openapi_path = os.path.join(system_dir, 'canonical_api.openapi.yaml')
-    results.append(('OpenAPI', validate_openapi(openapi_path)))
+    expect = manifest.get('openapi')
+    results.append(('OpenAPI', run_check(
+        'openapi', [openapi_path], expect, lambda: validate_openapi(openapi_path, expect))))
 
     # Validate Events
     events_path = os.path.join(system_dir, 'events.yaml')
-    results.append(('Events', validate_events(events_path)))
-
-    # Validate Tracability
-    results.append(('Tracability', validate_tracability(context_dir)))
-
-    # Summary
+    expect = manifest.get('events')
+    results.append(('Events', run_check(
+        'events', [events_path], expect, lambda: validate_events(events_path, expect))))
+
+    # Cross-check the three artifacts against each other
+    results.append(('Consistency', run_check(
+        'consistency', [dbml_path, openapi_path, events_path], None,
+        lambda: validate_consistency(dbml_path, openapi_path, events_path))))
+
+    # Validate Tracability (depends on the DBML and every ontology file)
+    ontology_files = []
+    if ontology_dir and os.path.isdir(ontology_dir):
+        ontology_files = sorted(os.path.join(ontology_dir, f) for f in os.listdir(ontology_dir))
+    results.append(('Tracability', run_check(
+        'tracability', [dbml_path] + ontology_files, ontology_dir,
+        lambda: validate_tracability(context_dir, ontology_dir))))
+
+    return results
+
+
+def run_context(context_dir, cache_dir=None):
+    """Process-pool worker: validate one context, capturing its report."""
+    global _cache
+    _cache = ContentCache(cache_dir, VALIDATOR_VERSION) if cache_dir else None
+    started = time.perf_counter()
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        try:
+            results = validate_context(context_dir)
+        except Exception:
+            print(f"\n  [ERROR] Validator crashed:\n{traceback.format_exc()}")
+            results = [('Validator', False)]
+    return context_dir, buffer.getvalue(), results, time.perf_counter() - started
+
+
+def find_contexts(root):
+    """Find every context directory (one holding a system/ folder) under root."""
+    system_dirs = glob.glob(os.path.join(root, '*', 'system', ''))
+    return sorted(os.path.relpath(Path(p).parent) for p in system_dirs)
+
+
+def expand_contexts(patterns):
+    """Expand context arguments, which may be glob patterns.
+
+    Returns (contexts, unmatched): a plain argument that is not a context
+    directory, or a glob matching none, is listed in unmatched.
+    """
+    contexts = []
+    unmatched = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        found = [m.rstrip(os.sep) for m in matches if os.path.isdir(os.path.join(m, 'system'))]
+        if not found:
+            unmatched.append(pattern)
+        contexts.extend(found)
+    return contexts, unmatched
+
+
+def print_summary(reports):
+    """Print the combined pass/fail summary; returns True when everything passed."""
     print(f"\n{'='*60}")
     print(f"VALIDATION SUMMARY")
     print('='*60)
 
     all_passed = True
-    for name, passed in results:
-        status = "[PASS]" if passed else "[FAIL]"
-        print(f"  {status} {name}")
-        if not passed:
-            all_passed = False
+    for context_dir, _, results, elapsed in reports:
+        if len(reports) > 1:
+            print(f"\n  {context_dir} ({elapsed:.2f}s)")
+        for name, passed in results:
+            status = "[PASS]" if passed else "[FAIL]"
+            print(f"  {status} {name}")
+            if not passed:
+                all_passed = False
+    return all_passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate ODDS generated system files against ontology sources.")
+    parser.add_argument('contexts', nargs='*', help="Context directories or glob patterns (e.g. application/ or '*/')")
+    parser.add_argument('--all', action='store_true', help="Validate every */system/ context under --root")
+    parser.add_argument('--root', default=str(ODDS_DIR), help=f"Root searched by --all (default: {ODDS_DIR})")
+    parser.add_argument('--jobs', '-j', type=int, default=None, help="Worker processes (default: one per context, up to CPU count)")
+    parser.add_argument('--cache-dir', default=str(CACHE_DIR), help=f"Validation cache directory (default: {CACHE_DIR})")
+    parser.add_argument('--no-cache', action='store_true', help="Ignore and do not update the validation cache")
+    args = parser.parse_args()
+
+    contexts, unmatched = expand_contexts(args.contexts)
+    for pattern in unmatched:
+        what = "No context directory matches" if glob.has_magic(pattern) else "Not a context directory (no system/ folder)"
+        print(f"[ERROR] {what}: {pattern}", file=sys.stderr)
+    if unmatched:
+        sys.exit(1)
+    if args.all:
+        contexts += [c for c in find_contexts(args.root) if c not in contexts]
+    if not contexts:
+        parser.print_usage()
+        print("Example: python3 validate.py application/")
+        sys.exit(1)
+
+    worker = functools.partial(run_context, cache_dir=None if args.no_cache else args.cache_dir)
+
+    started = time.perf_counter()
+    if len(contexts) == 1:
+        reports = [worker(contexts[0])]
+    else:
+        jobs = args.jobs or min(len(contexts), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            reports = list(pool.map(worker, contexts))
+
+    for _, report, _, _ in reports:
+        print(report, end='')
+
+    all_passed = print_summary(reports)
 
     print(f"\n{'='*60}")
+    if len(reports) > 1:
+        slowest = max(elapsed for _, _, _, elapsed in reports)
+        print(f"Validated {len(reports)} contexts in {time.perf_counter() - started:.2f}s (slowest context {slowest:.2f}s)")
     if all_passed:
         print(f"[SUCCESS] All validations passed!")
         sys.exit(0)
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Build every HTML slide deck in the docs tree into PPTX.
+
+    python3 decks.py list
+    python3 decks.py build [--mode editable|screenshot|both] [-j N] [--force]
+
+Decks are the HTML files with a `.slide` element under docs/_research/SEP and
+docs/01-modules/*/05.experience/mockup (or the roots given with --root).
+
+- editable: html_to_pptx_editable.py, one deck per worker process
+  -> <name>-editable.pptx
+- screenshot: html_to_pptx.py, all stale decks in one batch sharing a browser
+  and its page pool -> <name>.pptx
+
+A deck is up to date when its output exists unchanged and the content hashes
+of the HTML, the local files it references and the converter script match
+the last build (mtime/size are checked first, so unchanged files are not
+re-hashed). Build records live in <deck dir>/.pptx-cache/. The run ends with
+a timing table.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+HERE = Path(__file__).resolve().parent
+DOCS_DIR = HERE.parents[1]
+
+TOOLS_DIR = next((p / "_tools" for p in HERE.parents if (p / "_tools").is_dir()), None)
+if TOOLS_DIR is not None:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+if TYPE_CHECKING:
+    from content_cache import ContentCache
+
+# content_cache (json, pickle, hashlib) is imported by the functions that
+# build, so --help and `list` start without it.
+
+DEFAULT_ROOTS = ("_research/SEP", "01-modules/*/05.experience/mockup")
+CACHE_DIR_NAME = ".pptx-cache"
+CONVERTERS = {
+    "editable": HERE / "html_to_pptx_editable.py",
+    "screenshot": HERE / "html_to_pptx.py",
+}
+
+_SLIDE_RE = re.compile(r"""class\s*=\s*["'][^"']*\bslide\b""")
+_LOCAL_REF_RE = re.compile(r"""(?:src|href)\s*=\s*["']([^"'#?:]+)["']""")
+# Result lines of html_to_pptx.py: "<prefix>: <path> (<details>)"
+SCREENSHOT_RESULTS = {"Wrote": "built", "Up to date": "up to date", "Skipped": "failed"}
+
+
+@dataclass
+class Job:
+    deck: Path
+    mode: str
+    output: Path
+    key: str = ""
+    status: str = "pending"  # built | up to date | failed
+    seconds: float = 0.0
+    error: str | None = None
+
+
+def find_decks(roots: list[str]) -> list[Path]:
+    """HTML files under the roots (globs relative to docs/) that contain a .slide element."""
+    decks = []
+    for pattern in roots:
+        for root in sorted(DOCS_DIR.glob(pattern)):
+            for html in sorted(root.rglob("*.html")):
+                if CACHE_DIR_NAME in html.parts:
+                    continue
+                if _SLIDE_RE.search(html.read_text(encoding="utf-8", errors="replace")):
+                    decks.append(html.resolve())
+    return list(dict.fromkeys(decks))
+
+
+def output_for(deck: Path, mode: str) -> Path:
+    return deck.with_name(f"{deck.stem}-editable.pptx") if mode == "editable" else deck.with_suffix(".pptx")
+
+
+def build_key(deck: Path, mode: str, cache: ContentCache) -> str:
+    """Hash over the deck, the local files it references and the converter."""
+    from content_cache import hash_key
+
+    html = deck.read_text(encoding="utf-8", errors="replace")
+    refs = sorted({ref for ref in _LOCAL_REF_RE.findall(html) if (deck.parent / ref).is_file()})
+    return hash_key(
+        mode,
+        cache.digest(deck),
+        cache.digest(CONVERTERS[mode]),
+        [(ref, cache.digest(deck.parent / ref)) for ref in refs],
+    )
+
+
+_caches: dict[Path, ContentCache] = {}
+
+
+def _cache(deck: Path) -> ContentCache:
+    """One cache per deck directory, so file digests are memoized across jobs."""
+    from content_cache import ContentCache
+
+    if deck.parent not in _caches:
+        _caches[deck.parent] = ContentCache(deck.parent / CACHE_DIR_NAME)
+    return _caches[deck.parent]
+
+
+def is_up_to_date(job: Job) -> bool:
+    from content_cache import hash_key
+
+    record = _cache(job.deck).get("decks", hash_key(str(job.output)))
+    if not record or record.get("key") != job.key:
+        return False
+    try:
+        st = job.output.stat()
+    except FileNotFoundError:
+        return False
+    return st.st_size == record.get("size") and st.st_mtime_ns == record.get("mtime_ns")
+
+
+def record_build(job: Job) -> None:
+    from content_cache import hash_key
+
+    st = job.output.stat()
+    _cache(job.deck).put("decks", hash_key(str(job.output)), {"key": job.key, "size": st.st_size, "mtime_ns": st.st_mtime_ns})
+
+
+def build_editable(deck: str, output: str) -> tuple[float, str | None]:
+    """Worker: convert one deck with html_to_pptx_editable. Returns (seconds, error)."""
+    started = time.perf_counter()
+    try:
+        from html_to_pptx_editable import _build_pptx
+
+        _build_pptx(Path(deck), Path(output))
+    except (Exception, SystemExit) as e:
+        return time.perf_counter() - started, str(e) or type(e).__name__
+    return time.perf_counter() - started, None
+
+
+def parse_screenshot_results(stdout: str) -> dict[str, tuple[str, str]]:
+    """Path -> (status, details) from the result lines html_to_pptx.py prints.
+
+    "Wrote:" and "Up to date:" name the output, "Skipped:" the deck.
+    """
+    results = {}
+    for line in stdout.splitlines():
+        prefix, sep, rest = line.partition(": ")
+        if sep and prefix in SCREENSHOT_RESULTS:
+            path, _, details = rest.rpartition(" (") if rest.endswith(")") else (rest, "", "")
+            results[path] = (SCREENSHOT_RESULTS[prefix], details.rstrip(")"))
+    return results
+
+
+def build_screenshots(jobs: list[Job], pool: int, force: bool = False) -> None:
+    """Convert all screenshot jobs in one html_to_pptx.py run (one browser, one page pool)."""
+    import subprocess
+
+    started = time.perf_counter()
+    cmd = [sys.executable, str(CONVERTERS["screenshot"]), *(str(j.deck) for j in jobs), "--pool", str(pool)]
+    if force:
+        cmd.append("--force")
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    elapsed = time.perf_counter() - started
+    results = parse_screenshot_results(proc.stdout)
+    for job in jobs:
+        job.seconds = elapsed
+        status, details = results.get(str(job.output)) or results.get(str(job.deck)) or ("failed", "")
+        if status == "failed":
+            job.error = details or (proc.stderr.strip().splitlines() or ["no output written"])[-1]
+        elif not job.output.exists():
+            status, job.error = "failed", "no output written"
+        job.status = status
+
+
+def print_table(jobs: list[Job], elapsed: float) -> None:
+    print()
+    print(f"{'deck':<58} {'mode':<10} {'status':<11} {'time':>8} {'size':>9}")
+    print("-" * 100)
+    for job in sorted(jobs, key=lambda j: j.seconds, reverse=True):
+        try:
+            label = str(job.deck.relative_to(DOCS_DIR))
+        except ValueError:
+            label = str(job.deck)
+        label = label if len(label) <= 58 else "..." + label[-55:]
+        size = f"{job.output.stat().st_size / (1024 * 1024):.1f} MB" if job.output.exists() else "-"
+        seconds = f"{job.seconds:.2f}s" if job.status != "up to date" else "-"
+        print(f"{label:<58} {job.mode:<10} {job.status:<11} {seconds:>8} {size:>9}")
+        if job.error:
+            print(f"    {job.error}")
+    print("-" * 100)
+    counts = {s: sum(j.status == s for j in jobs) for s in ("built", "up to date", "failed")}
+    print(
+        f"{len(jobs)} output(s): {counts['built']} built, {counts['up to date']} up to date, "
+        f"{counts['failed']} failed in {elapsed:.1f}s"
+    )
+
+
+def cmd_list(args) -> int:
+    decks = find_decks(args.root)
+    for deck in decks:
+        print(deck.relative_to(DOCS_DIR) if deck.is_relative_to(DOCS_DIR) else deck)
+    print(f"{len(decks)} deck(s)")
+    return 0
+
+
+def cmd_build(args) -> int:
+    from concurrent.futures import ProcessPoolExecutor
+
+    started = time.perf_counter()
+    decks = find_decks(args.root)
+    if not decks:
+        print("No HTML decks found")
+        return 1
+    modes = ["editable", "screenshot"] if args.mode == "both" else [args.mode]
+    jobs = [Job(deck, mode, output_for(deck, mode)) for mode in modes for deck in decks]
+
+    stale = []
+    for job in jobs:
+        job.key = build_key(job.deck, job.mode, _cache(job.deck))
+        if not args.force and is_up_to_date(job):
+            job.status = "up to date"
+        else:
+            stale.append(job)
+
+    editable = [j for j in stale if j.mode == "editable"]
+    screenshot = [j for j in stale if j.mode == "screenshot"]
+    print(f"{len(decks)} deck(s), {len(stale)} of {len(jobs)} output(s) to build")
+
+    workers = max(1, min(args.jobs or os.cpu_count() or 1, len(editable) or 1))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [(job, pool.submit(build_editable, str(job.deck), str(job.output))) for job in editable]
+        # The screenshot batch runs alongside the editable workers
+        if screenshot:
+            build_screenshots(screenshot, args.pool, args.force)
+        for job, future in futures:
+            job.seconds, job.error = future.result()
+            job.status = "failed" if job.error else "built"
+
+    for job in stale:
+        # "up to date" here means html_to_pptx.py found the output current for this key
+        if job.status in ("built", "up to date"):
+            record_build(job)
+
+    print_table(jobs, time.perf_counter() - started)
+    return 1 if any(j.status == "failed" for j in jobs) else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Find and convert the HTML slide decks in the docs tree.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_roots(p) -> None:
+        p.add_argument(
+            "--root",
+            action="append",
+            default=None,
+            help=f"Glob relative to docs/ to search (repeatable; default: {', '.join(DEFAULT_ROOTS)})",
+        )
+
+    p_list = sub.add_parser("list", help="List the HTML decks that would be built")
+    add_roots(p_list)
+    p_list.set_defaults(func=cmd_list)
+
+    p_build = sub.add_parser("build", help="Convert stale decks to PPTX")
+    add_roots(p_build)
+    p_build.add_argument("--mode", choices=["editable", "screenshot", "both"], default="editable")
+    p_build.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    p_build.add_argument("--pool", type=int, default=4, help="Browser pages for screenshot mode (default: 4)")
+    p_build.add_argument("--force", action="store_true", help="Rebuild even if up to date")
+    p_build.set_defaults(func=cmd_build)
+
+    args = parser.parse_args()
+    args.root = args.root or list(DEFAULT_ROOTS)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
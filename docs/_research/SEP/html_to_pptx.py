@@ -3,13 +3,99 @@ from __future__ import annotations
 
 import argparse
 import datetime as _dt
-import shutil
-import tempfile
+import io
+import os
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import urlparse
 
-from playwright.sync_api import sync_playwright
-from pptx import Presentation
-from pptx.util import Inches
+TOOLS_DIR = next((p / "_tools" for p in Path(__file__).resolve().parents if (p / "_tools").is_dir()), None)
+if TOOLS_DIR is not None:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+if TYPE_CHECKING:
+    from content_cache import ContentCache
+
+# Playwright, asyncio, PIL, python-pptx and the caching helpers (content_cache,
+# fsutil, json, hashlib) are imported where they are first used, so --help and argument
+# errors exit without loading them.
+
+# Per-deck manifests and cached screenshots live next to the decks
+CACHE_DIR_NAME = ".pptx-cache"
+
+SLIDE_WIDTH_IN = 13.333
+SLIDE_HEIGHT_IN = 7.5
+# Bytes a deck takes besides its pictures (template parts, slide XML), for --max-mb
+PPTX_OVERHEAD = 64 * 1024
+
+HIDE_CHROME_CSS = """
+.nav, .counter { display: none !important; }
+* , *::before, *::after { transition: none !important; animation: none !important; }
+"""
+
+# Activates slide i and resolves once it is ready to capture: the slide's images
+# have loaded and decoded, web fonts are ready, and two animation frames have
+# passed (the class change has been styled, laid out and painted).
+SHOW_SLIDE_JS = """
+async (i) => {
+  const slides = Array.from(document.querySelectorAll('.slide'));
+  slides.forEach((s, j) => {
+    s.classList.remove('active', 'prev');
+    if (j === i) s.classList.add('active');
+    else if (j < i) s.classList.add('prev');
+  });
+  const cur = document.getElementById('cur');
+  if (cur) cur.textContent = String(i + 1);
+
+  const images = Array.from(slides[i].querySelectorAll('img'));
+  await Promise.all(images.filter(img => !img.complete).map(img => new Promise(resolve => {
+    img.addEventListener('load', resolve, { once: true });
+    img.addEventListener('error', resolve, { once: true });
+  })));
+  await Promise.all(images.map(img => img.decode().catch(() => null)));
+  await document.fonts.ready;
+  await new Promise(resolve => requestAnimationFrame(() => requestAnimationFrame(resolve)));
+}
+"""
+
+
+# What a slide's screenshot depends on: the deck <head> and body-level styles,
+# the slide's own markup (without the active/prev state classes) and every
+# asset it references (images, sources, CSS background images).
+INSPECT_JS = """
+() => {
+  const abs = u => { try { return new URL(u, document.baseURI).href; } catch (e) { return u; } };
+  const assets = slide => {
+    const found = new Set();
+    slide.querySelectorAll('img, source, video, image, use').forEach(n => {
+      for (const a of ['src', 'srcset', 'poster', 'href', 'xlink:href']) {
+        const v = n.getAttribute(a);
+        if (v) v.split(',').forEach(part => found.add(abs(part.trim().split(/\\s+/)[0])));
+      }
+    });
+    [slide, ...slide.querySelectorAll('*')].forEach(n => {
+      for (const m of getComputedStyle(n).backgroundImage.matchAll(/url\\(["']?([^"')]+)["']?\\)/g)) {
+        found.add(abs(m[1]));
+      }
+    });
+    return [...found].filter(u => !u.startsWith('data:')).sort();
+  };
+  return {
+    head: document.head.outerHTML,
+    styles: Array.from(document.body.querySelectorAll('style')).map(s => s.textContent),
+    stylesheets: Array.from(document.querySelectorAll('link[rel=stylesheet]')).map(l => l.href),
+    slides: Array.from(document.querySelectorAll('.slide')).map(s => {
+      const clone = s.cloneNode(true);
+      clone.classList.remove('active', 'prev');
+      return { html: clone.outerHTML, assets: assets(s) };
+    }),
+  };
+}
+"""
 
 
 def _file_url(path: Path) -> str:
@@ -23,112 +109,408 @@ def _timestamp() -> str:
 def _backup_existing(path: Path) -> None:
     if not path.exists():
         return
+    import shutil
+
     backup = path.with_suffix(f".bak-{_timestamp()}{path.suffix}")
     shutil.move(str(path), str(backup))
 
 
-def _wait_images_loaded(page) -> None:
-    page.evaluate(
-        """
-        () => Promise.all(
-          Array.from(document.images).map(img => {
-            if (img.complete) return true;
-            return new Promise(resolve => {
-              const done = () => resolve(true);
-              img.addEventListener('load', done, { once: true });
-              img.addEventListener('error', done, { once: true });
-            });
-          })
-        )
-        """
+class _DeckPage:
+    """One page of the pool; keeps the deck it last loaded so slides of the same deck reuse it."""
+
+    def __init__(self, page) -> None:
+        self.page = page
+        self.deck: Path | None = None
+
+    async def load(self, deck: Path) -> None:
+        """Load `deck` unless it is already loaded."""
+        if self.deck != deck:
+            self.deck = None
+            await self.page.goto(_file_url(deck), wait_until="load")
+            await self.page.add_style_tag(content=HIDE_CHROME_CSS)
+            self.deck = deck
+
+    async def inspect(self, deck: Path) -> dict:
+        """Load `deck` and return what its slides' screenshots depend on (INSPECT_JS)."""
+        await self.load(deck)
+        return await self.page.evaluate(INSPECT_JS)
+
+    async def screenshot(self, deck: Path, index: int) -> bytes:
+        if self.deck != deck:
+            await self.load(deck)
+        await self.page.evaluate(SHOW_SLIDE_JS, index)
+        return await self.page.screenshot(full_page=False)
+
+
+def _asset_digest(url: str, cache: ContentCache) -> str | None:
+    """Content digest of a local (file://) asset; remote URLs are keyed by URL only."""
+    from urllib.request import url2pathname
+
+    parsed = urlparse(url)
+    if parsed.scheme != "file":
+        return None
+    return cache.digest(url2pathname(parsed.path))
+
+
+def slide_keys(info: dict, cache: ContentCache, width: int, height: int) -> list[str]:
+    """One hash per slide over its markup, its assets, the deck-wide styles and
+    the render settings; a slide needs a new screenshot only when its key changes."""
+    from content_cache import hash_key
+
+    deck_key = hash_key(
+        HIDE_CHROME_CSS,
+        SHOW_SLIDE_JS,
+        width,
+        height,
+        info["head"],
+        info["styles"],
+        [(url, _asset_digest(url, cache)) for url in info["stylesheets"]],
     )
+    return [
+        hash_key(deck_key, slide["html"], [(url, _asset_digest(url, cache)) for url in slide["assets"]])
+        for slide in info["slides"]
+    ]
+
+
+def deck_cache(deck: Path) -> ContentCache:
+    from content_cache import ContentCache
+
+    return ContentCache(deck.parent / CACHE_DIR_NAME)
+
+
+def manifest_path(deck: Path) -> Path:
+    return deck.parent / CACHE_DIR_NAME / f"{deck.name}.manifest.json"
+
+
+def load_manifest(deck: Path) -> dict:
+    import json
+
+    try:
+        return json.loads(manifest_path(deck).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+@dataclass
+class DeckRender:
+    """Screenshots of one deck plus the slide keys they were taken for."""
+
+    keys: list[str] = field(default_factory=list)
+    images: list[bytes] = field(default_factory=list)
+    rendered: int = 0  # screenshots taken this run (the rest came from the cache)
+
+
+async def render_decks(
+    decks: list[Path], width: int, height: int, pool: int, force: bool = False
+) -> dict[Path, DeckRender]:
+    """Screenshot the changed slides of every deck (PNG bytes, kept in memory)
+    with one browser and a pool of pages.
+
+    Each deck is inspected first and every slide is keyed by slide_keys();
+    slides whose key has a cached screenshot are not rendered again (unless
+    `force`). The remaining slides are handed out from a single queue (in deck
+    order, so a page keeps working on the deck it has loaded), so wall time
+    scales with changed slides / pool size rather than with the number of decks.
+    """
+    import asyncio
+
+    from playwright.async_api import async_playwright
+
+    results = {deck: DeckRender() for deck in decks}
+    caches = {deck: deck_cache(deck) for deck in decks}
+    async with async_playwright() as p:
+        browser = await p.chromium.launch()
+        try:
+            pages = [
+                _DeckPage(await browser.new_page(viewport={"width": width, "height": height}))
+                for _ in range(max(1, pool))
+            ]
+
+            # Inspect decks, one deck per page at a time
+            async def inspect(worker: _DeckPage, assigned: list[Path]) -> None:
+                for deck in assigned:
+                    info = await worker.inspect(deck)
+                    result = results[deck]
+                    result.keys = slide_keys(info, caches[deck], width, height)
+                    result.images = [
+                        b"" if force else caches[deck].get("slides", key, b"") for key in result.keys
+                    ]
+
+            await asyncio.gather(*(inspect(w, decks[k :: len(pages)]) for k, w in enumerate(pages)))
+
+            jobs = deque(
+                (deck, i) for deck in decks for i, data in enumerate(results[deck].images) if not data
+            )
+
+            async def work(worker: _DeckPage) -> None:
+                while jobs:
+                    deck, i = jobs.popleft()
+                    result = results[deck]
+                    result.images[i] = await worker.screenshot(deck, i)
+                    result.rendered += 1
+                    caches[deck].put("slides", result.keys[i], result.images[i])
+
+            await asyncio.gather(*(work(w) for w in pages))
+        finally:
+            await browser.close()
+    return results
+
+
+@dataclass(frozen=True)
+class ImageOptions:
+    """How slide screenshots are encoded into the deck."""
+
+    format: str = "png"  # png | jpeg
+    quality: int = 85  # jpeg only
+    dpi: int | None = None  # downscale to this many pixels per slide inch
+    colors: int | None = None  # png only: quantize to an N-color palette
+
+    def describe(self) -> str:
+        parts = [self.format.upper() + (f" q{self.quality}" if self.format == "jpeg" else "")]
+        if self.colors:
+            parts.append(f"{self.colors} colors")
+        if self.dpi:
+            parts.append(f"{self.dpi} dpi")
+        return ", ".join(parts)
+
+
+# From best to smallest; --max-mb takes the first step whose images fit
+BUDGET_LADDER = (
+    ImageOptions(),
+    ImageOptions(colors=256),
+    ImageOptions("jpeg", 90),
+    ImageOptions("jpeg", 80),
+    ImageOptions("jpeg", 80, dpi=120),
+    ImageOptions("jpeg", 70, dpi=110),
+    ImageOptions("jpeg", 60, dpi=96),
+    ImageOptions("jpeg", 50, dpi=72),
+)
+
+
+def encode_image(png: bytes, opts: ImageOptions) -> bytes:
+    """Re-encode a lossless screenshot according to `opts`."""
+    if opts == ImageOptions():
+        return png
+    from PIL import Image
+
+    img = Image.open(io.BytesIO(png))
+    if opts.dpi:
+        width = round(SLIDE_WIDTH_IN * opts.dpi)
+        if width < img.width:
+            img = img.resize((width, round(img.height * width / img.width)), Image.LANCZOS)
+    out = io.BytesIO()
+    if opts.format == "jpeg":
+        img.convert("RGB").save(out, "JPEG", quality=opts.quality, optimize=True, progressive=True)
+    else:
+        if opts.colors:
+            img = img.convert("RGB").quantize(colors=opts.colors)
+        img.save(out, "PNG", optimize=True)
+    return out.getvalue()
+
+
+def encode_deck(
+    images: list[bytes], opts: ImageOptions, max_bytes: int | None = None
+) -> tuple[ImageOptions, list[bytes]]:
+    """Encode a deck's screenshots with `opts`, or, with `max_bytes`, with the
+    first BUDGET_LADDER step that keeps the deck under it (the last step if none does)."""
+    import hashlib
+
+    steps = BUDGET_LADDER if max_bytes is not None else (opts,)
+    for step in steps:
+        encoded_by_hash: dict[str, bytes] = {}
+        encoded = []
+        for png in images:
+            digest = hashlib.sha1(png).hexdigest()
+            if digest not in encoded_by_hash:
+                encoded_by_hash[digest] = encode_image(png, step)
+            encoded.append(encoded_by_hash[digest])
+        size = PPTX_OVERHEAD + sum(len(b) for b in encoded_by_hash.values())
+        if max_bytes is None or size <= max_bytes:
+            break
+    return step, encoded
+
+
+def print_slide_sizes(images: list[bytes]) -> None:
+    import hashlib
+
+    first_seen: dict[str, int] = {}
+    for n, data in enumerate(images, 1):
+        digest = hashlib.sha1(data).hexdigest()
+        same = first_seen.setdefault(digest, n)
+        note = f"  (same image as slide {same})" if same != n else ""
+        print(f"    slide {n:>2}  {len(data) / 1024:>8.1f} KB{note}")
+
+
+def build_pptx(images: list[bytes], out_path: Path, backup: bool = False) -> int:
+    """Write one full-bleed picture slide per image; returns the number of
+    distinct image parts (pixel-identical screenshots share one part).
+
+    The file is replaced atomically; with `backup` the previous one is kept
+    as <name>.bak-<timestamp>.pptx.
+    """
+    import hashlib
+
+    from fsutil import atomic_write
+
+    from pptx import Presentation
+    from pptx.util import Inches
+
+    prs = Presentation()
+    prs.slide_width = Inches(SLIDE_WIDTH_IN)
+    prs.slide_height = Inches(SLIDE_HEIGHT_IN)
+    blank = prs.slide_layouts[6]
+
+    parts: dict[str, bytes] = {}
+    for data in images:
+        # Chromium encodes identical pixels to identical PNG bytes, and
+        # python-pptx reuses the image part of a blob it has already stored
+        data = parts.setdefault(hashlib.sha1(data).hexdigest(), data)
+        slide = prs.slides.add_slide(blank)
+        slide.shapes.add_picture(
+            io.BytesIO(data), 0, 0, width=prs.slide_width, height=prs.slide_height
+        )
+
+    out = io.BytesIO()
+    prs.save(out)
+    if backup:
+        _backup_existing(out_path)
+    atomic_write(out_path, out.getvalue())
+    return len(parts)
 
 
 def main() -> int:
     parser = argparse.ArgumentParser(
-        description="Convert an HTML slide deck (with .slide elements) into a PPTX by screenshotting each slide."
+        description="Convert HTML slide decks (with .slide elements) into PPTX files by screenshotting each slide."
     )
-    parser.add_argument("html", type=Path, help="Path to the HTML deck")
+    parser.add_argument("html", type=Path, nargs="+", help="Path(s) to the HTML deck(s)")
     parser.add_argument(
         "-o",
         "--output",
         type=Path,
         default=None,
-        help="Output .pptx path (default: same name as input, .pptx)",
+        help="Output .pptx path for a single deck (default: same name as input, .pptx)",
     )
     parser.add_argument("--width", type=int, default=1920, help="Viewport width (px)")
     parser.add_argument("--height", type=int, default=1080, help="Viewport height (px)")
+    parser.add_argument(
+        "--pool",
+        type=int,
+        default=min(4, os.cpu_count() or 1),
+        help="Browser pages rendering slides concurrently (default: min(4, CPUs))",
+    )
+    parser.add_argument(
+        "--image-format",
+        choices=["png", "jpeg"],
+        default="png",
+        help="Picture encoding (default: png, lossless)",
+    )
+    parser.add_argument("--quality", type=int, default=85, help="JPEG quality 1-95 (default: 85)")
+    parser.add_argument(
+        "--dpi",
+        type=int,
+        default=None,
+        help=f"Downscale screenshots to this resolution on the {SLIDE_WIDTH_IN}in-wide slide "
+        "(default: keep the viewport size, 1920px = 144 dpi)",
+    )
+    parser.add_argument(
+        "--colors", type=int, default=None, help="PNG only: quantize to a palette of N colors (2-256)"
+    )
+    parser.add_argument(
+        "--max-mb",
+        type=float,
+        default=None,
+        help="Size budget per deck: pick the best encoding that keeps the .pptx under N MB "
+        "(overrides the options above)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help=f"Re-render every slide and rewrite every deck, ignoring {CACHE_DIR_NAME}/",
+    )
+    parser.add_argument(
+        "--backup",
+        action="store_true",
+        help="Keep the .pptx being replaced as <name>.bak-<timestamp>.pptx (default: overwrite it)",
+    )
     args = parser.parse_args()
+    if args.colors is not None and not (2 <= args.colors <= 256):
+        raise SystemExit("--colors must be between 2 and 256")
+    if args.colors is not None and args.image_format != "png":
+        raise SystemExit("--colors only applies to --image-format png")
+    opts = ImageOptions(args.image_format, args.quality, args.dpi, args.colors)
+    max_bytes = int(args.max_mb * 1024 * 1024) if args.max_mb else None
 
-    html_path: Path = args.html
-    if not html_path.exists():
-        raise SystemExit(f"HTML not found: {html_path}")
+    decks: list[Path] = list(dict.fromkeys(p.resolve() for p in args.html))
+    missing = [p for p in decks if not p.exists()]
+    if missing:
+        raise SystemExit(f"HTML not found: {', '.join(map(str, missing))}")
+    if args.output and len(decks) > 1:
+        raise SystemExit("--output can only be used with a single HTML deck")
 
-    out_path: Path = args.output or html_path.with_suffix(".pptx")
-    out_path.parent.mkdir(parents=True, exist_ok=True)
+    import asyncio
+    import json
 
-    with tempfile.TemporaryDirectory(prefix="html_to_pptx_") as tmpdir:
-        tmpdir_path = Path(tmpdir)
+    from fsutil import atomic_write
 
-        with sync_playwright() as p:
-            browser = p.chromium.launch()
-            page = browser.new_page(viewport={"width": args.width, "height": args.height})
-            page.goto(_file_url(html_path))
-            page.wait_for_load_state("domcontentloaded")
+    started = time.perf_counter()
+    failed = 0
+    renders = asyncio.run(render_decks(decks, args.width, args.height, args.pool, args.force))
 
-            page.add_style_tag(
-                content="""
-                .nav, .counter { display: none !important; }
-                * , *::before, *::after { transition: none !important; animation: none !important; }
-                """
-            )
-            _wait_images_loaded(page)
-
-            slide_count: int = page.evaluate("() => document.querySelectorAll('.slide').length")
-            if slide_count <= 0:
-                raise SystemExit("No slides found (expected elements with class .slide).")
-
-            prs = Presentation()
-            prs.slide_width = Inches(13.333)
-            prs.slide_height = Inches(7.5)
-            blank = prs.slide_layouts[6]
-
-            for i in range(slide_count):
-                page.evaluate(
-                    """
-                    (i) => {
-                      const slides = Array.from(document.querySelectorAll('.slide'));
-                      slides.forEach((s, j) => {
-                        s.classList.remove('active', 'prev');
-                        if (j === i) s.classList.add('active');
-                        else if (j < i) s.classList.add('prev');
-                      });
-                      const cur = document.getElementById('cur');
-                      if (cur) cur.textContent = String(i + 1);
-                    }
-                    """,
-                    i,
-                )
-                page.wait_for_timeout(30)
-                _wait_images_loaded(page)
-
-                img_path = tmpdir_path / f"slide-{i+1:02d}.png"
-                page.screenshot(path=str(img_path), full_page=False)
-
-                slide = prs.slides.add_slide(blank)
-                slide.shapes.add_picture(
-                    str(img_path), 0, 0, width=prs.slide_width, height=prs.slide_height
-                )
-
-            browser.close()
+    for deck in decks:
+        render = renders[deck]
+        if not render.images:
+            print(f"Skipped: {deck} (no slides found, expected elements with class .slide)")
+            failed += 1
+            continue
+        out_path: Path = (args.output or deck.with_suffix(".pptx")).resolve()
+        settings = {"encoding": repr(opts), "max_mb": args.max_mb}
+        manifest = load_manifest(deck)
+        if (
+            not args.force
+            and manifest.get("slides") == render.keys
+            and manifest.get("settings") == settings
+            and manifest.get("output") == str(out_path)
+            and out_path.exists()
+            and out_path.stat().st_size == manifest.get("output_size")
+        ):
+            print(f"Up to date: {out_path} ({len(render.keys)} slides unchanged)")
+            continue
 
-        _backup_existing(out_path)
-        prs.save(str(out_path))
+        used, images = encode_deck(render.images, opts, max_bytes)
+        distinct = build_pptx(images, out_path, args.backup)
+        shared = len(images) - distinct
+        size = out_path.stat().st_size
+        atomic_write(
+            manifest_path(deck),
+            json.dumps(
+                {
+                    "deck": deck.name,
+                    "output": str(out_path),
+                    "output_size": size,
+                    "settings": settings,
+                    "encoding": used.describe(),
+                    "slides": render.keys,
+                },
+                indent=2,
+            ),
+        )
+        print(
+            f"Wrote: {out_path} ({len(images)} slides, {render.rendered} re-rendered, "
+            f"{used.describe()}, {size / (1024 * 1024):.1f} MB"
+            + (f", {shared} sharing an identical image)" if shared else ")")
+        )
+        if max_bytes is not None and size > max_bytes:
+            print(f"  Warning: still over the {args.max_mb:g} MB budget at the smallest setting")
+        print_slide_sizes(images)
 
-    print(f"Wrote: {out_path}")
-    return 0
+    total = sum(len(r.images) for r in renders.values())
+    rendered = sum(r.rendered for r in renders.values())
+    print(
+        f"Rendered {rendered} of {total} slides from {len(decks)} deck(s) "
+        f"in {time.perf_counter() - started:.1f}s (pool {args.pool})"
+    )
+    return 1 if failed else 0
 
 
 if __name__ == "__main__":
     raise SystemExit(main())
-
@@ -2,45 +2,116 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import re
-from dataclasses import dataclass
+import struct
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterable
+from typing import TYPE_CHECKING, Callable, Iterable
 
-from bs4 import BeautifulSoup
-from PIL import Image
-from pptx import Presentation
-from pptx.dml.color import RGBColor
-from pptx.enum.shapes import MSO_AUTO_SHAPE_TYPE
-from pptx.enum.text import PP_ALIGN
-from pptx.util import Inches, Pt
+if TYPE_CHECKING:
+    from pptx.dml.color import RGBColor
 
+# lxml, PIL and python-pptx (~100 ms to import) are imported inside the
+# functions that use them, so --help and argument errors exit without loading
+# them and decks.py can import this module cheaply.
 
-WIDE_W = Inches(13.333)
-WIDE_H = Inches(7.5)
+WIDE_W_IN = 13.333
+WIDE_H_IN = 7.5
 
 COLORS = {
-    "bg": RGBColor(0x0A, 0x0E, 0x1A),
-    "surface": RGBColor(0x11, 0x18, 0x27),
-    "card": RGBColor(0x1A, 0x22, 0x35),
-    "text": RGBColor(0xE2, 0xE8, 0xF0),
-    "dim": RGBColor(0x94, 0xA3, 0xB8),
-    "purple": RGBColor(0x63, 0x66, 0xF1),
-    "cyan": RGBColor(0x06, 0xB6, 0xD4),
-    "amber": RGBColor(0xF5, 0x9E, 0x0B),
-    "green": RGBColor(0x10, 0xB9, 0x81),
-    "pink": RGBColor(0xEC, 0x48, 0x99),
+    "bg": "0A0E1A",
+    "surface": "111827",
+    "card": "1A2235",
+    "border": "222B3D",
+    "text": "E2E8F0",
+    "dim": "94A3B8",
+    "purple": "6366F1",
+    "cyan": "06B6D4",
+    "amber": "F59E0B",
+    "green": "10B981",
+    "pink": "EC4899",
 }
 
 
+@functools.lru_cache(maxsize=None)
+def _rgb(name: str) -> RGBColor:
+    from pptx.dml.color import RGBColor
+
+    return RGBColor.from_string(COLORS[name])
+
+
 def _safe_text(text: str) -> str:
     t = re.sub(r"\s+", " ", text or "").strip()
     return t
 
 
-def _img_contain(path: Path, max_w_in: float, max_h_in: float) -> tuple[float, float]:
-    with Image.open(path) as im:
-        w, h = im.size
+# =============================================================================
+# IMAGE ASSETS
+# =============================================================================
+# Picture sizes come from the file header (no pixels decoded) and are memoized
+# by (path, mtime, size), so an asset shown on several slides or decks is
+# measured once and an edited asset is measured again. python-pptx stores one
+# image part per distinct image (by SHA-1), so every slide showing an asset
+# references the same embedded copy.
+
+
+def _jpeg_size(f) -> tuple[int, int] | None:
+    """Scan JPEG markers (after SOI) for the frame header."""
+    while True:
+        marker = f.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        code = marker[1]
+        while code == 0xFF:  # fill bytes
+            nxt = f.read(1)
+            if not nxt:
+                return None
+            code = nxt[0]
+        if code == 0x01 or 0xD0 <= code <= 0xD8:  # markers without a length
+            continue
+        length = f.read(2)
+        if len(length) < 2:
+            return None
+        if 0xC0 <= code <= 0xCF and code not in (0xC4, 0xC8, 0xCC):
+            frame = f.read(5)
+            if len(frame) < 5:
+                return None
+            h, w = struct.unpack(">xHH", frame)
+            return w, h
+        f.seek(struct.unpack(">H", length)[0] - 2, 1)
+
+
+@functools.lru_cache(maxsize=None)
+def _header_size(path: str, mtime_ns: int, size: int) -> tuple[int, int]:
+    """Pixel size of an image (mtime/size are only part of the cache key)."""
+    with open(path, "rb") as f:
+        head = f.read(24)
+        if head.startswith(b"\x89PNG\r\n\x1a\n") and head[12:16] == b"IHDR":
+            return struct.unpack(">II", head[16:24])
+        if head[:6] in (b"GIF87a", b"GIF89a"):
+            return struct.unpack("<HH", head[6:10])
+        if head.startswith(b"\xff\xd8"):
+            f.seek(2)
+            dims = _jpeg_size(f)
+            if dims:
+                return dims
+    from PIL import Image
+
+    with Image.open(path) as im:  # other formats: PIL reads the header lazily too
+        return im.size
+
+
+def _image_size(path: Path) -> tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return _header_size(str(path), st.st_mtime_ns, st.st_size)
+
+
+def _img_contain(size: tuple[int, int], max_w_in: float, max_h_in: float) -> tuple[float, float]:
+    w, h = size
     if w <= 0 or h <= 0:
         return max_w_in, max_h_in
     scale = min(max_w_in / (w / 96.0), max_h_in / (h / 96.0))
@@ -54,13 +125,17 @@ def _set_bg(slide, color: RGBColor) -> None:
 
 
 def _add_tag(slide, text: str) -> None:
+    from pptx.enum.shapes import MSO_AUTO_SHAPE_TYPE
+    from pptx.enum.text import PP_ALIGN
+    from pptx.util import Inches, Pt
+
     if not text:
         return
     x, y, w, h = Inches(0.6), Inches(0.4), Inches(3.0), Inches(0.45)
     shape = slide.shapes.add_shape(MSO_AUTO_SHAPE_TYPE.ROUNDED_RECTANGLE, x, y, w, h)
     shape.fill.solid()
-    shape.fill.fore_color.rgb = COLORS["surface"]
-    shape.line.color.rgb = COLORS["purple"]
+    shape.fill.fore_color.rgb = _rgb("surface")
+    shape.line.color.rgb = _rgb("purple")
     shape.line.width = Pt(1)
     tf = shape.text_frame
     tf.clear()
@@ -69,11 +144,14 @@ def _add_tag(slide, text: str) -> None:
     run.text = text.upper()
     run.font.size = Pt(10)
     run.font.bold = True
-    run.font.color.rgb = COLORS["purple"]
+    run.font.color.rgb = _rgb("purple")
     p.alignment = PP_ALIGN.CENTER
 
 
 def _add_title(slide, title: str, subtitle: str | None = None) -> None:
+    from pptx.enum.text import PP_ALIGN
+    from pptx.util import Inches, Pt
+
     title = _safe_text(title)
     subtitle = _safe_text(subtitle or "")
     if title:
@@ -84,7 +162,7 @@ def _add_title(slide, title: str, subtitle: str | None = None) -> None:
         p.text = title
         p.font.size = Pt(40)
         p.font.bold = True
-        p.font.color.rgb = COLORS["text"]
+        p.font.color.rgb = _rgb("text")
         p.alignment = PP_ALIGN.CENTER
     if subtitle:
         tb = slide.shapes.add_textbox(Inches(1.5), Inches(2.2), Inches(10.3), Inches(1.0))
@@ -93,7 +171,7 @@ def _add_title(slide, title: str, subtitle: str | None = None) -> None:
         p = tf.paragraphs[0]
         p.text = subtitle
         p.font.size = Pt(16)
-        p.font.color.rgb = COLORS["dim"]
+        p.font.color.rgb = _rgb("dim")
         p.alignment = PP_ALIGN.CENTER
 
 
@@ -114,6 +192,9 @@ def _add_cards_grid(
     w: float = 11.9,
     h: float = 4.6,
 ) -> None:
+    from pptx.enum.shapes import MSO_AUTO_SHAPE_TYPE
+    from pptx.util import Inches, Pt
+
     if not cards:
         return
     gap = 0.25
@@ -135,8 +216,8 @@ def _add_cards_grid(
             Inches(card_h),
         )
         shape.fill.solid()
-        shape.fill.fore_color.rgb = COLORS["card"]
-        shape.line.color.rgb = RGBColor(0x22, 0x2B, 0x3D)
+        shape.fill.fore_color.rgb = _rgb("card")
+        shape.line.color.rgb = _rgb("border")
         shape.line.width = Pt(1)
 
         if card.accent and card.accent in COLORS:
@@ -148,7 +229,7 @@ def _add_cards_grid(
                 Inches(card_h),
             )
             stripe.fill.solid()
-            stripe.fill.fore_color.rgb = COLORS[card.accent]
+            stripe.fill.fore_color.rgb = _rgb(card.accent)
             stripe.line.fill.background()
 
         tf = shape.text_frame
@@ -162,13 +243,13 @@ def _add_cards_grid(
         p1.text = _safe_text(card.title)
         p1.font.size = Pt(16)
         p1.font.bold = True
-        p1.font.color.rgb = COLORS["text"]
+        p1.font.color.rgb = _rgb("text")
 
         if card.body:
             p2 = tf.add_paragraph()
             p2.text = _safe_text(card.body)
             p2.font.size = Pt(12)
-            p2.font.color.rgb = COLORS["dim"]
+            p2.font.color.rgb = _rgb("dim")
 
 
 def _add_bullets(
@@ -181,6 +262,8 @@ def _add_bullets(
     w: float = 11.0,
     h: float = 4.9,
 ) -> None:
+    from pptx.util import Inches, Pt
+
     tb = slide.shapes.add_textbox(Inches(x), Inches(y), Inches(w), Inches(h))
     tf = tb.text_frame
     tf.clear()
@@ -190,74 +273,353 @@ def _add_bullets(
         p.text = _safe_text(title)
         p.font.size = Pt(20)
         p.font.bold = True
-        p.font.color.rgb = COLORS["text"]
+        p.font.color.rgb = _rgb("text")
     for i, it in enumerate(items):
         p = tf.add_paragraph() if (title or i > 0) else tf.paragraphs[0]
         p.text = _safe_text(it)
         p.level = 0
         p.font.size = Pt(14)
-        p.font.color.rgb = COLORS["dim"]
+        p.font.color.rgb = _rgb("dim")
 
 
 def _add_image_center(slide, img_path: Path, *, y_top: float = 2.1, max_h: float = 4.9) -> None:
-    if not img_path.exists():
+    from pptx.util import Inches
+
+    size = _image_size(img_path)
+    if size is None:
         return
     max_w = 12.2
-    w_in, h_in = _img_contain(img_path, max_w, max_h)
+    w_in, h_in = _img_contain(size, max_w, max_h)
     x = (13.333 - w_in) / 2.0
     y = y_top + max(0.0, (max_h - h_in) / 2.0)
     slide.shapes.add_picture(str(img_path), Inches(x), Inches(y), width=Inches(w_in), height=Inches(h_in))
 
 
-def _parse_cards(slide_div) -> list[Card]:
-    cards: list[Card] = []
-    for card_div in slide_div.select(".card"):
-        title = _safe_text(card_div.select_one("h3").get_text(" ", strip=True) if card_div.select_one("h3") else "")
-        body = _safe_text(card_div.get_text(" ", strip=True))
-        if title and body.startswith(title):
-            body = _safe_text(body[len(title) :])
-        accent = None
-        classes = set(card_div.get("class", []))
-        if "purple-border" in classes:
-            accent = "purple"
-        elif "cyan-border" in classes:
-            accent = "cyan"
-        elif "amber-border" in classes:
-            accent = "amber"
-        elif "green-border" in classes:
-            accent = "green"
-        cards.append(Card(title=title, body=body, accent=accent))
-    return cards
-
-
-def _find_slide_image(slide_div) -> str | None:
-    img = slide_div.select_one(".img-container img") or slide_div.select_one("img")
-    if not img:
-        return None
-    src = (img.get("src") or "").strip()
-    return src or None
+# =============================================================================
+# SLIDE MODEL
+# =============================================================================
+# Each div.slide is walked once (lxml, no selector matching) and its nodes are
+# classified into a SlideModel; the layout code below only reads the model.
+
+_NO_TEXT_TAGS = {"script", "style", "template"}
+_BORDER_ACCENTS = (("purple-border", "purple"), ("cyan-border", "cyan"), ("amber-border", "amber"), ("green-border", "green"))
+_PHASE_ACCENTS = (("p1", "purple"), ("p2", "cyan"), ("p3", "green"))
+_GRID_COLS = {"grid2": 2, "grid3": 3, "grid4": 4, "grid5": 5}
+# Pseudo-class for slides whose picture comes from the deck's assets/ folder
+ASSET_IMAGE = "@asset-image"
+
+
+def _classes(el) -> list[str]:
+    return (el.get("class") or "").split()
+
+
+def _text(el) -> str:
+    """Whitespace-normalised text of an element (BeautifulSoup's get_text(" ", strip=True))."""
+    if el is None:
+        return ""
+    parts: list[str] = []
+
+    def collect(node) -> None:
+        if node.text and node.tag not in _NO_TEXT_TAGS:
+            parts.append(node.text)
+        for child in node:
+            if isinstance(child.tag, str):
+                collect(child)
+            if child.tail:
+                parts.append(child.tail)
+
+    collect(el)
+    return _safe_text(" ".join(parts))
+
+
+def _first(el, tag: str | None = None, cls: str | None = None):
+    """First descendant with the given tag and/or class, or None."""
+    for d in el.iterdescendants(tag) if tag else el.iterdescendants():
+        if isinstance(d.tag, str) and (cls is None or cls in _classes(d)):
+            return d
+    return None
+
+
+def _accent(el, table: tuple[tuple[str, str], ...], default: str | None = None) -> str | None:
+    classes = set(_classes(el))
+    return next((accent for cls, accent in table if cls in classes), default)
+
+
+@dataclass
+class CtaBox:
+    title: str = ""
+    text: str = ""
+    pills: list[str] = field(default_factory=list)
+
+
+@dataclass
+class SlideModel:
+    tag: str = ""
+    h1: str = ""
+    h2: str = ""
+    subtitle: str = ""
+    image_src: str | None = None
+    grid_cols: set[int] = field(default_factory=set)  # column counts of the .gridN containers present
+    stats: list[Card] = field(default_factory=list)  # one per .stat (num, label), empty ones included
+    flow_steps: list[str] = field(default_factory=list)
+    phase_cards: list[Card] = field(default_factory=list)
+    cards: list[Card] = field(default_factory=list)
+    cta: CtaBox | None = None
+    text: str = ""
+    classes: set[str] = field(default_factory=set)  # every class in the subtree, plus ASSET_IMAGE
+
+
+def _card(el) -> Card:
+    title = _text(_first(el, "h3"))
+    body = _text(el)
+    if title and body.startswith(title):
+        body = _safe_text(body[len(title) :])
+    return Card(title=title, body=body, accent=_accent(el, _BORDER_ACCENTS))
+
+
+def _phase_card(el) -> Card:
+    period = _text(_first(el, cls="period"))
+    lis = [_text(li) for li in el.iterdescendants("li")]
+    body = "\n".join([period] + lis if period else lis)
+    return Card(title=_text(_first(el, "h3")), body=body, accent=_accent(el, _PHASE_ACCENTS, "purple"))
+
+
+def _stat(el) -> Card:
+    return Card(title=_text(_first(el, cls="num")), body=_text(_first(el, cls="label")), accent="cyan")
+
+
+def parse_slide(slide_div) -> SlideModel:
+    """Classify a slide's nodes in a single walk of its subtree."""
+    model = SlideModel(text=_text(slide_div))
+    first: dict[str, object] = {}
+    cta_boxes = 0
+    pills: list[str] = []
+
+    def visit(el, in_img_container: bool, in_cta: bool) -> None:
+        nonlocal cta_boxes
+        for child in el:
+            tag = child.tag
+            if not isinstance(tag, str):
+                continue
+            classes = _classes(child)
+            model.classes.update(classes)
+            if tag in ("h1", "h2"):
+                first.setdefault(tag, child)
+                if in_cta and tag == "h1":
+                    first.setdefault("cta_h1", child)
+            elif tag == "img":
+                first.setdefault("img", child)
+                if in_img_container:
+                    first.setdefault("container_img", child)
+            elif in_cta and tag == "p":
+                first.setdefault("cta_p", child)
+            elif in_cta and tag == "span":
+                pills.append(_text(child))
+            for cls in classes:
+                if cls in ("tag", "subtitle"):
+                    first.setdefault(cls, child)
+                elif cls in _GRID_COLS:
+                    model.grid_cols.add(_GRID_COLS[cls])
+                elif cls == "stat":
+                    model.stats.append(_stat(child))
+                elif cls == "flow-step":
+                    model.flow_steps.append(_text(child))
+                elif cls == "phase-card":
+                    model.phase_cards.append(_phase_card(child))
+                elif cls == "card":
+                    model.cards.append(_card(child))
+                elif cls == "cta-box":
+                    cta_boxes += 1
+            visit(child, in_img_container or "img-container" in classes, in_cta or "cta-box" in classes)
+
+    visit(slide_div, False, False)
+
+    model.tag = _text(first.get("tag"))
+    model.h1 = _text(first.get("h1"))
+    model.h2 = _text(first.get("h2"))
+    model.subtitle = _text(first.get("subtitle"))
+    img = first.get("container_img", first.get("img"))
+    if img is not None:
+        model.image_src = (img.get("src") or "").strip() or None
+    if model.image_src and model.image_src.startswith("assets/"):
+        model.classes.add(ASSET_IMAGE)
+    if cta_boxes:
+        model.cta = CtaBox(title=_text(first.get("cta_h1")), text=_text(first.get("cta_p")), pills=pills)
+    return model
+
+
+def parse_slides(html: str) -> list[SlideModel]:
+    import lxml.html
+
+    root = lxml.html.document_fromstring(html)
+    return [parse_slide(div) for div in root.iter("div") if "slide" in _classes(div)]
+
+
+# =============================================================================
+# LAYOUTS
+# =============================================================================
+# Each layout declares the CSS classes a slide must contain (`requires`, and
+# at least one of `any_of`). The first registered layout that matches wins, so
+# register from most to least specific. A slide's dispatch key is its class
+# set restricted to the classes layouts mention; the chosen layout is memoized
+# per key, so picking a layout is one dict lookup for every slide after the
+# first of its kind.
+
+
+@dataclass(frozen=True)
+class Layout:
+    name: str
+    fn: Callable[..., None]
+    requires: frozenset[str] = frozenset()
+    any_of: frozenset[str] = frozenset()
+
+    def matches(self, classes: frozenset[str]) -> bool:
+        return self.requires <= classes and (not self.any_of or bool(self.any_of & classes))
+
+
+LAYOUTS: list[Layout] = []
+_LAYOUT_CLASSES: set[str] = set()
+_LAYOUT_BY_KEY: dict[frozenset[str], Layout] = {}
+
+
+def layout(name: str, requires: Iterable[str] = (), any_of: Iterable[str] = ()):
+    """Register `fn(slide, model, html_dir)` as a slide layout."""
+
+    def register(fn):
+        entry = Layout(name, fn, frozenset(requires), frozenset(any_of))
+        LAYOUTS.append(entry)
+        _LAYOUT_CLASSES.update(entry.requires | entry.any_of)
+        _LAYOUT_BY_KEY.clear()
+        return fn
+
+    return register
+
+
+def choose_layout(model: SlideModel) -> Layout:
+    key = frozenset(model.classes & _LAYOUT_CLASSES)
+    found = _LAYOUT_BY_KEY.get(key)
+    if found is None:
+        found = _LAYOUT_BY_KEY[key] = next(entry for entry in LAYOUTS if entry.matches(key))
+    return found
+
+
+@layout("image", requires={ASSET_IMAGE})
+def _layout_image(slide, model: SlideModel, html_dir: Path) -> None:
+    _add_image_center(slide, (html_dir / model.image_src).resolve(), y_top=2.4, max_h=4.7)
+
+
+@layout("stat-grid", requires={"grid4", "stat"})
+def _layout_stats(slide, model: SlideModel, html_dir: Path) -> None:
+    stats = [stat for stat in model.stats if stat.title or stat.body]
+    _add_cards_grid(slide, stats, cols=4, x0=0.7, y0=2.7, w=11.9, h=2.6)
+
+
+@layout("flow-steps", requires={"flow-step"})
+def _layout_flow(slide, model: SlideModel, html_dir: Path) -> None:
+    items = [step for step in model.flow_steps if step]
+    _add_bullets(slide, "", items, x=1.4, y=2.3, w=10.6, h=4.9)
+
+
+@layout("phase-cards", requires={"phase-card"})
+def _layout_phases(slide, model: SlideModel, html_dir: Path) -> None:
+    _add_cards_grid(slide, model.phase_cards, cols=3, x0=0.7, y0=2.6, w=11.9, h=4.6)
+
+
+@layout("card-grid", requires={"card"}, any_of=_GRID_COLS)
+def _layout_cards(slide, model: SlideModel, html_dir: Path) -> None:
+    cols = 3 if 3 in model.grid_cols else 5 if 5 in model.grid_cols else 4 if 4 in model.grid_cols else 2
+    _add_cards_grid(slide, model.cards, cols=cols, x0=0.7, y0=2.6, w=11.9, h=4.6)
+
+
+@layout("cta", requires={"cta-box"})
+def _layout_cta(slide, model: SlideModel, html_dir: Path) -> None:
+    from pptx.enum.shapes import MSO_AUTO_SHAPE_TYPE
+    from pptx.enum.text import PP_ALIGN
+    from pptx.util import Inches, Pt
+
+    _set_bg(slide, _rgb("surface"))
+    h1_cta = model.cta.title
+    p_cta = model.cta.text
+    if h1_cta:
+        tb = slide.shapes.add_textbox(Inches(0.9), Inches(1.4), Inches(11.6), Inches(2.0))
+        tf = tb.text_frame
+        tf.clear()
+        p = tf.paragraphs[0]
+        p.text = h1_cta
+        p.font.size = Pt(34)
+        p.font.bold = True
+        p.font.color.rgb = _rgb("text")
+        p.alignment = PP_ALIGN.CENTER
+    if p_cta:
+        tb = slide.shapes.add_textbox(Inches(1.2), Inches(3.6), Inches(10.9), Inches(1.2))
+        tf = tb.text_frame
+        tf.clear()
+        p = tf.paragraphs[0]
+        p.text = p_cta
+        p.font.size = Pt(16)
+        p.font.color.rgb = _rgb("dim")
+        p.alignment = PP_ALIGN.CENTER
+
+    pills = model.cta.pills
+    if pills:
+        x = 1.2
+        y = 5.2
+        for pill in pills:
+            w = max(1.6, min(4.2, 0.12 * len(pill) + 1.0))
+            shape = slide.shapes.add_shape(
+                MSO_AUTO_SHAPE_TYPE.ROUNDED_RECTANGLE, Inches(x), Inches(y), Inches(w), Inches(0.5)
+            )
+            shape.fill.solid()
+            shape.fill.fore_color.rgb = _rgb("card")
+            shape.line.fill.background()
+            tf = shape.text_frame
+            tf.clear()
+            p = tf.paragraphs[0]
+            p.text = pill
+            p.font.size = Pt(12)
+            p.font.bold = True
+            p.font.color.rgb = _rgb("text")
+            p.alignment = PP_ALIGN.CENTER
+            x += w + 0.2
+            if x > 11.5:
+                x = 1.2
+                y += 0.65
+
+
+@layout("text")
+def _layout_text(slide, model: SlideModel, html_dir: Path) -> None:
+    from pptx.util import Inches, Pt
+
+    fallback = model.text
+    if fallback:
+        tb = slide.shapes.add_textbox(Inches(1.0), Inches(2.4), Inches(11.3), Inches(4.8))
+        tf = tb.text_frame
+        tf.clear()
+        p = tf.paragraphs[0]
+        p.text = fallback
+        p.font.size = Pt(14)
+        p.font.color.rgb = _rgb("dim")
 
 
 def _build_pptx(html_path: Path, out_path: Path) -> None:
-    html = html_path.read_text(encoding="utf-8")
-    soup = BeautifulSoup(html, "lxml")
-    slide_divs = soup.select("div.slide")
-    if not slide_divs:
+    from pptx import Presentation
+    from pptx.enum.text import PP_ALIGN
+    from pptx.util import Inches, Pt
+
+    slides = parse_slides(html_path.read_text(encoding="utf-8"))
+    if not slides:
         raise SystemExit("No slides found (expected div.slide).")
 
     prs = Presentation()
-    prs.slide_width = WIDE_W
-    prs.slide_height = WIDE_H
+    prs.slide_width = Inches(WIDE_W_IN)
+    prs.slide_height = Inches(WIDE_H_IN)
     blank = prs.slide_layouts[6]
 
-    for slide_div in slide_divs:
+    for model in slides:
         slide = prs.slides.add_slide(blank)
-        _set_bg(slide, COLORS["bg"])
+        _set_bg(slide, _rgb("bg"))
 
-        tag = _safe_text(slide_div.select_one(".tag").get_text(" ", strip=True) if slide_div.select_one(".tag") else "")
-        h1 = _safe_text(slide_div.select_one("h1").get_text(" ", strip=True) if slide_div.select_one("h1") else "")
-        h2 = _safe_text(slide_div.select_one("h2").get_text(" ", strip=True) if slide_div.select_one("h2") else "")
-        subtitle = _safe_text(slide_div.select_one(".subtitle").get_text(" ", strip=True) if slide_div.select_one(".subtitle") else "")
+        tag, h1, h2, subtitle = model.tag, model.h1, model.h2, model.subtitle
 
         if tag:
             _add_tag(slide, tag)
@@ -271,7 +633,7 @@ def _build_pptx(html_path: Path, out_path: Path) -> None:
             p.text = title
             p.font.size = Pt(34 if h2 else 54)
             p.font.bold = True
-            p.font.color.rgb = COLORS["text"]
+            p.font.color.rgb = _rgb("text")
             p.alignment = PP_ALIGN.CENTER
 
         if subtitle:
@@ -281,124 +643,10 @@ def _build_pptx(html_path: Path, out_path: Path) -> None:
             p = tf.paragraphs[0]
             p.text = subtitle
             p.font.size = Pt(16)
-            p.font.color.rgb = COLORS["dim"]
+            p.font.color.rgb = _rgb("dim")
             p.alignment = PP_ALIGN.CENTER
 
-        img_src = _find_slide_image(slide_div)
-        if img_src and img_src.startswith("assets/"):
-            _add_image_center(slide, (html_path.parent / img_src).resolve(), y_top=2.4, max_h=4.7)
-            continue
-
-        grid3 = slide_div.select_one(".grid3")
-        grid4 = slide_div.select_one(".grid4")
-        grid5 = slide_div.select_one(".grid5")
-        grid2 = slide_div.select_one(".grid2")
-
-        if grid4 and slide_div.select_one(".stat"):
-            stats = []
-            for stat in slide_div.select(".stat"):
-                num = _safe_text(stat.select_one(".num").get_text(" ", strip=True) if stat.select_one(".num") else "")
-                label = _safe_text(
-                    stat.select_one(".label").get_text(" ", strip=True) if stat.select_one(".label") else ""
-                )
-                if num or label:
-                    stats.append(Card(title=num, body=label, accent="cyan"))
-            _add_cards_grid(slide, stats, cols=4, x0=0.7, y0=2.7, w=11.9, h=2.6)
-            continue
-
-        if slide_div.select_one(".flow-step"):
-            items = []
-            for step in slide_div.select(".flow-step"):
-                txt = _safe_text(step.get_text(" ", strip=True))
-                if txt:
-                    items.append(txt)
-            _add_bullets(slide, "", items, x=1.4, y=2.3, w=10.6, h=4.9)
-            continue
-
-        if slide_div.select_one(".phase-card"):
-            cards: list[Card] = []
-            for phase in slide_div.select(".phase-card"):
-                phase_title = _safe_text(phase.select_one("h3").get_text(" ", strip=True) if phase.select_one("h3") else "")
-                period = _safe_text(phase.select_one(".period").get_text(" ", strip=True) if phase.select_one(".period") else "")
-                lis = [_safe_text(li.get_text(" ", strip=True)) for li in phase.select("li")]
-                body = "\n".join([period] + lis if period else lis)
-                accent = "purple"
-                classes = set(phase.get("class", []))
-                if "p1" in classes:
-                    accent = "purple"
-                elif "p2" in classes:
-                    accent = "cyan"
-                elif "p3" in classes:
-                    accent = "green"
-                cards.append(Card(title=phase_title, body=body, accent=accent))
-            _add_cards_grid(slide, cards, cols=3, x0=0.7, y0=2.6, w=11.9, h=4.6)
-            continue
-
-        cards = _parse_cards(slide_div)
-        if cards and (grid5 or grid4 or grid3 or grid2):
-            cols = 3 if grid3 else 5 if grid5 else 4 if grid4 else 2
-            _add_cards_grid(slide, cards, cols=cols, x0=0.7, y0=2.6, w=11.9, h=4.6)
-            continue
-
-        if slide_div.select_one(".cta-box"):
-            _set_bg(slide, COLORS["surface"])
-            h1_cta = _safe_text(slide_div.select_one(".cta-box h1").get_text(" ", strip=True))
-            p_cta = _safe_text(slide_div.select_one(".cta-box p").get_text(" ", strip=True))
-            if h1_cta:
-                tb = slide.shapes.add_textbox(Inches(0.9), Inches(1.4), Inches(11.6), Inches(2.0))
-                tf = tb.text_frame
-                tf.clear()
-                p = tf.paragraphs[0]
-                p.text = h1_cta
-                p.font.size = Pt(34)
-                p.font.bold = True
-                p.font.color.rgb = COLORS["text"]
-                p.alignment = PP_ALIGN.CENTER
-            if p_cta:
-                tb = slide.shapes.add_textbox(Inches(1.2), Inches(3.6), Inches(10.9), Inches(1.2))
-                tf = tb.text_frame
-                tf.clear()
-                p = tf.paragraphs[0]
-                p.text = p_cta
-                p.font.size = Pt(16)
-                p.font.color.rgb = COLORS["dim"]
-                p.alignment = PP_ALIGN.CENTER
-
-            pills = [_safe_text(s.get_text(" ", strip=True)) for s in slide_div.select(".cta-box span")]
-            if pills:
-                x = 1.2
-                y = 5.2
-                for pill in pills:
-                    w = max(1.6, min(4.2, 0.12 * len(pill) + 1.0))
-                    shape = slide.shapes.add_shape(
-                        MSO_AUTO_SHAPE_TYPE.ROUNDED_RECTANGLE, Inches(x), Inches(y), Inches(w), Inches(0.5)
-                    )
-                    shape.fill.solid()
-                    shape.fill.fore_color.rgb = COLORS["card"]
-                    shape.line.fill.background()
-                    tf = shape.text_frame
-                    tf.clear()
-                    p = tf.paragraphs[0]
-                    p.text = pill
-                    p.font.size = Pt(12)
-                    p.font.bold = True
-                    p.font.color.rgb = COLORS["text"]
-                    p.alignment = PP_ALIGN.CENTER
-                    x += w + 0.2
-                    if x > 11.5:
-                        x = 1.2
-                        y += 0.65
-            continue
-
-        fallback = _safe_text(slide_div.get_text("\n", strip=True))
-        if fallback:
-            tb = slide.shapes.add_textbox(Inches(1.0), Inches(2.4), Inches(11.3), Inches(4.8))
-            tf = tb.text_frame
-            tf.clear()
-            p = tf.paragraphs[0]
-            p.text = fallback
-            p.font.size = Pt(14)
-            p.font.color.rgb = COLORS["dim"]
+        choose_layout(model).fn(slide, model, html_path.parent)
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
     prs.save(str(out_path))
@@ -416,6 +664,8 @@ def main() -> int:
     )
     args = parser.parse_args()
     html_path: Path = args.html
+    if not html_path.is_file():
+        parser.error(f"HTML not found: {html_path}")
     out_path = args.output or html_path.with_name(f"{html_path.stem}-editable.pptx")
     _build_pptx(html_path, out_path)
     print(f"Wrote: {out_path}")
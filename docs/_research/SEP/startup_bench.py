@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the deck scripts.
+
+Runs each script's fail-fast paths (--help and a missing input) and reports
+for each one:
+- the median wall time,
+- the total import time and the slowest top-level imports, from one
+  extra run under `python -X importtime`.
+
+Exits 1 when a median exceeds the budget (default 100 ms).
+
+    python3 startup_bench.py [--runs 11] [--budget-ms 100] [--top 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+
+CASES = [
+    ("html_to_pptx.py", ["--help"]),
+    ("html_to_pptx.py", ["missing.html"]),
+    ("html_to_pptx_editable.py", ["--help"]),
+    ("html_to_pptx_editable.py", ["missing.html"]),
+    ("decks.py", ["--help"]),
+]
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    """(module, self_us, cumulative_us) per line of -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|", 2)
+        rows.append((name.rstrip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def run_case(script: str, args: list[str], runs: int) -> tuple[float, list[tuple[str, int, int]]]:
+    """Median wall time (ms) over `runs`, plus the import rows of one extra
+    -X importtime run (kept out of the timing, which it inflates)."""
+    cmd = [sys.executable, str(HERE / script), *args]
+    # Untimed warm-up, so bytecode compilation and a cold disk cache are not measured
+    subprocess.run(cmd, capture_output=True, cwd=HERE)
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(cmd, capture_output=True, cwd=HERE)
+        times.append((time.perf_counter() - started) * 1000)
+    proc = subprocess.run([sys.executable, "-X", "importtime", *cmd[1:]], capture_output=True, text=True, cwd=HERE)
+    return statistics.median(times), parse_importtime(proc.stderr)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure startup time of the deck scripts' fail-fast paths.")
+    parser.add_argument("--runs", type=int, default=11, help="Runs per case (default: 11)")
+    parser.add_argument("--budget-ms", type=float, default=100.0, help="Median wall time budget (default: 100)")
+    parser.add_argument("--top", type=int, default=5, help="Slowest top-level imports to list (default: 5)")
+    args = parser.parse_args()
+
+    over = 0
+    print(f"Python {sys.version.split()[0]}, {args.runs} runs per case, budget {args.budget_ms:g} ms")
+    print("=" * 80)
+    width = max(len(f"{script} {' '.join(case_args)}") for script, case_args in CASES)
+    for script, case_args in CASES:
+        wall_ms, rows = run_case(script, case_args, args.runs)
+        # Top-level imports are the lines without leading indentation in the name column
+        top = [(name.strip(), cum) for name, _, cum in rows if name.startswith(" ") and not name.startswith("  ")]
+        imports_ms = sum(cum for _, cum in top) / 1000
+        status = "[OK]" if wall_ms <= args.budget_ms else "[SLOW]"
+        over += wall_ms > args.budget_ms
+        case = f"{script} {' '.join(case_args)}"
+        print(f"{status:<7} {case:<{width}} {wall_ms:>7.1f} ms wall, {imports_ms:>6.1f} ms imports")
+        for name, cum in sorted(top, key=lambda r: -r[1])[: args.top]:
+            print(f"          {cum / 1000:>7.1f} ms  {name}")
+    print("=" * 80)
+    print(f"{len(CASES) - over} of {len(CASES)} case(s) within {args.budget_ms:g} ms")
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: pure-Python vs libyaml YAML loading on our largest files.
+
+For each file it times SafeLoader vs CSafeLoader (best of N runs) and checks
+the loaded objects are equal. It also reports whether SafeDumper and
+CSafeDumper emit identical text with the options our scripts use (they may
+not: libyaml folds long double-quoted scalars differently, which is why
+yaml_loader.safe_dump keeps the pure-Python emitter).
+
+Usage: python3 bench_yaml_loader.py [--top N] [--repeat N] [path ...]
+Default: the 10 largest *.yaml files under docs/.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+import yaml
+
+DOCS_DIR = Path(__file__).resolve().parents[1]
+DUMP_OPTIONS = dict(default_flow_style=False, allow_unicode=True, sort_keys=False, width=100, indent=2)
+
+
+def _best_of(repeat: int, fn) -> tuple[float, object]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def _largest_yaml(top: int) -> list[Path]:
+    files = [p for p in DOCS_DIR.rglob("*.yaml") if p.is_file()]
+    files.sort(key=lambda p: p.stat().st_size, reverse=True)
+    return files[:top]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark pure-Python vs libyaml YAML loading.")
+    parser.add_argument("paths", nargs="*", type=Path, help="YAML files (default: largest under docs/)")
+    parser.add_argument("--top", type=int, default=10, help="Number of largest files to use (default: 10)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement, best is kept (default: 3)")
+    args = parser.parse_args()
+
+    if not yaml.__with_libyaml__:
+        print("PyYAML is not built with libyaml; nothing to compare (the loader falls back to pure Python).")
+        return 1
+
+    paths = args.paths or _largest_yaml(args.top)
+    print(f"{'file':<60} {'KB':>7} {'python':>9} {'libyaml':>9} {'speedup':>8}  load  C-dump")
+    print("-" * 111)
+
+    total_py = total_c = 0.0
+    mismatches = 0
+    for path in paths:
+        text = path.read_text(encoding="utf-8")
+        try:
+            t_py, data_py = _best_of(args.repeat, lambda: list(yaml.load_all(text, Loader=yaml.SafeLoader)))
+            t_c, data_c = _best_of(args.repeat, lambda: list(yaml.load_all(text, Loader=yaml.CSafeLoader)))
+        except yaml.YAMLError as e:
+            print(f"{_label(path):<60} skipped (YAML error: {str(e).splitlines()[0]})")
+            continue
+
+        same = data_py == data_c
+        dump_py = yaml.dump_all(data_py, Dumper=yaml.SafeDumper, **DUMP_OPTIONS)
+        dump_c = yaml.dump_all(data_py, Dumper=yaml.CSafeDumper, **DUMP_OPTIONS)
+        mismatches += not same
+
+        total_py += t_py
+        total_c += t_c
+        print(
+            f"{_label(path):<60} {len(text.encode('utf-8')) / 1024:>7.1f} "
+            f"{t_py * 1000:>7.1f}ms {t_c * 1000:>7.1f}ms {t_py / t_c:>7.1f}x  {'same' if same else 'DIFF':<5} {'same' if dump_py == dump_c else 'diff'}"
+        )
+
+    print("-" * 111)
+    if total_c:
+        print(f"{'total':<68} {total_py * 1000:>7.1f}ms {total_c * 1000:>7.1f}ms {total_py / total_c:>7.1f}x")
+    if mismatches:
+        print(f"[ERROR] {mismatches} file(s) load differently with libyaml")
+        return 1
+    print("[OK] libyaml loads identical objects for every file")
+    return 0
+
+
+def _label(path: Path) -> str:
+    try:
+        label = str(path.resolve().relative_to(DOCS_DIR))
+    except ValueError:
+        label = str(path)
+    return label if len(label) <= 60 else "..." + label[-57:]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
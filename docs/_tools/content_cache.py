@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Persistent on-disk cache keyed by file content hash.
+
+Entries live under a cache directory (e.g. `.odds-cache/`) as one pickle
+file per key, grouped in buckets (`parsed/`, `results/`, ...). File digests
+are SHA-256 of the file bytes; a small stat record (mtime + size) per path
+lets unchanged files be recognised without reading them again.
+
+All writes go through a temp file + os.replace, so concurrent processes
+(e.g. a validation process pool) never observe partial entries.
+
+Usage: python3 content_cache.py <cache_dir> [--clear]
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import sys
+from pathlib import Path
+from typing import Any
+
+from fsutil import atomic_write
+
+
+def hash_key(*parts: Any) -> str:
+    """Stable SHA-256 key over JSON-serialisable parts."""
+    payload = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ContentCache:
+    """Content-addressed pickle store rooted at `root`."""
+
+    def __init__(self, root: str | Path, version: str = "1"):
+        self.root = Path(root)
+        self.version = version
+        self._digests: dict[str, str | None] = {}
+
+    # --- file digests -------------------------------------------------------
+
+    def digest(self, path: str | Path) -> str | None:
+        """SHA-256 of the file's bytes, or None when the file does not exist."""
+        path = os.path.abspath(path)
+        if path in self._digests:
+            return self._digests[path]
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            self._digests[path] = None
+            return None
+
+        stat_path = self.root / "stat" / f"{hashlib.sha1(path.encode('utf-8')).hexdigest()}.json"
+        try:
+            record = json.loads(stat_path.read_text(encoding="utf-8"))
+            if record["mtime_ns"] == st.st_mtime_ns and record["size"] == st.st_size:
+                self._digests[path] = record["sha256"]
+                return record["sha256"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+        sha = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                sha.update(chunk)
+        value = sha.hexdigest()
+        record = {"path": path, "mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha256": value}
+        atomic_write(stat_path, json.dumps(record).encode("utf-8"))
+        self._digests[path] = value
+        return value
+
+    # --- entries --------------------------------------------------------------
+
+    def _entry_path(self, bucket: str, key: str) -> Path:
+        return self.root / bucket / key[:2] / f"{key}.pickle"
+
+    def key(self, *parts: Any) -> str:
+        """Cache key including the cache version (bump it to invalidate)."""
+        return hash_key(self.version, *parts)
+
+    def get(self, bucket: str, key: str, default: Any = None) -> Any:
+        try:
+            with open(self._entry_path(bucket, key), "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return default
+
+    def put(self, bucket: str, key: str, value: Any) -> None:
+        atomic_write(self._entry_path(bucket, key), pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def clear(self) -> None:
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+def main() -> int:
+    if len(sys.argv) < 2:
+        print("Usage: python3 content_cache.py <cache_dir> [--clear]")
+        return 1
+    root = Path(sys.argv[1])
+    if "--clear" in sys.argv[2:]:
+        ContentCache(root).clear()
+        print(f"Cleared {root}")
+        return 0
+    for bucket in sorted(p for p in root.iterdir() if p.is_dir()) if root.exists() else []:
+        files = [f for f in bucket.rglob("*") if f.is_file()]
+        size = sum(f.stat().st_size for f in files)
+        print(f"{bucket.name:<10} {len(files):>6} entries {size / 1024:>10.1f} KB")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,753 @@
+#!/usr/bin/env python3
+"""
+DBML parser - single-pass tokenizer and recursive-descent parser.
+
+Builds a typed in-memory model (tables, columns, settings, refs, enums,
+indexes, table groups and notes) from a DBML file. The tokenizer walks the
+text exactly once with one compiled regex, and the parser walks the token
+list exactly once, so parsing is linear in the file size. Nested blocks
+(`indexes {}`, `Note {}`, triple-quoted notes containing braces) are handled
+structurally instead of by brace-matching regexes.
+
+Malformed column lines and stray top-level tokens do not abort the file:
+the rest of the line is skipped and a warning with its line number is kept
+in `Schema.warnings`. Composite primary keys may also be declared in the
+table body (`pk ((a, b))` or `(a, b) [pk]`).
+
+Usage: python3 dbml_parser.py <file.dbml> [<file.dbml> ...]
+"""
+
+from __future__ import annotations
+
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+class DBMLSyntaxError(Exception):
+    """Raised when the DBML text cannot be parsed."""
+
+    def __init__(self, message: str, line: int):
+        super().__init__(f"line {line}: {message}")
+        self.line = line
+
+
+# =============================================================================
+# MODEL
+# =============================================================================
+
+
+@dataclass
+class Ref:
+    source_table: str
+    source_columns: list[str]
+    op: str
+    target_table: str
+    target_columns: list[str]
+    name: str | None = None
+    settings: dict[str, str | None] = field(default_factory=dict)
+    inline: bool = False
+    line: int = 0
+
+
+@dataclass
+class Column:
+    name: str
+    type: str
+    settings: dict[str, str | None] = field(default_factory=dict)
+    ref: Ref | None = None
+    line: int = 0
+
+    @property
+    def pk(self) -> bool:
+        return "pk" in self.settings or "primary key" in self.settings
+
+    @property
+    def not_null(self) -> bool:
+        return "not null" in self.settings
+
+    @property
+    def unique(self) -> bool:
+        return "unique" in self.settings
+
+    @property
+    def default(self) -> str | None:
+        return self.settings.get("default")
+
+    @property
+    def note(self) -> str | None:
+        return self.settings.get("note")
+
+
+@dataclass
+class Index:
+    columns: list[str]
+    settings: dict[str, str | None] = field(default_factory=dict)
+    line: int = 0
+
+    @property
+    def pk(self) -> bool:
+        return "pk" in self.settings or "primary key" in self.settings
+
+    @property
+    def unique(self) -> bool:
+        return "unique" in self.settings
+
+
+@dataclass
+class Table:
+    name: str
+    schema: str | None = None
+    alias: str | None = None
+    columns: dict[str, Column] = field(default_factory=dict)
+    indexes: list[Index] = field(default_factory=list)
+    settings: dict[str, str | None] = field(default_factory=dict)
+    note: str | None = None
+    line: int = 0
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.schema}.{self.name}" if self.schema else self.name
+
+    @property
+    def primary_key(self) -> list[str]:
+        """Columns of the primary key (column-level [pk] or composite index [pk])."""
+        cols = [c.name for c in self.columns.values() if c.pk]
+        if cols:
+            return cols
+        for index in self.indexes:
+            if index.pk:
+                return list(index.columns)
+        return []
+
+
+@dataclass
+class EnumValue:
+    name: str
+    settings: dict[str, str | None] = field(default_factory=dict)
+    line: int = 0
+
+
+@dataclass
+class Enum:
+    name: str
+    schema: str | None = None
+    values: list[EnumValue] = field(default_factory=list)
+    line: int = 0
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.schema}.{self.name}" if self.schema else self.name
+
+    @property
+    def value_names(self) -> list[str]:
+        return [v.name for v in self.values]
+
+
+@dataclass
+class TableGroup:
+    name: str
+    tables: list[str] = field(default_factory=list)
+    line: int = 0
+
+
+@dataclass
+class Note:
+    name: str | None
+    text: str
+    line: int = 0
+
+
+@dataclass
+class Schema:
+    """Parsed DBML document. Tables and enums are keyed by bare name."""
+
+    project: str | None = None
+    tables: dict[str, Table] = field(default_factory=dict)
+    enums: dict[str, Enum] = field(default_factory=dict)
+    refs: list[Ref] = field(default_factory=list)
+    groups: dict[str, TableGroup] = field(default_factory=dict)
+    notes: list[Note] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)  # "line N: ..." for lines skipped while parsing
+
+    def table(self, name: str) -> Table | None:
+        """Look up a table by bare name, `schema.name` or alias."""
+        if name in self.tables:
+            return self.tables[name]
+        bare = name.rsplit(".", 1)[-1]
+        table = self.tables.get(bare)
+        if table is not None:
+            return table
+        for table in self.tables.values():
+            if table.alias == name:
+                return table
+        return None
+
+
+# =============================================================================
+# TOKENIZER
+# =============================================================================
+
+_TOKEN_RE = re.compile(
+    r"""
+      (?P<NEWLINE>\n)
+    | (?P<SPACE>[ \t\r\f\v]+)
+    | (?P<LINE_COMMENT>//[^\n]*)
+    | (?P<BLOCK_COMMENT>/\*.*?\*/)
+    | (?P<TRIPLE>'''.*?''')
+    | (?P<STRING>'(?:\\.|[^'\\\n])*'|"(?:\\.|[^"\\])*")
+    | (?P<EXPR>`[^`]*`)
+    | (?P<COLOR>\#[0-9A-Fa-f]{3,8}\b)
+    | (?P<NUMBER>-?\d+(?:\.\d+)?\b)
+    | (?P<IDENT>[^\W\d]\w*)
+    | (?P<REL><>|[<>-])
+    | (?P<PUNCT>[{}\[\]():,.])
+    | (?P<OTHER>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+
+@dataclass
+class Token:
+    kind: str
+    value: str
+    line: int
+
+
+def tokenize(text: str) -> list[Token]:
+    """Split DBML text into tokens in a single pass (comments are dropped)."""
+    tokens: list[Token] = []
+    line = 1
+    for m in _TOKEN_RE.finditer(text):
+        kind = m.lastgroup
+        value = m.group()
+        if kind == "NEWLINE":
+            tokens.append(Token(kind, value, line))
+            line += 1
+            continue
+        if kind in ("SPACE", "LINE_COMMENT"):
+            continue
+        if kind == "BLOCK_COMMENT":
+            line += value.count("\n")
+            continue
+        if kind == "TRIPLE":
+            tokens.append(Token("STRING", _dedent_note(value[3:-3]), line))
+            line += value.count("\n")
+            continue
+        if kind == "STRING":
+            tokens.append(Token(kind, value[1:-1], line))
+            line += value.count("\n")
+            continue
+        if kind == "EXPR":
+            value = value[1:-1]
+        tokens.append(Token(kind, value, line))
+    tokens.append(Token("EOF", "", line))
+    return tokens
+
+
+def _dedent_note(text: str) -> str:
+    lines = text.split("\n")
+    if lines and not lines[0].strip():
+        lines = lines[1:]
+    if lines and not lines[-1].strip():
+        lines = lines[:-1]
+    indents = [len(ln) - len(ln.lstrip()) for ln in lines if ln.strip()]
+    cut = min(indents) if indents else 0
+    return "\n".join(ln[cut:] for ln in lines)
+
+
+# =============================================================================
+# PARSER
+# =============================================================================
+
+
+class _Parser:
+    def __init__(self, tokens: list[Token]):
+        self.tokens = tokens
+        self.pos = 0
+        self.schema = Schema()
+
+    # --- token helpers -------------------------------------------------------
+
+    def peek(self, offset: int = 0) -> Token:
+        return self.tokens[min(self.pos + offset, len(self.tokens) - 1)]
+
+    def next(self) -> Token:
+        tok = self.tokens[self.pos]
+        if tok.kind != "EOF":
+            self.pos += 1
+        return tok
+
+    def at(self, value: str) -> bool:
+        tok = self.peek()
+        return tok.kind in ("PUNCT", "REL") and tok.value == value
+
+    def at_keyword(self, *names: str) -> bool:
+        tok = self.peek()
+        return tok.kind == "IDENT" and tok.value.lower() in names
+
+    def expect(self, value: str) -> Token:
+        tok = self.next()
+        if tok.value != value or tok.kind not in ("PUNCT", "REL"):
+            raise DBMLSyntaxError(f"expected '{value}', got '{tok.value or tok.kind}'", tok.line)
+        return tok
+
+    def skip_newlines(self) -> None:
+        while self.peek().kind == "NEWLINE":
+            self.pos += 1
+
+    def name(self) -> str:
+        tok = self.next()
+        if tok.kind not in ("IDENT", "STRING", "NUMBER"):
+            raise DBMLSyntaxError(f"expected a name, got '{tok.value or tok.kind}'", tok.line)
+        return tok.value
+
+    def qualified_name(self) -> tuple[str | None, str]:
+        """Parse `name` or `schema.name`."""
+        first = self.name()
+        if self.at(".") and self.peek(1).kind in ("IDENT", "STRING"):
+            self.next()
+            return first, self.name()
+        return None, first
+
+    def skip_block(self) -> None:
+        """Skip a balanced `{ ... }` block."""
+        self.expect("{")
+        depth = 1
+        while depth:
+            tok = self.next()
+            if tok.kind == "EOF":
+                raise DBMLSyntaxError("unterminated block", tok.line)
+            if tok.kind == "PUNCT":
+                if tok.value == "{":
+                    depth += 1
+                elif tok.value == "}":
+                    depth -= 1
+
+    def skip_line(self) -> None:
+        while self.peek().kind not in ("NEWLINE", "EOF") and not self.at("}"):
+            self.next()
+
+    def line_opens_block(self) -> bool:
+        """True when the current line ends in `{` (a block header, not a column)."""
+        i = self.pos
+        while self.tokens[i].kind not in ("NEWLINE", "EOF"):
+            i += 1
+        return i > self.pos and self.tokens[i - 1].value == "{" and self.tokens[i - 1].kind == "PUNCT"
+
+    def warn(self, message: str, line: int) -> None:
+        self.schema.warnings.append(f"line {line}: {message}")
+
+    # --- settings ------------------------------------------------------------
+
+    def settings(self) -> tuple[dict[str, str | None], Ref | None]:
+        """Parse `[key, key: value, ref: > t.c, ...]`. Returns (settings, inline ref spec)."""
+        result: dict[str, str | None] = {}
+        inline_ref: Ref | None = None
+        self.expect("[")
+        while True:
+            self.skip_newlines()
+            if self.at("]"):
+                self.next()
+                return result, inline_ref
+            line = self.peek().line
+            key_parts = []
+            while self.peek().kind == "IDENT":
+                key_parts.append(self.next().value.lower())
+            if not key_parts:
+                tok = self.peek()
+                raise DBMLSyntaxError(f"unexpected '{tok.value or tok.kind}' in settings", tok.line)
+            key = " ".join(key_parts)
+            value: str | None = None
+            if self.at(":"):
+                self.next()
+                self.skip_newlines()
+                if key == "ref":
+                    op = self.next().value
+                    table, columns = self.ref_endpoint()
+                    inline_ref = Ref("", [], op, table, columns, inline=True, line=line)
+                    value = f"{op} {table}.{','.join(columns)}"
+                else:
+                    parts = []
+                    while not (self.at(",") or self.at("]")) and self.peek().kind != "EOF":
+                        tok = self.next()
+                        if tok.kind != "NEWLINE":
+                            parts.append(tok.value)
+                    value = "".join(parts) if len(parts) <= 1 else " ".join(parts)
+            result[key] = value
+            self.skip_newlines()
+            if self.at(","):
+                self.next()
+
+    # --- refs ----------------------------------------------------------------
+
+    def ref_endpoint(self) -> tuple[str, list[str]]:
+        """Parse `table.col`, `schema.table.col` or `table.(a, b)`."""
+        parts = [self.name()]
+        columns: list[str] = []
+        while self.at("."):
+            self.next()
+            if self.at("("):
+                self.next()
+                while not self.at(")"):
+                    columns.append(self.name())
+                    if self.at(","):
+                        self.next()
+                self.expect(")")
+                break
+            parts.append(self.name())
+        if not columns:
+            if len(parts) < 2:
+                raise DBMLSyntaxError("ref endpoint must be table.column", self.peek().line)
+            columns = [parts.pop()]
+        return ".".join(parts), columns
+
+    def ref_body(self, name: str | None, line: int) -> Ref:
+        src_table, src_cols = self.ref_endpoint()
+        op_tok = self.next()
+        if op_tok.kind != "REL":
+            raise DBMLSyntaxError(f"expected relation operator, got '{op_tok.value}'", op_tok.line)
+        dst_table, dst_cols = self.ref_endpoint()
+        settings: dict[str, str | None] = {}
+        if self.at("["):
+            settings, _ = self.settings()
+        return Ref(src_table, src_cols, op_tok.value, dst_table, dst_cols, name=name, settings=settings, line=line)
+
+    def parse_ref(self) -> None:
+        line = self.next().line
+        name = None
+        if self.peek().kind in ("IDENT", "STRING"):
+            name = self.name()
+        if self.at(":"):
+            self.next()
+            self.schema.refs.append(self.ref_body(name, line))
+            return
+        self.expect("{")
+        while True:
+            self.skip_newlines()
+            if self.at("}"):
+                self.next()
+                return
+            self.schema.refs.append(self.ref_body(name, self.peek().line))
+
+    # --- notes ---------------------------------------------------------------
+
+    def note_value(self) -> str:
+        """Parse the value after `Note`: either `: 'text'` or `{ 'text' }`."""
+        if self.at(":"):
+            self.next()
+            tok = self.next()
+            return tok.value
+        self.expect("{")
+        self.skip_newlines()
+        text = ""
+        if self.peek().kind == "STRING":
+            text = self.next().value
+        while not self.at("}"):
+            tok = self.next()
+            if tok.kind == "EOF":
+                raise DBMLSyntaxError("unterminated Note block", tok.line)
+        self.expect("}")
+        return text
+
+    # --- tables --------------------------------------------------------------
+
+    def parse_table(self) -> None:
+        line = self.next().line
+        schema_name, table_name = self.qualified_name()
+        table = Table(table_name, schema=schema_name, line=line)
+        if self.at_keyword("as"):
+            self.next()
+            table.alias = self.name()
+        if self.at("["):
+            table.settings, _ = self.settings()
+            table.note = table.settings.get("note")
+        self.skip_newlines()
+        self.expect("{")
+        while True:
+            self.skip_newlines()
+            if self.at("}"):
+                self.next()
+                break
+            if self.peek().kind == "EOF":
+                raise DBMLSyntaxError(f"unterminated Table '{table_name}'", line)
+            if self.at_keyword("note") and (self.peek(1).value in (":", "{")):
+                self.next()
+                table.note = self.note_value()
+                continue
+            if self.at_keyword("indexes") and self.peek(1).value == "{":
+                self.next()
+                self.parse_indexes(table)
+                continue
+            if self.peek().value == "~":
+                # TablePartial injection (~partial_name): nothing to model
+                self.skip_line()
+                continue
+            if self.at_keyword("table", "enum", "tablegroup", "project") and self.line_opens_block():
+                # Missing `}`: the next top-level block starts here
+                self.warn(f"Table '{table_name}' is not closed before this line", self.peek().line)
+                break
+            if self.at("(") or (self.at_keyword("pk") and self.peek(1).value == "("):
+                self.parse_body_index(table)
+                continue
+            start = self.pos
+            try:
+                self.parse_column(table)
+            except DBMLSyntaxError as e:
+                # Keep going with the next line; the column is not modelled
+                self.warn(f"column skipped: {str(e).split(': ', 1)[-1]}", self.tokens[start].line)
+                if self.peek().kind == "EOF":
+                    raise
+                self.skip_line()
+        self.schema.tables[table_name] = table
+
+    def column_type(self, column: str) -> str:
+        """Parse `type`, `schema.type`, `type(args)` and `type[]`."""
+        tok = self.peek()
+        if tok.kind not in ("IDENT", "STRING"):
+            raise DBMLSyntaxError(f"expected a type for column '{column}', got '{tok.value or tok.kind}'", tok.line)
+        parts = [self.next().value]
+        while self.at(".") and self.peek(1).kind in ("IDENT", "STRING"):
+            self.next()
+            parts.append("." + self.next().value)
+        if self.at("("):
+            self.next()
+            args = []
+            while not self.at(")"):
+                arg = self.next()
+                if arg.kind in ("EOF", "NEWLINE"):
+                    raise DBMLSyntaxError(f"unterminated type arguments for column '{column}'", tok.line)
+                args.append(arg.value)
+            self.next()
+            parts.append("(" + "".join(args) + ")")
+        if self.at("[") and self.peek(1).value == "]":
+            # Array type suffix, e.g. `text[]`
+            self.pos += 2
+            parts.append("[]")
+        return "".join(parts)
+
+    def parse_column(self, table: Table) -> None:
+        tok = self.peek()
+        name = self.name()
+        column_type = self.column_type(name)
+        column = Column(name, column_type, line=tok.line)
+        if not (self.at("[") or self.at("}") or self.peek().kind in ("NEWLINE", "EOF")):
+            # e.g. bare `pk` / `not null` without brackets: keep name and type only
+            bad = self.peek()
+            self.warn(f"unexpected '{bad.value}' after column '{name}' type; rest of the line ignored", bad.line)
+            self.skip_line()
+            table.columns[name] = column
+            return
+        if self.at("["):
+            column.settings, inline_ref = self.settings()
+            if inline_ref is not None:
+                inline_ref.source_table = table.full_name
+                inline_ref.source_columns = [name]
+                column.ref = inline_ref
+                self.schema.refs.append(inline_ref)
+        table.columns[name] = column
+
+    def column_list(self) -> list[str]:
+        """Parse `(a, b)`, `((a, b))` or nested forms into a flat list of names."""
+        line = self.expect("(").line
+        columns: list[str] = []
+        depth = 1
+        while depth:
+            tok = self.next()
+            if tok.kind == "EOF":
+                raise DBMLSyntaxError("unterminated column list", line)
+            if tok.kind == "PUNCT" and tok.value in "()":
+                depth += 1 if tok.value == "(" else -1
+            elif tok.kind in ("IDENT", "STRING"):
+                columns.append(tok.value)
+            elif tok.kind == "EXPR":
+                columns.append(f"`{tok.value}`")
+        return columns
+
+    def parse_body_index(self, table: Table) -> None:
+        """Composite key declared in the table body: `pk ((a, b))` or `(a, b) [pk]`."""
+        line = self.peek().line
+        settings: dict[str, str | None] = {}
+        if self.at_keyword("pk"):
+            self.next()
+            settings["pk"] = None
+        columns = self.column_list()
+        if self.at("["):
+            more, _ = self.settings()
+            settings.update(more)
+        table.indexes.append(Index(columns, settings, line))
+
+    def parse_indexes(self, table: Table) -> None:
+        self.expect("{")
+        while True:
+            self.skip_newlines()
+            if self.at("}"):
+                self.next()
+                return
+            if self.at(","):
+                self.next()
+                continue
+            line = self.peek().line
+            columns: list[str] = []
+            if self.at("("):
+                self.next()
+                while not self.at(")"):
+                    tok = self.next()
+                    if tok.kind == "EOF":
+                        raise DBMLSyntaxError("unterminated index column list", line)
+                    if tok.kind in ("IDENT", "STRING"):
+                        columns.append(tok.value)
+                    elif tok.kind == "EXPR":
+                        columns.append(f"`{tok.value}`")
+                self.next()
+            else:
+                tok = self.next()
+                columns.append(f"`{tok.value}`" if tok.kind == "EXPR" else tok.value)
+            settings: dict[str, str | None] = {}
+            if self.at("["):
+                settings, _ = self.settings()
+            table.indexes.append(Index(columns, settings, line))
+
+    # --- enums, groups, project ---------------------------------------------
+
+    def parse_enum(self) -> None:
+        line = self.next().line
+        schema_name, enum_name = self.qualified_name()
+        enum = Enum(enum_name, schema=schema_name, line=line)
+        self.skip_newlines()
+        self.expect("{")
+        while True:
+            self.skip_newlines()
+            if self.at("}"):
+                self.next()
+                break
+            tok = self.peek()
+            value = EnumValue(self.name(), line=tok.line)
+            if self.at("["):
+                value.settings, _ = self.settings()
+            enum.values.append(value)
+        self.schema.enums[enum_name] = enum
+
+    def parse_table_group(self) -> None:
+        line = self.next().line
+        group = TableGroup(self.name(), line=line)
+        self.skip_newlines()
+        self.expect("{")
+        while True:
+            self.skip_newlines()
+            if self.at("}"):
+                self.next()
+                break
+            if self.at_keyword("note") and self.peek(1).value in (":", "{"):
+                self.next()
+                self.note_value()
+                continue
+            schema_name, table_name = self.qualified_name()
+            group.tables.append(f"{schema_name}.{table_name}" if schema_name else table_name)
+        self.schema.groups[group.name] = group
+
+    def parse_project(self) -> None:
+        self.next()
+        if self.peek().kind in ("IDENT", "STRING"):
+            self.schema.project = self.name()
+        self.skip_newlines()
+        self.expect("{")
+        while True:
+            self.skip_newlines()
+            if self.at("}"):
+                self.next()
+                return
+            if self.at_keyword("note") and self.peek(1).value in (":", "{"):
+                line = self.next().line
+                self.schema.notes.append(Note(self.schema.project, self.note_value(), line))
+                continue
+            if self.at("{"):
+                self.skip_block()
+                continue
+            if self.peek().kind == "EOF":
+                raise DBMLSyntaxError("unterminated Project block", self.peek().line)
+            self.next()
+
+    def parse_sticky_note(self) -> None:
+        line = self.next().line
+        name = self.name() if self.peek().kind in ("IDENT", "STRING") else None
+        self.skip_newlines()
+        self.schema.notes.append(Note(name, self.note_value(), line))
+
+    # --- entry point ---------------------------------------------------------
+
+    def parse(self) -> Schema:
+        handlers = {
+            "table": self.parse_table,
+            "enum": self.parse_enum,
+            "ref": self.parse_ref,
+            "tablegroup": self.parse_table_group,
+            "project": self.parse_project,
+            "note": self.parse_sticky_note,
+        }
+        while True:
+            self.skip_newlines()
+            tok = self.peek()
+            if tok.kind == "EOF":
+                return self.schema
+            if tok.kind != "IDENT":
+                # Stray text (e.g. the leftover `}` of a removed table): skip the line
+                self.warn(f"unexpected '{tok.value}' at top level; line ignored", tok.line)
+                self.next()
+                while self.peek().kind not in ("NEWLINE", "EOF"):
+                    self.next()
+                continue
+            handler = handlers.get(tok.value.lower())
+            if handler is not None:
+                handler()
+                continue
+            # Unknown top-level element (TablePartial, Records, ...): skip it
+            self.next()
+            while not self.at("{") and self.peek().kind not in ("NEWLINE", "EOF"):
+                self.next()
+            if self.at("{"):
+                self.skip_block()
+
+
+def parse_dbml(text: str) -> Schema:
+    """Parse DBML source text into a Schema model."""
+    return _Parser(tokenize(text)).parse()
+
+
+def parse_dbml_file(path: str | Path) -> Schema:
+    """Read and parse a DBML file."""
+    return parse_dbml(Path(path).read_text(encoding="utf-8"))
+
+
+def main() -> int:
+    if len(sys.argv) < 2:
+        print("Usage: python3 dbml_parser.py <file.dbml> [<file.dbml> ...]")
+        return 1
+
+    status = 0
+    for arg in sys.argv[1:]:
+        try:
+            schema = parse_dbml_file(arg)
+        except DBMLSyntaxError as e:
+            print(f"[ERROR] {arg}: {e}")
+            status = 1
+            continue
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"[ERROR] {arg}: cannot read: {getattr(e, 'strerror', None) or e}")
+            status = 1
+            continue
+        columns = sum(len(t.columns) for t in schema.tables.values())
+        indexes = sum(len(t.indexes) for t in schema.tables.values())
+        print(
+            f"{arg}: {len(schema.tables)} tables, {columns} columns, {indexes} indexes, "
+            f"{len(schema.enums)} enums, {len(schema.refs)} refs, {len(schema.groups)} groups"
+        )
+        for warning in schema.warnings:
+            print(f"  [WARN] {warning}")
+    return status
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
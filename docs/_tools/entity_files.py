@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Codec between an ontology monolith (entities under a root `entities:` key)
+and one YAML file per entity, shared by the scripts that split and sync
+them (TA/_archive/00-ontology/entities/*.py) so they write the same bytes.
+
+- the file of entity `LeaveType` is `leave-type.yaml`
+- an entity file is its metadata header (`entity:`, `version:`, optional
+  `layer:`, then a blank line) followed by the body
+- in the monolith the body sits under `  <Entity>:` indented by exactly
+  four more spaces; blank lines and comments inside it are kept, comments
+  between entities (section banners) stay in the monolith
+
+The scripts keep one state file (STATE_NAME) in the entity directory: per
+monolith, the file written for each entity and the body hash recorded when
+the file and the monolith last matched.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+from fsutil import atomic_write
+
+STATE_NAME = ".ontology-entities.json"
+
+INDENT = "    "
+_ENTITIES_RE = re.compile(r"^entities:\s*(#.*)?$")
+_ENTITY_KEY_RE = re.compile(r"^  ([A-Za-z_]\w*):\s*(#.*)?$")
+_ROOT_KEY_RE = re.compile(r"^[^\s#]")
+
+
+class CodecError(Exception):
+    """Content that cannot be carried between the two forms without loss."""
+
+
+def camel_to_kebab(name: str) -> str:
+    """Convert CamelCase names to kebab-case file names."""
+    return re.sub(r"(?<!^)(?=[A-Z])", "-", name).lower()
+
+
+def file_name(entity: str) -> str:
+    return f"{camel_to_kebab(entity)}.yaml"
+
+
+def body_hash(body: list[str]) -> str:
+    return hashlib.sha256("\n".join(body).encode("utf-8")).hexdigest()
+
+
+def encode_block(lines: list[str], first_line: int = 1) -> list[str]:
+    """Monolith body lines -> entity file body lines (dedent by four spaces).
+
+    Whitespace-only lines become empty. Raises CodecError for a line the
+    inverse could not restore: a non-blank line indented by less than four
+    spaces.
+    """
+    body = []
+    for offset, line in enumerate(lines):
+        if line.strip() == "":
+            body.append("")
+        elif line.startswith(INDENT):
+            body.append(line[len(INDENT):])
+        else:
+            raise CodecError(f"line {first_line + offset}: not indented under the entity: {line!r}")
+    return body
+
+
+def decode_block(body: list[str]) -> list[str]:
+    """Entity file body lines -> monolith body lines."""
+    return [INDENT + line if line else "" for line in body]
+
+
+def entity_header(name: str, version: str, layer: str | None = None) -> list[str]:
+    """Header lines of a new entity file, blank separator included."""
+    return [f"entity: {name}", f'version: "{version}"'] + ([f"layer: {layer}"] if layer else []) + [""]
+
+
+def parse_entity_file(text: str) -> tuple[list[str], list[str]]:
+    """(header lines, body lines). The header is the leading `entity:` block up to
+    and including its blank separator line; trailing blank lines are not body."""
+    lines = text.split("\n")
+    header = []
+    if lines and lines[0].startswith("entity:"):
+        end = lines.index("") + 1 if "" in lines else len(lines)
+        header, lines = lines[:end], lines[end:]
+    while lines and lines[-1] == "":
+        lines.pop()
+    return header, lines
+
+
+def header_entity(header: list[str]) -> str | None:
+    return header[0].split(":", 1)[1].strip() if header else None
+
+
+def render_entity_file(header: list[str], body: list[str]) -> str:
+    return "\n".join(header + body) + "\n"
+
+
+@dataclass
+class Block:
+    name: str
+    key: int    # index of the `  Name:` line
+    start: int  # first body line
+    end: int    # one past the last body line (trailing blank/comment lines excluded)
+
+
+class Monolith:
+    """The monolith's lines with the span of every entity body under `entities:`."""
+
+    def __init__(self, text: str):
+        self.lines = text.split("\n")
+        self.blocks: dict[str, Block] = {}
+        self.section = next((i for i, line in enumerate(self.lines) if _ENTITIES_RE.match(line)), None)
+        if self.section is None:
+            raise CodecError("no root `entities:` key in the monolith")
+        self._parse()
+
+    def _parse(self) -> None:
+        lines = self.lines
+        limit = next((i for i in range(self.section + 1, len(lines)) if _ROOT_KEY_RE.match(lines[i])), len(lines))
+        keys = [(i, m.group(1)) for i in range(self.section + 1, limit) if (m := _ENTITY_KEY_RE.match(lines[i]))]
+        for n, (key, name) in enumerate(keys):
+            end = keys[n + 1][0] if n + 1 < len(keys) else limit
+            while end > key + 1 and (lines[end - 1].strip() == "" or
+                                     (lines[end - 1].lstrip().startswith("#") and not lines[end - 1].startswith(INDENT))):
+                end -= 1
+            if name in self.blocks:
+                raise CodecError(f"line {key + 1}: entity {name} is defined twice")
+            self.blocks[name] = Block(name, key, key + 1, end)
+
+    def body(self, name: str) -> list[str]:
+        block = self.blocks[name]
+        return encode_block(self.lines[block.start:block.end], block.start + 1)
+
+    def text_with(self, bodies: dict[str, list[str]], order: list[str]) -> str:
+        """Monolith text with the given entity bodies replaced or (in `order`) added."""
+        replace = {}  # first body line -> (end, new lines)
+        inserts = {}  # line index -> new entity blocks to insert before it
+        for name, body in bodies.items():
+            if name in self.blocks:
+                block = self.blocks[name]
+                replace[block.start] = (block.end, decode_block(body))
+        for pos, name in enumerate(order):
+            if name in self.blocks or name not in bodies:
+                continue
+            previous = [self.blocks[n].end for n in order[:pos] if n in self.blocks]
+            at = previous[-1] if previous else self.section + 1
+            inserts.setdefault(at, []).extend(["", f"  {name}:"] + decode_block(bodies[name]))
+
+        out, i = [], 0
+        while i < len(self.lines):
+            out.extend(inserts.pop(i, []))
+            end, new = replace.pop(i, (i, None))
+            if new is not None:
+                out.extend(new)
+            if end > i:
+                i = end
+            else:
+                out.append(self.lines[i])
+                i += 1
+        for extra in inserts.values():
+            out.extend(extra)
+        return "\n".join(out)
+
+
+def load_state(directory: Path) -> dict:
+    """{monolith file name: {entity: {"file": file name, "hash": body hash or None}}}"""
+    try:
+        state = json.loads((directory / STATE_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return state if isinstance(state, dict) else {}
+
+
+def save_state(directory: Path, state: dict, recorded: dict) -> None:
+    """Write `state` unless it equals what was `recorded` on disk."""
+    if state != recorded:
+        atomic_write(directory / STATE_NAME, json.dumps(state, indent=2, sort_keys=True) + "\n")
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Small filesystem helpers shared by the documentation scripts.
+
+`atomic_write` writes through a temp file in the target directory and
+`os.replace`s it into place, so readers (and concurrent writers from a
+process pool) only ever see the old or the new complete file.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+
+
+def atomic_write(path: str | Path, data: bytes | str, encoding: str = "utf-8") -> None:
+    """Atomically replace `path` with `data` (str is encoded with `encoding`)."""
+    path = Path(path)
+    if isinstance(data, str):
+        data = data.encode(encoding)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        if path.exists():
+            os.chmod(tmp, path.stat().st_mode & 0o7777)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
@@ -0,0 +1,709 @@
+#!/usr/bin/env python3
+"""
+Corpus-wide ontology index: entities, attributes and relationships with their
+source locations, stored in one SQLite file.
+
+A single walk over docs/ indexes every ontology-shaped source:
+
+- YAML: LinkML schemas (`classes:` + `slots:`), monolithic ontologies
+  (`entities:` mapping) and single-entity files (`entity:` + `attributes:`)
+- `*.onto.md`: the YAML front matter of entity documents
+- DBML: tables as entities, columns as attributes, refs as relationships
+
+YAML that does not parse falls back to an indentation outline of its
+`entities:` section, so broken monoliths are still indexed; the parse error
+is kept on the file row. A refresh re-parses only files whose mtime or size
+changed, so after the first build it costs one stat per file.
+
+Usage:
+    python3 onto_index.py                       # build/refresh, print summary
+    python3 onto_index.py --rebuild             # drop and rebuild from scratch
+    python3 onto_index.py --entity LeaveType    # where is LeaveType defined
+    python3 onto_index.py --file docs/01-modules/TA/_archive/00-ontology/time-absence-ontology.yaml
+
+    from onto_index import open_index
+    with open_index() as index:
+        for entity in index.entities(under="01-modules/TA"):
+            attrs = index.attributes(entity)
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+from yaml import MappingNode, ScalarNode, SequenceNode
+
+from dbml_parser import DBMLSyntaxError, parse_dbml
+from yaml_loader import YAMLError, compose_all
+
+INDEX_VERSION = "2"
+INDEX_NAME = ".onto-index.sqlite"
+DOCS_DIR = Path(__file__).resolve().parents[1]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    kind TEXT NOT NULL,
+    module TEXT,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS entities (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    format TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    end_line INTEGER
+);
+CREATE TABLE IF NOT EXISTS attributes (
+    entity_id INTEGER NOT NULL REFERENCES entities(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    type TEXT,
+    required INTEGER,
+    line INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS relationships (
+    entity_id INTEGER NOT NULL REFERENCES entities(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    target TEXT,
+    cardinality TEXT,
+    line INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entities_name ON entities(name);
+CREATE INDEX IF NOT EXISTS entities_file ON entities(file_id);
+CREATE INDEX IF NOT EXISTS attributes_entity ON attributes(entity_id);
+CREATE INDEX IF NOT EXISTS attributes_name ON attributes(name);
+CREATE INDEX IF NOT EXISTS relationships_entity ON relationships(entity_id);
+CREATE INDEX IF NOT EXISTS relationships_target ON relationships(target);
+"""
+
+
+# =============================================================================
+# MODEL
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class Entity:
+    id: int
+    name: str
+    path: str
+    format: str
+    line: int
+    end_line: int | None = None
+    module: str | None = None
+
+
+@dataclass(frozen=True)
+class Attribute:
+    name: str
+    type: str | None
+    required: bool | None
+    line: int
+
+
+@dataclass(frozen=True)
+class Relationship:
+    name: str
+    target: str | None
+    cardinality: str | None
+    line: int
+
+
+@dataclass
+class RefreshStats:
+    scanned: int = 0
+    parsed: int = 0
+    removed: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+
+
+# One parsed entity before it is written: (name, format, line, end_line, attrs, rels)
+_Record = tuple[str, str, int, "int | None", list[tuple], list[tuple]]
+
+
+# =============================================================================
+# EXTRACTION: YAML NODES
+# =============================================================================
+
+_LINKML_TYPES = {
+    "string", "integer", "float", "double", "decimal", "boolean", "date", "datetime",
+    "time", "uri", "uriorcurie", "curie", "ncname", "objectidentifier", "nodeidentifier",
+    "jsonpointer", "jsonpath", "sparqlpath", "date_or_datetime",
+}
+_TARGET_RE = re.compile(r"\s*([A-Za-z_][\w.]*)")
+
+
+def _pairs(node) -> list[tuple[str, ScalarNode, object]]:
+    if not isinstance(node, MappingNode):
+        return []
+    return [(k.value, k, v) for k, v in node.value if isinstance(k, ScalarNode)]
+
+
+def _get(node, key: str):
+    for name, _, value in _pairs(node):
+        if name == key:
+            return value
+    return None
+
+
+def _text(node) -> str | None:
+    return node.value if isinstance(node, ScalarNode) else None
+
+
+def _bool(node) -> bool | None:
+    value = _text(node)
+    if value is None:
+        return None
+    return value.strip().lower() in ("true", "yes", "on", "1")
+
+
+def _line(node) -> int:
+    return node.start_mark.line + 1
+
+
+def _end_line(node, lines: list[str]) -> int:
+    """Last content line of a node, ignoring trailing blanks and outdented comments."""
+    mark = node.end_mark
+    stop = mark.line + 1 if mark.line < len(lines) and lines[mark.line][: mark.column].strip() else mark.line
+    key_indent = node.start_mark.column
+    while stop > node.start_mark.line + 1:
+        text = lines[stop - 1]
+        stripped = text.strip()
+        if stripped and not (stripped.startswith("#") and len(text) - len(text.lstrip()) <= key_indent):
+            break
+        stop -= 1
+    return stop
+
+
+def _members(node):
+    """Yield (name, spec, detail, line) for mapping- or list-shaped member blocks.
+
+    `spec` is an inline scalar (`id: string (UUID)`), `detail` a mapping with
+    keys such as type/required/target/cardinality (`id: {type: UUID}` or
+    `- name: id` list items).
+    """
+    if isinstance(node, MappingNode):
+        for name, key, value in _pairs(node):
+            yield name, _text(value), value if isinstance(value, MappingNode) else None, _line(key)
+    elif isinstance(node, SequenceNode):
+        for item in node.value:
+            if isinstance(item, MappingNode):
+                name = _text(_get(item, "name"))
+                # `- name: string` alone is an attribute called "name", not a member's name key
+                if name is not None and len(item.value) > 1:
+                    yield name, None, item, _line(item)
+                elif len(item.value) == 1 and isinstance(item.value[0][0], ScalarNode):
+                    key, value = item.value[0]
+                    yield key.value, _text(value), value if isinstance(value, MappingNode) else None, _line(key)
+            elif isinstance(item, ScalarNode) and ":" in item.value:
+                name, spec = item.value.split(":", 1)
+                yield name.strip(), spec.strip(), None, _line(item)
+
+
+def _spec_type(spec: str) -> str:
+    return spec.split("(")[0].strip()
+
+
+def _spec_target(spec: str) -> str | None:
+    match = _TARGET_RE.match(spec)
+    return match.group(1) if match else None
+
+
+def _entity_members(body) -> tuple[list[tuple], list[tuple]]:
+    attrs = []
+    for name, spec, detail, line in _members(_get(body, "attributes")):
+        if spec is not None:
+            attrs.append((name, _spec_type(spec), False if "nullable" in spec.lower() else None, line))
+        else:
+            attrs.append((name, _text(_get(detail, "type")), _bool(_get(detail, "required")), line))
+
+    rels = []
+    for name, spec, detail, line in _members(_get(body, "relationships")):
+        if spec is not None:
+            rels.append((name, _spec_target(spec), "many" if "[]" in spec else None, line))
+        else:
+            target = _text(_get(detail, "target")) or _text(_get(detail, "entity"))
+            rels.append((name, target, _text(_get(detail, "cardinality")), line))
+    return attrs, rels
+
+
+def _linkml_records(doc, lines: list[str]) -> list[_Record]:
+    slots = {name: (key, value) for name, key, value in _pairs(_get(doc, "slots"))}
+    enums = {name for name, _, _ in _pairs(_get(doc, "enums"))}
+    default_range = _text(_get(doc, "default_range"))
+
+    def slot_member(name: str, key_line: int, slot, attrs: list, rels: list) -> None:
+        rng = _text(_get(slot, "range")) or default_range
+        attrs.append((name, rng, _bool(_get(slot, "required")), key_line))
+        reference = _text(_get(_get(slot, "annotations"), "reference"))
+        target = reference.split(".", 1)[0] if reference else None
+        if target is None and rng and rng not in _LINKML_TYPES and rng not in enums and rng[0].isupper():
+            target = rng
+        if target:
+            cardinality = "many" if _bool(_get(slot, "multivalued")) else "one"
+            rels.append((name, target, cardinality, key_line))
+
+    records = []
+    for cname, ckey, cbody in _pairs(_get(doc, "classes")):
+        attrs: list[tuple] = []
+        rels: list[tuple] = []
+        slot_list = _get(cbody, "slots")
+        for item in slot_list.value if isinstance(slot_list, SequenceNode) else []:
+            sname = _text(item)
+            if sname is None:
+                continue
+            key, slot = slots.get(sname, (item, None))
+            slot_member(sname, _line(key), slot, attrs, rels)
+        for aname, akey, attr in _pairs(_get(cbody, "attributes")):
+            slot_member(aname, _line(akey), attr, attrs, rels)
+        records.append((cname, "linkml", _line(ckey), _end_line(cbody, lines), attrs, rels))
+    return records
+
+
+def _yaml_records(text: str, fmt: str = "yaml") -> tuple[str | None, list[_Record]]:
+    """Entities of a YAML text. Raises YAMLError when it does not parse."""
+    lines = text.split("\n")
+    module = None
+    records: list[_Record] = []
+    for doc in compose_all(text):
+        if not isinstance(doc, MappingNode):
+            continue
+        module = module or _text(_get(doc, "module"))
+        if isinstance(_get(doc, "classes"), MappingNode):
+            records += _linkml_records(doc, lines)
+        for name, key, body in _pairs(_get(doc, "entities")):
+            if isinstance(body, MappingNode):
+                records.append((name, "entities", _line(key), _end_line(body, lines), *_entity_members(body)))
+        entity = _get(doc, "entity")
+        if _text(entity):
+            records.append((entity.value, fmt if fmt != "yaml" else "entity", _line(entity), _end_line(doc, lines), *_entity_members(doc)))
+    return module, records
+
+
+# =============================================================================
+# EXTRACTION: OUTLINE FALLBACK, FRONT MATTER, DBML
+# =============================================================================
+
+_OUTLINE_KEY_RE = re.compile(r"^(\s*)(-\s+)?([A-Za-z_][\w.-]*)\s*:(.*)$")
+_MODULE_RE = re.compile(r"^module:\s*['\"]?([\w &-]+?)['\"]?\s*$", re.MULTILINE)
+
+
+def _strip_comment(value: str) -> str:
+    return value.split(" #", 1)[0].strip().strip("'\"")
+
+
+def iter_outline_entities(lines) -> Iterator[_Record]:
+    """Stream the entities of an `entities:` mapping from YAML-like lines.
+
+    Works on any iterable of lines (an open file included) without parsing
+    the YAML, so it also handles files PyYAML rejects. Each entity is yielded
+    as soon as its block ends; only the current block is held in memory.
+    """
+    current = None  # [name, line, end_line, attrs, rels]
+    base = child = member = None
+    group = None
+    in_section = False
+    # `- name: x` item not yet known to carry other keys: (entry, group, value)
+    pending = None
+
+    def single(group, key, value, number):
+        if group == "attributes":
+            return [key, _spec_type(value) if value else None, False if "nullable" in value.lower() else None, number]
+        return [key, _spec_target(value) if value else None, "many" if "[]" in value else None, number]
+
+    def settle():
+        # A `- name: x` item with no other keys is an attribute called "name"
+        nonlocal pending
+        if pending is not None:
+            entry, pending_group, value = pending
+            entry[:] = single(pending_group, "name", value, entry[3])
+            pending = None
+
+    def record():
+        settle()
+        name, line, end_line, attrs, rels = current
+        return name, "outline", line, end_line, [tuple(a) for a in attrs], [tuple(r) for r in rels]
+
+    for number, raw in enumerate(lines, 1):
+        raw = raw.rstrip("\r\n")
+        stripped = raw.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        indent = len(raw) - len(raw.lstrip(" "))
+        if indent == 0:
+            if current is not None:
+                yield record()
+                current = None
+            in_section = _strip_comment(stripped) == "entities:"
+            base = None
+            continue
+        if not in_section:
+            continue
+        if base is None:
+            base = indent
+        match = _OUTLINE_KEY_RE.match(raw)
+
+        if indent == base:
+            if match and not match.group(2) and not _strip_comment(match.group(4)):
+                if current is not None:
+                    yield record()
+                current = [match.group(3), number, number, [], []]
+                child = member = group = None
+            continue
+        if current is None or indent < base:
+            continue
+        current[2] = number
+
+        if child is None:
+            child = indent
+        if indent == child and not stripped.startswith("-"):
+            settle()
+            group = match.group(3) if match and match.group(3) in ("attributes", "relationships") else None
+            member = None
+            continue
+        if group is None or match is None:
+            continue
+        if member is None:
+            member = indent
+        bucket = current[3] if group == "attributes" else current[4]
+        value = _strip_comment(match.group(4))
+
+        if indent == member:
+            settle()
+            if match.group(2) and match.group(3) == "name":
+                bucket.append([value, None, None, number])
+                pending = (bucket[-1], group, value)
+            else:
+                bucket.append(single(group, match.group(3), value, number))
+        elif indent > member and bucket:
+            pending = None
+            key = match.group(3)
+            if group == "attributes" and key == "type":
+                bucket[-1][1] = value
+            elif group == "attributes" and key == "required":
+                bucket[-1][2] = value.lower() == "true"
+            elif group == "relationships" and key in ("target", "entity"):
+                bucket[-1][1] = value
+            elif group == "relationships" and key == "cardinality":
+                bucket[-1][2] = value
+    if current is not None:
+        yield record()
+
+
+def _outline_records(text: str) -> tuple[str | None, list[_Record]]:
+    """Indentation outline of an `entities:` mapping, for YAML that does not parse."""
+    module_match = _MODULE_RE.search(text)
+    module = module_match.group(1).strip() if module_match else None
+    return module, list(iter_outline_entities(text.split("\n")))
+
+
+def _front_matter_records(text: str) -> tuple[str | None, list[_Record]]:
+    lines = text.split("\n")
+    if not lines or lines[0].strip() != "---":
+        return None, []
+    for end, line in enumerate(lines[1:], 1):
+        if line.strip() == "---":
+            break
+    else:
+        return None, []
+    # Keep a leading newline so node marks are file line numbers
+    return _yaml_records("\n" + "\n".join(lines[1:end]), fmt="onto.md")
+
+
+_DBML_CARDINALITY = {">": "many-to-one", "<": "one-to-many", "-": "one-to-one", "<>": "many-to-many"}
+
+
+def _dbml_records(text: str) -> tuple[str | None, list[_Record], str | None]:
+    schema = parse_dbml(text)
+    refs: dict[str, list] = {}
+    for ref in schema.refs:
+        table = schema.table(ref.source_table)
+        if table is not None:
+            refs.setdefault(table.full_name, []).append(ref)
+
+    records: list[_Record] = []
+    for table in schema.tables.values():
+        attrs = [(c.name, c.type, c.pk or c.not_null, c.line) for c in table.columns.values()]
+        table_refs = [c.ref for c in table.columns.values() if c.ref is not None] + refs.get(table.full_name, [])
+        rels = [
+            (",".join(r.source_columns), r.target_table, _DBML_CARDINALITY.get(r.op, r.op), r.line)
+            for r in table_refs
+        ]
+        records.append((table.full_name, "dbml", table.line, None, attrs, rels))
+    # Lines the parser skipped are reported like a parse error, the tables are still indexed
+    skipped = f"{len(schema.warnings)} line(s) skipped, {schema.warnings[0]}" if schema.warnings else None
+    return schema.project, records, skipped
+
+
+def _kind(name: str) -> str | None:
+    if name.endswith(".onto.md"):
+        return "onto.md"
+    if name.endswith((".yaml", ".yml")):
+        return "yaml"
+    if name.endswith(".dbml"):
+        return "dbml"
+    return None
+
+
+def extract(path: str | Path) -> tuple[str | None, list[_Record], str | None]:
+    """Parse one source file: (module, records, error)."""
+    path = Path(path)
+    kind = _kind(path.name)
+    text = path.read_text(encoding="utf-8", errors="replace")
+    try:
+        if kind == "dbml":
+            return _dbml_records(text)
+        if kind == "onto.md":
+            return (*_front_matter_records(text), None)
+        return (*_yaml_records(text), None)
+    except YAMLError as e:
+        error = " ".join(str(e).replace(' in "<unicode string>"', "").split())
+        if kind == "yaml":
+            return (*_outline_records(text), error)
+        return None, [], error
+    except DBMLSyntaxError as e:
+        return None, [], str(e)
+
+
+# =============================================================================
+# INDEX
+# =============================================================================
+
+
+class OntoIndex:
+    """SQLite-backed entity index over the files below `root`."""
+
+    def __init__(self, db: str | Path | None = None, root: str | Path | None = None):
+        self.root = Path(root or DOCS_DIR).resolve()
+        self.db_path = Path(db) if db else self.root / INDEX_NAME
+        self.conn = sqlite3.connect(self.db_path, timeout=30)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self._ensure_schema()
+
+    def __enter__(self) -> OntoIndex:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _ensure_schema(self) -> None:
+        with self.conn:
+            self.conn.executescript(_SCHEMA)
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            if row is None or row[0] != INDEX_VERSION:
+                self.conn.execute("DELETE FROM files")
+                self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (INDEX_VERSION,))
+
+    def key(self, path: str | Path) -> str:
+        """Index key of a path: relative to the root when inside it, else absolute."""
+        path = Path(path).resolve()
+        try:
+            return path.relative_to(self.root).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    # --- building -------------------------------------------------------------
+
+    def _walk(self):
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+            for name in sorted(filenames):
+                if _kind(name):
+                    yield Path(dirpath) / name
+
+    def refresh(self, paths=None) -> RefreshStats:
+        """Re-index new or changed files. Without `paths`, walk the whole root
+        and drop rows of files that no longer exist."""
+        started = time.perf_counter()
+        stats = RefreshStats()
+        known = {row[0]: row[1:] for row in self.conn.execute("SELECT path, id, mtime_ns, size FROM files")}
+        candidates = [Path(p) for p in paths] if paths is not None else list(self._walk())
+
+        seen = set()
+        with self.conn:
+            for path in candidates:
+                key = self.key(path)
+                seen.add(key)
+                try:
+                    st = path.stat()
+                except FileNotFoundError:
+                    continue
+                stats.scanned += 1
+                row = known.get(key)
+                if row is not None and row[1] == st.st_mtime_ns and row[2] == st.st_size:
+                    continue
+                module, records, error = extract(path)
+                self._store(key, _kind(path.name), module, st, records, error)
+                stats.parsed += 1
+                stats.errors += error is not None
+            if paths is None:
+                for key in set(known) - seen:
+                    self.conn.execute("DELETE FROM files WHERE path = ?", (key,))
+                    stats.removed += 1
+        stats.seconds = time.perf_counter() - started
+        return stats
+
+    def _store(self, key, kind, module, st, records, error) -> None:
+        conn = self.conn
+        conn.execute("DELETE FROM files WHERE path = ?", (key,))
+        file_id = conn.execute(
+            "INSERT INTO files (path, kind, module, mtime_ns, size, error) VALUES (?, ?, ?, ?, ?, ?)",
+            (key, kind, module, st.st_mtime_ns, st.st_size, error),
+        ).lastrowid
+        for name, fmt, line, end_line, attrs, rels in records:
+            entity_id = conn.execute(
+                "INSERT INTO entities (file_id, name, format, line, end_line) VALUES (?, ?, ?, ?, ?)",
+                (file_id, name, fmt, line, end_line),
+            ).lastrowid
+            conn.executemany(
+                "INSERT INTO attributes (entity_id, name, type, required, line) VALUES (?, ?, ?, ?, ?)",
+                [(entity_id, *attr) for attr in attrs],
+            )
+            conn.executemany(
+                "INSERT INTO relationships (entity_id, name, target, cardinality, line) VALUES (?, ?, ?, ?, ?)",
+                [(entity_id, *rel) for rel in rels],
+            )
+
+    # --- queries --------------------------------------------------------------
+
+    def entities(self, name=None, path=None, under=None, module=None, fmt=None) -> list[Entity]:
+        """Entities matching every given filter, in file then line order.
+
+        `path` selects one file, `under` a directory (both as paths or keys).
+        """
+        where, args = [], []
+        if name is not None:
+            where.append("e.name = ?")
+            args.append(name)
+        if path is not None:
+            where.append("f.path = ?")
+            args.append(self.key(path) if Path(path).is_absolute() or Path(path).exists() else str(path))
+        if under is not None:
+            prefix = self.key(under) if Path(under).is_absolute() or Path(under).exists() else str(under).rstrip("/")
+            where.append("f.path LIKE ? ESCAPE '\\'")
+            args.append(prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "/%")
+        if module is not None:
+            where.append("f.module = ?")
+            args.append(module)
+        if fmt is not None:
+            where.append("e.format = ?")
+            args.append(fmt)
+        sql = (
+            "SELECT e.id, e.name, f.path, e.format, e.line, e.end_line, f.module "
+            "FROM entities e JOIN files f ON f.id = e.file_id"
+        )
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY f.path, e.line"
+        return [Entity(*row) for row in self.conn.execute(sql, args)]
+
+    def entity(self, name: str, path=None) -> Entity | None:
+        found = self.entities(name=name, path=path)
+        return found[0] if found else None
+
+    def attributes(self, entity: Entity | int) -> list[Attribute]:
+        entity_id = entity.id if isinstance(entity, Entity) else entity
+        rows = self.conn.execute(
+            "SELECT name, type, required, line FROM attributes WHERE entity_id = ? ORDER BY line", (entity_id,)
+        )
+        return [Attribute(n, t, None if r is None else bool(r), ln) for n, t, r, ln in rows]
+
+    def relationships(self, entity: Entity | int) -> list[Relationship]:
+        entity_id = entity.id if isinstance(entity, Entity) else entity
+        rows = self.conn.execute(
+            "SELECT name, target, cardinality, line FROM relationships WHERE entity_id = ? ORDER BY line", (entity_id,)
+        )
+        return [Relationship(*row) for row in rows]
+
+    def errors(self) -> list[tuple[str, str]]:
+        """(path, message) of indexed files that did not parse cleanly."""
+        return list(self.conn.execute("SELECT path, error FROM files WHERE error IS NOT NULL ORDER BY path"))
+
+    def counts(self) -> dict[str, int]:
+        return {
+            table: self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("files", "entities", "attributes", "relationships")
+        }
+
+
+def open_index(db=None, root=None, refresh: bool = True) -> OntoIndex:
+    """Open the index (created on first use), refreshed unless refresh=False."""
+    index = OntoIndex(db, root)
+    if refresh:
+        index.refresh()
+    return index
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+
+def _print_entity(index: OntoIndex, entity: Entity) -> None:
+    module = f" [{entity.module}]" if entity.module else ""
+    print(f"{entity.name}{module}  {entity.path}:{entity.line}  ({entity.format})")
+    for attr in index.attributes(entity):
+        required = {True: " required", False: " optional", None: ""}[attr.required]
+        print(f"    {attr.name}: {attr.type or '?'}{required}  :{attr.line}")
+    for rel in index.relationships(entity):
+        print(f"    -> {rel.name}: {rel.target or '?'} ({rel.cardinality or '?'})  :{rel.line}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build and query the ontology index.")
+    parser.add_argument("--root", type=Path, default=DOCS_DIR, help="Directory to index (default: docs/)")
+    parser.add_argument("--db", type=Path, help=f"Index file (default: <root>/{INDEX_NAME})")
+    parser.add_argument("--rebuild", action="store_true", help="Drop the index and rebuild it")
+    parser.add_argument("--entity", action="append", default=[], help="Show where an entity is defined")
+    parser.add_argument("--file", action="append", default=[], type=Path, help="Show the entities of a file")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        Path(args.db or Path(args.root) / INDEX_NAME).unlink(missing_ok=True)
+
+    with OntoIndex(args.db, args.root) as index:
+        stats = index.refresh()
+        if args.entity or args.file:
+            for name in args.entity:
+                found = index.entities(name=name)
+                if not found:
+                    print(f"[WARN] {name}: not found")
+                for entity in found:
+                    _print_entity(index, entity)
+            for path in args.file:
+                for entity in index.entities(path=path.resolve()):
+                    _print_entity(index, entity)
+            return 0
+
+        counts = index.counts()
+        print(
+            f"Indexed {stats.scanned} files in {stats.seconds:.2f}s "
+            f"({stats.parsed} parsed, {stats.removed} removed)"
+        )
+        print(
+            f"  {counts['entities']} entities, {counts['attributes']} attributes, "
+            f"{counts['relationships']} relationships -> {index.db_path}"
+        )
+        for path, error in index.errors():
+            print(f"  [WARN] {path}: {error[:100]}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
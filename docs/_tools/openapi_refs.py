@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+OpenAPI `$ref` resolution and schema checks in one pass over a spec.
+
+`RefResolver.check(path)` walks everything reachable from the spec root,
+following local (`#/components/schemas/X`) and cross-file
+(`common.yaml#/components/schemas/X`, relative to the referring file)
+references:
+
+- every referenced file is loaded once (a file that fails to load fails
+  once) and every target (file + JSON pointer) is resolved once; a component shared by many operations is
+  walked and checked a single time
+- chains of references are followed with cycle detection; a chain that
+  never reaches a real node (`A -> B -> A`) is an error, while recursive
+  schemas (a tree node whose `children` refer back to it) are fine
+- every reachable schema gets structural checks (valid `type`, arrays with
+  `items`, `required` names declared in `properties`, non-empty `enum`)
+
+Resolvers keep their caches between specs, so checking a set of specs that
+share files loads and resolves the shared parts once.
+
+Usage:
+    python3 openapi_refs.py                     # every *.openapi.yaml under docs/
+    python3 openapi_refs.py spec.yaml [...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+from yaml_loader import YAMLError, safe_load
+
+DOCS_DIR = Path(__file__).resolve().parents[1]
+
+SCHEMA_TYPES = {"string", "number", "integer", "boolean", "array", "object", "null"}
+# Keywords whose value is a schema / a list or map of schemas
+_SUBSCHEMA = {"items", "not", "additionalProperties"}
+_SUBSCHEMA_LIST = {"allOf", "anyOf", "oneOf"}
+_SUBSCHEMA_MAP = {"properties", "patternProperties"}
+
+
+class RefError(Exception):
+    """A `$ref` that cannot be resolved to a node."""
+
+
+@dataclass
+class RefReport:
+    """Result of checking one spec."""
+
+    path: Path
+    errors: list[str] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+    refs: int = 0      # $ref occurrences followed
+    targets: int = 0   # distinct targets walked
+    schemas: int = 0   # distinct schemas checked
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def _name(path: Path) -> Path:
+    try:
+        return path.relative_to(DOCS_DIR)
+    except ValueError:
+        return path
+
+
+def _location(path: Path, pointer: str) -> str:
+    return f"{_name(path)}#{pointer}"
+
+
+class RefResolver:
+    """Loads documents and resolves `$ref`s, memoizing both across specs."""
+
+    def __init__(self, load: Callable[[Path], Any] | None = None):
+        self._load = load or (lambda p: safe_load(p.read_text(encoding="utf-8")))
+        self._docs: dict[Path, Any] = {}  # loaded document, or the RefError loading it raised
+        self._targets: dict[tuple[Path, str], tuple[Path, str, Any]] = {}
+
+    @property
+    def files(self) -> list[Path]:
+        """Every file this resolver has read or tried to read, in load order."""
+        return list(self._docs)
+
+    def document(self, path: Path) -> Any:
+        path = path.resolve()
+        if path not in self._docs:
+            try:
+                self._docs[path] = self._load(path)
+            except OSError as e:
+                self._docs[path] = RefError(f"cannot read {path.name}: {e.strerror}")
+            except YAMLError as e:
+                mark = getattr(e, "problem_mark", None)
+                where = f" line {mark.line + 1}" if mark else ""
+                self._docs[path] = RefError(
+                    f"YAML syntax error in {path.name}{where}: {getattr(e, 'problem', None) or e}")
+        doc = self._docs[path]
+        if isinstance(doc, RefError):
+            raise RefError(*doc.args)
+        return doc
+
+    def _node(self, path: Path, pointer: str) -> Any:
+        node = self.document(path)
+        for token in pointer.split("/")[1:] if pointer else []:
+            token = _unescape(token)
+            if isinstance(node, dict) and token in node:
+                node = node[token]
+            elif isinstance(node, list) and token.isdigit() and int(token) < len(node):
+                node = node[int(token)]
+            else:
+                raise RefError(f"no `{token}` in {_location(path, pointer)}")
+        return node
+
+    def resolve(self, ref: str, base: Path) -> tuple[Path, str, Any]:
+        """(file, pointer, node) that `ref`, written in `base`, finally points at.
+
+        Reference-only nodes along the way are followed; each target is
+        resolved once and remembered.
+        """
+        chain = []
+        while True:
+            if not isinstance(ref, str):
+                raise RefError(f"$ref is not a string: {ref!r}")
+            if "://" in ref:
+                raise RefError(f"remote reference not followed: {ref}")
+            file_part, _, pointer = ref.partition("#")
+            path = (base.parent / file_part).resolve() if file_part else base.resolve()
+            key = (path, pointer)
+            if key in self._targets:
+                return self._targets[key]
+            if key in chain:
+                cycle = " -> ".join(_location(p, q) for p, q in chain[chain.index(key):] + [key])
+                raise RefError(f"reference cycle: {cycle}")
+            chain.append(key)
+            node = self._node(path, pointer)
+            if isinstance(node, dict) and "$ref" in node:
+                ref, base = node["$ref"], path
+                continue
+            for link in chain:
+                self._targets[link] = (path, pointer, node)
+            return path, pointer, node
+
+    def check(self, path: Path) -> RefReport:
+        """Resolve every reachable `$ref` of the spec at `path` and check its schemas."""
+        path = path.resolve()
+        report = RefReport(path)
+        try:
+            root = self.document(path)
+        except RefError as e:
+            report.errors.append(str(e))
+            return report
+
+        seen = set()     # (file, pointer, is_schema) already walked
+        targets = set()  # distinct (file, pointer) reached through a $ref
+        stack = [(path, "", root, False)]
+        while stack:
+            file, pointer, node, is_schema = stack.pop()
+            if (file, pointer, is_schema) in seen:
+                continue
+            seen.add((file, pointer, is_schema))
+            if isinstance(node, dict) and "$ref" in node:
+                report.refs += 1
+                ref = node["$ref"]
+                if isinstance(ref, str) and "://" in ref:
+                    report.warnings.append(f"{_location(file, pointer)}: remote reference not followed: {ref}")
+                    continue
+                try:
+                    target_file, target_pointer, target = self.resolve(ref, file)
+                except RefError as e:
+                    report.errors.append(f"{_location(file, pointer)}: {e}")
+                    continue
+                targets.add((target_file, target_pointer))
+                stack.append((target_file, target_pointer, target, is_schema))
+                continue
+            if is_schema:
+                if isinstance(node, dict):
+                    report.schemas += 1
+                    partial = pointer.rsplit("/", 2)[-2] in _SUBSCHEMA_LIST
+                    report.errors.extend(f"{_location(file, pointer)}: {problem}"
+                                         for problem in check_schema(node, partial))
+                stack.extend((file, f"{pointer}/{key}", child, True) for key, child in _subschemas(node))
+            elif isinstance(node, dict):
+                in_schemas = pointer == "/components/schemas"
+                for key, child in node.items():
+                    token = str(key).replace("~", "~0").replace("/", "~1")
+                    stack.append((file, f"{pointer}/{token}", child, in_schemas or key == "schema"))
+            elif isinstance(node, list):
+                stack.extend((file, f"{pointer}/{i}", child, False) for i, child in enumerate(node))
+        report.targets = len(targets)
+        return report
+
+
+def _subschemas(schema: Any):
+    """(pointer token, subschema) pairs of a schema node."""
+    if not isinstance(schema, dict):
+        return
+    for key, value in schema.items():
+        if key in _SUBSCHEMA and isinstance(value, dict):
+            yield key, value
+        elif key in _SUBSCHEMA_LIST and isinstance(value, list):
+            yield from ((f"{key}/{i}", v) for i, v in enumerate(value))
+        elif key in _SUBSCHEMA_MAP and isinstance(value, dict):
+            yield from ((f"{key}/{str(k).replace('~', '~0').replace('/', '~1')}", v) for k, v in value.items())
+
+
+def check_schema(schema: dict, partial: bool = False) -> list[str]:
+    """Structural problems of one schema object (not of its subschemas).
+
+    `partial` marks an allOf/anyOf/oneOf branch, and schemas with such
+    branches are partial too: their `required` may name properties
+    declared on the other side.
+    """
+    problems = []
+    types = schema.get("type")
+    for t in types if isinstance(types, list) else [types] if types is not None else []:
+        if t not in SCHEMA_TYPES:
+            problems.append(f"unknown type {t!r}")
+    if types == "array" and "items" not in schema:
+        problems.append("array schema without `items`")
+    required = schema.get("required")
+    if required is not None:
+        if not isinstance(required, list):
+            problems.append("`required` is not a list")
+        elif isinstance(schema.get("properties"), dict) and not partial and not _SUBSCHEMA_LIST & schema.keys():
+            missing = [name for name in required if name not in schema["properties"]]
+            if missing:
+                problems.append(f"required but not in properties: {', '.join(map(str, missing))}")
+    enum = schema.get("enum")
+    if enum is not None and (not isinstance(enum, list) or not enum):
+        problems.append("`enum` is not a non-empty list")
+    return problems
+
+
+def find_specs(root: Path = DOCS_DIR) -> list[Path]:
+    return sorted(p for p in root.rglob("*.openapi.yaml") if "node_modules" not in p.parts)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Resolve every $ref of OpenAPI specs and check their schemas.")
+    parser.add_argument("specs", nargs="*", type=Path, help="Spec files (default: every *.openapi.yaml under docs/)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Only list specs with problems")
+    args = parser.parse_args()
+
+    specs = args.specs or find_specs()
+    resolver = RefResolver()
+    started = time.perf_counter()
+    failed = 0
+    refs = schemas = 0
+    for spec in specs:
+        report = resolver.check(spec)
+        refs += report.refs
+        schemas += report.schemas
+        failed += bool(report.errors)
+        if report.errors:
+            print(f"[ERROR] {_name(report.path)}: {len(report.errors)} problem(s)")
+            for error in report.errors:
+                print(f"    - {error}")
+        if report.warnings:
+            print(f"[WARN] {_name(report.path)}: {len(report.warnings)} warning(s)")
+            for warning in report.warnings:
+                print(f"    - {warning}")
+        if not report.errors and not args.quiet:
+            print(f"[OK] {_name(report.path)}: {report.refs} refs -> {report.targets} targets, "
+                  f"{report.schemas} schemas")
+    print("-" * 60)
+    print(f"{len(specs)} spec(s), {failed} with problems; {refs} refs followed, {schemas} schemas checked "
+          f"in {time.perf_counter() - started:.2f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Cross-artifact consistency check for a DBML schema, its OpenAPI specs and its
+event catalogue.
+
+Each artifact is read once into name indexes (dicts keyed by a normalized
+name: lower case, separators dropped, so `pay_group_status`, `PayGroupStatus`
+and `payGroupStatus` meet):
+
+- DBML: tables, columns (per table and corpus of the file) and enums, plus
+  which column is typed with which enum
+- OpenAPI: named enum schemas (`ApplicationLifecycleEnum`) and inline enums
+  on schema properties (`PayGroupDetail.status`)
+- events: aggregates and payload fields, from the one-event-per-document
+  layout (`event_type` + `payload`), an `events:` list or a mapping of
+  event name -> event
+
+The indexes are then joined with dict lookups, so a check is linear in the
+number of symbols:
+
+- an OpenAPI enum whose values differ from the DBML enum it maps to
+  (by name, `Enum` suffix ignored, or through the enum-typed column of the
+  table the schema describes) is an error
+- an event payload field that is no column of any table, or an event
+  aggregate with no table, is a warning
+
+Usage:
+    python3 xref_check.py                 # every directory under docs/ with a .dbml and events.yaml
+    python3 xref_check.py <dir> [...]     # .dbml + *.openapi.yaml + events.yaml in each dir
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+from dbml_parser import DBMLSyntaxError, parse_dbml
+from yaml_loader import YAMLError, safe_load, safe_load_all
+
+DOCS_DIR = Path(__file__).resolve().parents[1]
+EVENTS_NAME = "events.yaml"
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]")
+# DTO affixes around the entity a schema describes (PaginatedPayGroupList -> PayGroup)
+_SCHEMA_AFFIXES = re.compile(r"^(?:Create|Update|Patch|Paginated)|(?:Details?|Request|Response|Summary|List|Item|Dto)$")
+
+
+def norm(name: Any) -> str:
+    return _NON_ALNUM.sub("", str(name).lower())
+
+
+def enum_key(name: str) -> str:
+    key = norm(name)
+    return key[: -len("enum")] if key.endswith("enum") and key != "enum" else key
+
+
+def table_key(name: str) -> str:
+    """Tables are matched singular or plural (`events` ~ `Event`)."""
+    key = norm(name.rsplit(".", 1)[-1])
+    return key[:-1] if key.endswith("s") else key
+
+
+def schema_entity(name: str) -> str:
+    return _SCHEMA_AFFIXES.sub("", name) or name
+
+
+@dataclass
+class DbIndex:
+    tables: dict[str, str] = field(default_factory=dict)                     # table_key -> table
+    columns: dict[str, list[str]] = field(default_factory=dict)              # norm(column) -> ["table.column"]
+    enums: dict[str, tuple[str, set, int]] = field(default_factory=dict)     # enum_key -> (name, values, line)
+    column_enums: dict[tuple[str, str], str] = field(default_factory=dict)   # (table_key, norm(column)) -> enum_key
+    warnings: list[str] = field(default_factory=list)                        # lines the DBML parser skipped
+
+    @property
+    def symbols(self) -> int:
+        return len(self.tables) + sum(map(len, self.columns.values())) + len(self.enums)
+
+
+@dataclass
+class XrefReport:
+    """Findings for one set of artifacts."""
+
+    errors: list[str] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+    symbols: int = 0
+    joined: int = 0  # enums and event fields that found a counterpart
+
+
+def index_dbml(text: str) -> DbIndex:
+    schema = parse_dbml(text)
+    index = DbIndex(warnings=schema.warnings)
+    for enum in schema.enums.values():
+        index.enums[enum_key(enum.name)] = (enum.full_name, set(enum.value_names), enum.line)
+    columns = defaultdict(list)
+    for table in schema.tables.values():
+        tkey = table_key(table.name)
+        index.tables[tkey] = table.full_name
+        for column in table.columns.values():
+            columns[norm(column.name)].append(f"{table.name}.{column.name}")
+            ekey = enum_key(column.type.rsplit(".", 1)[-1])
+            if ekey in index.enums:
+                index.column_enums[(tkey, norm(column.name))] = ekey
+    index.columns = dict(columns)
+    return index
+
+
+def iter_openapi_enums(spec: Any) -> Iterator[tuple[str, str, str | None, list]]:
+    """(location, schema name, property or None, values) of every enum in the components."""
+    schemas = ((spec or {}).get("components") or {}).get("schemas") or {}
+    for name, schema in schemas.items():
+        if not isinstance(schema, dict):
+            continue
+        if isinstance(schema.get("enum"), list):
+            yield name, name, None, schema["enum"]
+        parts = [schema] + [s for s in schema.get("allOf") or [] if isinstance(s, dict)]
+        for part in parts:
+            for prop, spec_ in (part.get("properties") or {}).items():
+                if not isinstance(spec_, dict):
+                    continue
+                values = spec_.get("enum")
+                if values is None and isinstance(spec_.get("items"), dict):
+                    values = spec_["items"].get("enum")
+                if isinstance(values, list):
+                    yield f"{name}.{prop}", name, prop, values
+
+
+def _event_records(doc: Any) -> list:
+    if not isinstance(doc, dict):
+        return []
+    if isinstance(doc.get("events"), list):
+        return doc["events"]
+    if "event_type" in doc:
+        return [doc]
+    # One mapping of event name -> event
+    return [dict(v, name=v.get("name") or k) for k, v in doc.items() if isinstance(v, dict) and "payload" in v]
+
+
+def iter_events(docs: list) -> Iterator[tuple[str, str | None, list[str]]]:
+    """(event name, aggregate, payload field names) for every events.yaml layout."""
+    for doc in docs:
+        for event in _event_records(doc):
+            if not isinstance(event, dict):
+                continue
+            name = event.get("event_type") or event.get("name") or event.get("id") or "?"
+            aggregate = (event.get("aggregate_root") or event.get("aggregate")
+                         or (event.get("traceability") or {}).get("class"))
+            # "AttendanceRecord (TA domain)" -> AttendanceRecord
+            aggregate = m.group(0) if isinstance(aggregate, str) and (m := re.match(r"[\w.]+", aggregate)) else None
+            payload = event.get("payload")
+            if isinstance(payload, dict):
+                fields = [str(k) for k in payload]
+            elif isinstance(payload, list):
+                fields = [str(f.get("field") or f.get("name")) if isinstance(f, dict) else str(f)
+                          for f in payload if isinstance(f, (dict, str))]
+            else:
+                fields = []
+            yield str(name), aggregate, fields
+
+
+def check_enums(db: DbIndex, specs: list[tuple[str, Any]], report: XrefReport) -> None:
+    mismatches = defaultdict(list)  # (dbml enum, only in dbml, only in openapi) -> [locations]
+    for spec_name, spec in specs:
+        for location, schema, prop, values in iter_openapi_enums(spec):
+            report.symbols += 1
+            if prop is None:
+                keys = [enum_key(schema)]
+            else:
+                entity = schema_entity(schema)
+                column_enum = db.column_enums.get((table_key(entity), norm(prop)))
+                keys = [column_enum] if column_enum else [enum_key(entity + prop), enum_key(prop)]
+            match = next((db.enums[k] for k in keys if k in db.enums), None)
+            if match is None:
+                continue
+            report.joined += 1
+            name, dbml_values, line = match
+            # Case is a naming convention (DBML `pending`, OpenAPI `PENDING`), not a difference
+            api_values = {str(v).casefold(): str(v) for v in values if v is not None}
+            db_values = {v.casefold(): v for v in dbml_values}
+            if api_values.keys() != db_values.keys():
+                diff = (name, line, tuple(sorted(db_values[v] for v in db_values.keys() - api_values.keys())),
+                        tuple(sorted(api_values[v] for v in api_values.keys() - db_values.keys())))
+                mismatches[diff].append(f"{spec_name}:{location}")
+    for (name, line, only_db, only_api), locations in mismatches.items():
+        where = locations[0] if len(locations) == 1 else f"{locations[0]} (+{len(locations) - 1} more)"
+        parts = []
+        if only_db:
+            parts.append(f"missing {', '.join(only_db)}")
+        if only_api:
+            parts.append(f"not in DBML {', '.join(only_api)}")
+        report.errors.append(f"enum {where} differs from DBML {name} (line {line}): {'; '.join(parts)}")
+
+
+def check_events(db: DbIndex, docs: list, report: XrefReport) -> None:
+    unbacked = defaultdict(list)  # field -> [events]
+    for event, aggregate, fields in iter_events(docs):
+        report.symbols += 1 + len(fields)
+        if aggregate and table_key(aggregate) not in db.tables:
+            report.warnings.append(f"event {event}: aggregate {aggregate} has no table")
+        for name in fields:
+            key = norm(name)
+            # `<table>_id` / `<table>Id` is backed by that table's key (pay_element.id for element_id)
+            if key in db.columns or (key.endswith("id") and table_key(key[:-2]) in db.tables):
+                report.joined += 1
+            else:
+                unbacked[name].append(event)
+    for name, events in unbacked.items():
+        shown = ", ".join(events[:3]) + (f" (+{len(events) - 3} more)" if len(events) > 3 else "")
+        report.warnings.append(f"payload field {name} has no backing column (in {shown})")
+
+
+def check_artifacts(dbml_path: Path, openapi_paths: list[Path], events_path: Path | None) -> XrefReport:
+    """Index the DBML, OpenAPI specs and events of one context and join them."""
+    report = XrefReport()
+    try:
+        db = index_dbml(dbml_path.read_text(encoding="utf-8"))
+    except (OSError, DBMLSyntaxError) as e:
+        report.errors.append(f"cannot index {dbml_path.name}: {e}")
+        return report
+    report.symbols += db.symbols
+    report.warnings.extend(f"{dbml_path.name} {warning}" for warning in db.warnings)
+
+    specs = []
+    for path in openapi_paths:
+        try:
+            specs.append((path.name, safe_load(path.read_text(encoding="utf-8"))))
+        except (OSError, YAMLError) as e:
+            report.warnings.append(f"{path.name} skipped: {str(e).splitlines()[0]}")
+    check_enums(db, specs, report)
+
+    if events_path is not None and events_path.exists():
+        try:
+            docs = list(safe_load_all(events_path.read_text(encoding="utf-8")))
+        except YAMLError as e:
+            report.warnings.append(f"{events_path.name} skipped: {str(e).splitlines()[0]}")
+        else:
+            check_events(db, docs, report)
+    return report
+
+
+def artifacts_in(directory: Path) -> tuple[Path | None, list[Path], Path | None]:
+    dbml = sorted(directory.glob("*.dbml"))
+    events = directory / EVENTS_NAME
+    return (dbml[0] if dbml else None, sorted(directory.glob("*.openapi.yaml")),
+            events if events.exists() else None)
+
+
+def find_dirs(root: Path = DOCS_DIR) -> list[Path]:
+    return sorted({p.parent for p in root.rglob(EVENTS_NAME) if any(p.parent.glob("*.dbml"))})
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Cross-check DBML, OpenAPI and events of each artifact directory.")
+    parser.add_argument("dirs", nargs="*", type=Path,
+                        help="Directories holding a .dbml, *.openapi.yaml and events.yaml (default: all under docs/)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Only print errors")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    dirs = args.dirs or find_dirs()
+    failed = symbols = 0
+    for directory in dirs:
+        try:
+            label = directory.resolve().relative_to(DOCS_DIR)
+        except ValueError:
+            label = directory
+        dbml, specs, events = artifacts_in(directory)
+        if dbml is None:
+            print(f"[WARN] {label}: no .dbml file, skipped")
+            continue
+        report = check_artifacts(dbml, specs, events)
+        symbols += report.symbols
+        failed += bool(report.errors)
+        status = "[ERROR]" if report.errors else "[WARN]" if report.warnings else "[OK]"
+        if report.errors or not args.quiet:
+            print(f"{status} {label}: {report.symbols} symbols, {report.joined} joined, "
+                  f"{len(report.errors)} error(s), {len(report.warnings)} warning(s)")
+        for error in report.errors:
+            print(f"    - {error}")
+        if not args.quiet:
+            for warning in report.warnings:
+                print(f"    ~ {warning}")
+    print("-" * 60)
+    print(f"{len(dirs)} director(ies), {failed} with errors; {symbols} symbols in {time.perf_counter() - started:.2f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Shared YAML loading/dumping with the libyaml C classes when available.
+
+`yaml.safe_load` always uses the pure-Python SafeLoader. This module binds
+`CSafeLoader`/`CSafeDumper` when PyYAML was built with libyaml and falls back
+to the pure-Python `SafeLoader`/`SafeDumper` otherwise.
+
+Loading produces the same Python objects either way. libyaml's emitter folds
+long double-quoted scalars at different points than the Python emitter, so
+`safe_dump` always uses the pure-Python `SafeDumper` to keep written files
+byte-identical across machines; `CSafeDumper` is exported for callers that
+only need a fast, non-persisted dump (cache keys, hashing). See
+bench_yaml_loader.py for the numbers and the equivalence check.
+
+`iter_items` streams the entries of a large file (every document, or the
+items under a root key) one at a time from the parser's event stream, so
+memory stays bounded by the largest entry rather than the file.
+
+Usage:
+    from yaml_loader import safe_load, safe_load_all, safe_dump, compose_all, iter_items, YAMLError
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterator
+
+import yaml
+from yaml import (
+    AliasEvent,
+    MappingEndEvent,
+    MappingNode,
+    MappingStartEvent,
+    SafeDumper,
+    ScalarEvent,
+    ScalarNode,
+    SequenceEndEvent,
+    SequenceNode,
+    SequenceStartEvent,
+    YAMLError,
+)
+from yaml.composer import ComposerError
+
+try:
+    from yaml import CSafeDumper
+    from yaml import CSafeLoader as SafeLoader
+
+    LIBYAML = True
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as CSafeDumper
+    from yaml import SafeLoader
+
+    LIBYAML = False
+
+__all__ = [
+    "LIBYAML",
+    "CSafeDumper",
+    "SafeDumper",
+    "SafeLoader",
+    "YAMLError",
+    "compose_all",
+    "iter_items",
+    "safe_dump",
+    "safe_load",
+    "safe_load_all",
+]
+
+
+def safe_load(stream) -> Any:
+    """Parse a single YAML document (str, bytes or file object)."""
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def safe_load_all(stream) -> Iterator[Any]:
+    """Lazily parse every YAML document in the stream."""
+    return yaml.load_all(stream, Loader=SafeLoader)
+
+
+def compose_all(stream) -> Iterator[yaml.Node]:
+    """Lazily compose every document into representation nodes (with source marks)."""
+    return yaml.compose_all(stream, Loader=SafeLoader)
+
+
+def safe_dump(data: Any, stream=None, **kwargs) -> str | None:
+    """Serialize data with the pure-Python emitter; same keyword arguments as `yaml.dump`."""
+    return yaml.dump(data, stream, Dumper=SafeDumper, **kwargs)
+
+
+_NULL_TAG = "tag:yaml.org,2002:null"
+
+
+class _EventReader:
+    """Builds nodes for one sub-tree at a time from a loader's event stream
+    (the composer only offers whole documents)."""
+
+    def __init__(self, stream):
+        self.loader = SafeLoader(stream)
+        self.anchors: dict[str, yaml.Node] = {}
+
+    def next_is(self, *classes) -> bool:
+        return self.loader.check_event(*classes)
+
+    def take(self) -> yaml.Event:
+        return self.loader.get_event()
+
+    def node(self) -> yaml.Node:
+        """Compose the node starting at the next event."""
+        loader = self.loader
+        event = loader.get_event()
+        if isinstance(event, AliasEvent):
+            if event.anchor not in self.anchors:
+                raise ComposerError(None, None, f"found undefined alias {event.anchor!r}", event.start_mark)
+            return self.anchors[event.anchor]
+        if isinstance(event, ScalarEvent):
+            tag = event.tag
+            if tag is None or tag == "!":
+                tag = loader.resolve(ScalarNode, event.value, event.implicit)
+            node = ScalarNode(tag, event.value, event.start_mark, event.end_mark, style=event.style)
+        elif isinstance(event, SequenceStartEvent):
+            tag = event.tag
+            if tag is None or tag == "!":
+                tag = loader.resolve(SequenceNode, None, event.implicit)
+            node = SequenceNode(tag, [], event.start_mark, None, flow_style=event.flow_style)
+            while not loader.check_event(SequenceEndEvent):
+                node.value.append(self.node())
+            node.end_mark = loader.get_event().end_mark
+        else:
+            tag = event.tag
+            if tag is None or tag == "!":
+                tag = loader.resolve(MappingNode, None, event.implicit)
+            node = MappingNode(tag, [], event.start_mark, None, flow_style=event.flow_style)
+            while not loader.check_event(MappingEndEvent):
+                key = self.node()
+                node.value.append((key, self.node()))
+            node.end_mark = loader.get_event().end_mark
+        if event.anchor is not None:
+            self.anchors[event.anchor] = node
+        return node
+
+    def value(self, node: yaml.Node) -> Any:
+        return self.loader.construct_document(node)
+
+    def entry(self, key: yaml.Node | None, value: yaml.Node) -> Iterator[tuple[Any, int, Any]]:
+        """(key, line, value) for one entry; nothing for a null document or value."""
+        if key is None and value.tag == _NULL_TAG:
+            return
+        mark = (key or value).start_mark
+        yield (None if key is None else self.value(key)), mark.line + 1, self.value(value)
+
+    def items(self) -> Iterator[tuple[Any, int, Any]]:
+        """Entries of the collection starting at the next event, one at a time.
+        The collection's own anchor is ignored (an alias to it cannot resolve)."""
+        if isinstance(self.take(), SequenceStartEvent):
+            while not self.next_is(SequenceEndEvent):
+                yield from self.entry(None, self.node())
+        else:
+            while not self.next_is(MappingEndEvent):
+                key = self.node()
+                yield from self.entry(key, self.node())
+        self.take()
+
+
+def iter_items(stream, container: str | None = None) -> Iterator[tuple[Any, int, Any]]:
+    """Stream the entries of a (multi-document) YAML file one at a time.
+
+    `container` selects the entries, in every document:
+    - None: the document itself, or each item when the document is a sequence
+    - '.': each key/value pair (or item) of the document root
+    - a key: each item or key/value pair of the collection under that root key
+
+    Yields (key, line, value): the mapping key (None for documents and sequence
+    items), the 1-based line where the entry starts and its constructed data.
+    Empty documents are skipped. Only the current entry is held in memory
+    (plus any anchored nodes, which aliases may refer to later).
+    """
+    reader = _EventReader(stream)
+    try:
+        reader.take()  # StreamStart
+        while not reader.next_is(yaml.StreamEndEvent):
+            reader.take()  # DocumentStart
+            reader.anchors = {}
+            if container is None and reader.next_is(SequenceStartEvent):
+                yield from reader.items()
+            elif container == "." and reader.next_is(SequenceStartEvent, MappingStartEvent):
+                yield from reader.items()
+            elif container not in (None, ".") and reader.next_is(MappingStartEvent):
+                reader.take()
+                while not reader.next_is(MappingEndEvent):
+                    key = reader.node()
+                    if not (isinstance(key, ScalarNode) and key.value == container):
+                        reader.node()  # other root keys are composed and dropped
+                    elif reader.next_is(SequenceStartEvent, MappingStartEvent):
+                        yield from reader.items()
+                    else:
+                        yield from reader.entry(None, reader.node())
+                reader.take()
+            else:
+                node = reader.node()
+                if container in (None, "."):
+                    yield from reader.entry(None, node)
+            reader.take()  # DocumentEnd
+    finally:
+        reader.loader.dispose()
@@ -0,0 +1,528 @@
+#!/usr/bin/env python3
+"""
+Structural YAML patches: compute a JSON Patch (RFC 6902 subset) between two
+loaded documents and apply it to the original *text* by splicing only the
+affected nodes.
+
+`make_patch(old, new)` emits `add` / `remove` / `replace` operations with
+JSON-pointer paths (`/entities/LeaveType/attributes/created_by`). Mappings
+are diffed key by key; lists are either appended to (`/-`) or replaced.
+
+`apply_patch(text, ops)` composes the text once, resolves every path to its
+node span (via node marks) and rewrites just those spans, so comments, key
+order, quoting and line endings everywhere else are left untouched and the
+amount of text written is proportional to the change. New values are
+rendered with the pure-Python SafeDumper at the indentation of their parent
+(block sequences indented under their key and multi-line strings as `|`
+blocks, as in our hand-written files).
+
+Operations inside a flow collection (`attr: {type: uuid, required: true}`)
+are merged into one replace of that collection, which is re-rendered on its
+line in flow style.
+
+Usage:
+    python3 yaml_patch.py <file.yaml> <patch.json>        # print the patched text
+    python3 yaml_patch.py <file.yaml> <patch.json> -i     # patch in place
+
+A patch may be a list of operations or a {file: [operations]} mapping, as
+written by fix-ontology.py --format json; a mapping without an entry for
+the file is an error.
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Any
+
+import yaml
+from yaml import MappingNode, ScalarNode, SequenceNode
+
+from fsutil import atomic_write
+from yaml_loader import SafeDumper, YAMLError, compose_all, safe_dump, safe_load
+
+
+class PatchError(Exception):
+    """A patch operation that cannot be applied to the document text."""
+
+
+# =============================================================================
+# PATCH COMPUTATION
+# =============================================================================
+
+
+def _escape(token: Any) -> str:
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def pointer(*tokens: Any) -> str:
+    """JSON pointer for a sequence of mapping keys / list indexes."""
+    return "".join(f"/{_escape(t)}" for t in tokens)
+
+
+def split_pointer(path: str) -> list[str]:
+    if path == "":
+        return []
+    if not path.startswith("/"):
+        raise PatchError(f"invalid JSON pointer: {path!r}")
+    return [_unescape(t) for t in path[1:].split("/")]
+
+
+def make_patch(old: Any, new: Any, path: tuple = ()) -> list[dict]:
+    """Operations turning `old` into `new` (both plain loaded YAML data)."""
+    if isinstance(old, dict) and isinstance(new, dict) and (old.keys() & new.keys() or not path):
+        # (a mapping that keeps none of its keys is replaced whole: removing
+        # every entry would leave a bare `key:` that loads as null)
+        ops = [{"op": "remove", "path": pointer(*path, k)} for k in old if k not in new]
+        for key, value in new.items():
+            if key not in old:
+                ops.append({"op": "add", "path": pointer(*path, key), "value": value})
+            elif old[key] != value:
+                ops += make_patch(old[key], value, path + (key,))
+        return ops
+    if isinstance(old, list) and isinstance(new, list):
+        if old == new:
+            return []
+        if len(new) > len(old) and new[: len(old)] == old:
+            return [{"op": "add", "path": pointer(*path, "-"), "value": v} for v in new[len(old):]]
+    if old == new and type(old) is type(new):
+        return []
+    return [{"op": "replace", "path": pointer(*path), "value": new}]
+
+
+def summarize(ops: list[dict], depth: int = 2) -> dict[str, list[str]]:
+    """Group operations by their first `depth` path tokens (e.g. /entities/<Name>)."""
+    groups: dict[str, list[str]] = {}
+    for op in ops:
+        tokens = split_pointer(op["path"])
+        head, rest = tokens[:depth], tokens[depth:]
+        groups.setdefault(pointer(*head), []).append(f"{op['op']} {pointer(*rest) or '/'}")
+    return groups
+
+
+# =============================================================================
+# RENDERING
+# =============================================================================
+
+
+def _inline(value: Any) -> str:
+    """Single-line YAML for a scalar or empty collection."""
+    text = safe_dump(value, default_flow_style=True, allow_unicode=True, width=float("inf"), sort_keys=False)
+    text = text.rstrip("\n")
+    if text.endswith("\n..."):
+        text = text[: -len("\n...")]
+    return text
+
+
+def _is_block(value: Any) -> bool:
+    return isinstance(value, (dict, list)) and bool(value)
+
+
+class _IndentedDumper(SafeDumper):
+    """SafeDumper that indents block sequences under their key (`key:\n  - item`)
+    and writes multi-line strings as literal blocks (`|`), as in our hand-written files."""
+
+    def increase_indent(self, flow=False, indentless=False):
+        return super().increase_indent(flow, False)
+
+
+def _represent_str(dumper, data):
+    # The emitter falls back to a quoted style when a literal block cannot hold the text
+    return dumper.represent_scalar("tag:yaml.org,2002:str", data, style="|" if "\n" in data else None)
+
+
+_IndentedDumper.add_representer(str, _represent_str)
+
+
+def _block(value: Any, indent: int) -> str:
+    """Block YAML for a value, every line indented by `indent`."""
+    text = yaml.dump(value, Dumper=_IndentedDumper, default_flow_style=False, allow_unicode=True,
+                     sort_keys=False, width=100, indent=2)
+    pad = " " * indent
+    return "\n".join(pad + line if line else line for line in text.rstrip("\n").split("\n"))
+
+
+def render_entry(key: Any, value: Any, indent: int) -> str:
+    """`key: value` at column `indent` (no leading indent on the first line)."""
+    return _block({key: value}, indent)[indent:]
+
+
+def render_item(value: Any, indent: int) -> str:
+    """`- value` at column `indent` (no leading indent on the first line)."""
+    return _block([value], indent)[indent:]
+
+
+def render_document(value: Any) -> str:
+    """A whole document in the same block style as patched nodes."""
+    return (_block(value, 0) if _is_block(value) else _inline(value)) + "\n"
+
+
+def render_value(value: Any, indent: int) -> str:
+    """The text that follows `key:` for a value whose children sit at column `indent`
+    (a leading space for inline values, a newline for block collections)."""
+    return _block({"_": value}, indent - 2)[indent:]
+
+
+# =============================================================================
+# APPLICATION
+# =============================================================================
+
+
+class _Text:
+    """Offsets of the document text (node marks are line/column based)."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.starts = [0]
+        pos = text.find("\n")
+        while pos >= 0:
+            self.starts.append(pos + 1)
+            pos = text.find("\n", pos + 1)
+
+    def index(self, mark) -> int:
+        return self.starts[mark.line] + mark.column if mark.line < len(self.starts) else len(self.text)
+
+    def line_start(self, index: int) -> int:
+        return self.text.rfind("\n", 0, index) + 1
+
+
+def _content_end(node, doc: _Text) -> int:
+    """Offset just after the node's last character (trailing blank/comment lines excluded)."""
+    if isinstance(node, MappingNode) and node.value and node.flow_style is not True:
+        return _content_end(node.value[-1][1], doc)
+    if isinstance(node, SequenceNode) and node.value and node.flow_style is not True:
+        return _content_end(node.value[-1], doc)
+    start, end = doc.index(node.start_mark), doc.index(node.end_mark)
+    return start + len(doc.text[start:end].rstrip())
+
+
+def _past_comment(at: int, doc: _Text) -> int:
+    """`at` moved past a trailing `# comment` on the same line, if that is all that follows."""
+    newline = doc.text.find("\n", at)
+    eol = len(doc.text) if newline < 0 else newline
+    if doc.text[eol - 1:eol] == "\r":
+        eol -= 1
+    rest = doc.text[at:eol].strip()
+    return eol if rest.startswith("#") else at
+
+
+_BLANK_OR_COMMENT = re.compile(r"([ \t]*)(#[^\r\n]*)?\r?\n")
+
+
+def _tidy_block_tail(text: str, at: int, indent: int) -> str:
+    """Make the blank/comment lines after a rendered block (ending at `at`,
+    last line indented `indent`) safe to follow it.
+
+    A literal block (`|`) would take indented blank lines, and comments
+    indented at least as deep as its text, as part of its content: blank
+    lines are emptied and such comments are moved out to `indent - 2`.
+    """
+    newline_at = text.find("\n", at)
+    if newline_at < 0 or text[at:newline_at].strip("\r"):
+        return text
+    pos = newline_at + 1
+    parts = [text[at:pos]]
+    while (match := _BLANK_OR_COMMENT.match(text, pos)):
+        lead, comment = match.group(1), match.group(2)
+        line_end = text[match.end(2) if comment else match.end(1):match.end()]
+        if comment is None:
+            parts.append(line_end)
+        elif len(lead.expandtabs()) >= indent:
+            parts.append(" " * max(indent - 2, 0) + comment + line_end)
+        else:
+            parts.append(match.group())
+        pos = match.end()
+    return text[:at] + "".join(parts) + text[pos:]
+
+
+def _child(node, token: str):
+    """(key_node, value_node) or (None, item_node) for a path token; None if absent."""
+    if isinstance(node, MappingNode):
+        # Last match wins, as when loading a mapping with a duplicated key
+        for key, value in reversed(node.value):
+            if isinstance(key, ScalarNode) and key.value == token:
+                return key, value
+        # Keys that load as non-strings (`OFF:` -> False, `1:` -> 1) are addressed by str(value)
+        for key, value in reversed(node.value):
+            if isinstance(key, ScalarNode) and not key.tag.endswith(":str") and str(safe_load(key.value)) == token:
+                return key, value
+        return None
+    if isinstance(node, SequenceNode):
+        if token.isdigit() and int(token) < len(node.value):
+            return None, node.value[int(token)]
+        return None
+    raise PatchError(f"cannot descend into a scalar at {token!r}")
+
+
+def _resolve(root, tokens: list[str]):
+    node = root
+    for i, token in enumerate(tokens):
+        found = _child(node, token)
+        if found is None:
+            raise PatchError(f"path not found: {pointer(*tokens[: i + 1])}")
+        node = found[1]
+    return node
+
+
+def _block_indent(node, doc: _Text) -> int:
+    """Column of the first child of a block collection."""
+    first = node.value[0][0] if isinstance(node, MappingNode) else node.value[0]
+    return first.start_mark.column
+
+
+def _flow_ancestor(root, tokens: list[str]) -> int | None:
+    """Length of the path to the outermost flow collection strictly above the
+    target of `tokens`, or None when every ancestor is block style."""
+    node = root
+    for depth, token in enumerate(tokens[:-1]):
+        found = _child(node, token)
+        if found is None:
+            return None
+        node = found[1]
+        if isinstance(node, (MappingNode, SequenceNode)) and node.flow_style is True:
+            return depth + 1
+    return None
+
+
+def _lift_flow_ops(root, data: Any, ops: list[dict]) -> list[dict]:
+    """Turn operations inside a flow collection (`attr: {type: x, required: y}`)
+    into one replace of that whole collection, which is re-rendered inline:
+    its text cannot be edited line by line."""
+    lifted: list[dict] = []
+    flows: dict[tuple, dict] = {}
+    for op in ops:
+        tokens = split_pointer(op["path"])
+        depth = _flow_ancestor(root, tokens)
+        if depth is None:
+            lifted.append(op)
+            continue
+        head = tuple(tokens[:depth])
+        if head not in flows:
+            value = data
+            for token in head:
+                value = value[int(token)] if isinstance(value, list) else _key(value, token)
+            flows[head] = {"op": "replace", "path": pointer(*head), "value": copy.deepcopy(value), "flow": True}
+            lifted.append(flows[head])
+        inner = dict(op, path=pointer(*tokens[depth:]))
+        flows[head]["value"] = apply_to_data(flows[head]["value"], [inner])
+    return lifted
+
+
+def _edit_for(root, op: dict, doc: _Text) -> tuple[int, int, str]:
+    """(start, end, replacement) text edit for one operation."""
+    tokens = split_pointer(op["path"])
+    if not tokens:
+        raise PatchError("patching the document root is not supported")
+    parent = _resolve(root, tokens[:-1])
+    last = tokens[-1]
+    kind = op["op"]
+
+    found = None if last == "-" else _child(parent, last)
+    if kind == "replace" or (kind == "add" and found is not None):
+        # Replace an existing value in place
+        if found is None:
+            raise PatchError(f"path not found: {op['path']}")
+        key, node = found
+        start, end = doc.index(node.start_mark), _content_end(node, doc)
+        if op.get("flow"):
+            # A flow collection stays on one line in flow style
+            if key is not None:
+                colon = doc.text.index(":", doc.index(key.end_mark)) + 1
+                return colon, end, " " + _inline(op["value"])
+            return start, end, _inline(op["value"])
+        if key is None and parent.flow_style is not True:
+            # Block item of a sequence: re-render the whole `- item`
+            item_start = doc.text.rfind("-", 0, start)
+            indent = item_start - doc.line_start(item_start)
+            value = render_item(op["value"], indent)
+            if "\n" in value:
+                end = _past_comment(end, doc)
+            return item_start, end, value
+        if key is not None:
+            # Rewrite from just after `key:` so block/inline style can change
+            colon = doc.text.index(":", doc.index(key.end_mark)) + 1
+            indent = key.start_mark.column + 2
+            value = render_value(op["value"], indent)
+            if "\n" in value:
+                # A trailing comment cannot follow a block value's last line
+                end = _past_comment(end, doc)
+            return colon, end, value
+        return start, end, _inline(op["value"])
+
+    if kind == "add":
+        if isinstance(parent, MappingNode):
+            entry_key = last
+            if parent.flow_style is True or not parent.value:
+                raise PatchError(f"cannot add to an empty or flow mapping at {op['path']}")
+            indent = _block_indent(parent, doc)
+            at = _past_comment(_content_end(parent, doc), doc)
+            return at, at, "\n" + " " * indent + render_entry(entry_key, op["value"], indent)
+        if isinstance(parent, SequenceNode):
+            if last != "-":
+                raise PatchError(f"only appends (/-) are supported for lists: {op['path']}")
+            if parent.flow_style is True or not parent.value:
+                raise PatchError(f"cannot append to an empty or flow list at {op['path']}")
+            first = parent.value[0]
+            dash = doc.text.rfind("-", 0, doc.index(first.start_mark))
+            indent = dash - doc.line_start(dash)
+            at = _past_comment(_content_end(parent, doc), doc)
+            return at, at, "\n" + " " * indent + render_item(op["value"], indent)
+        raise PatchError(f"cannot add below a scalar: {op['path']}")
+
+    if kind == "remove":
+        if found is None:
+            raise PatchError(f"path not found: {op['path']}")
+        key, node = found
+        anchor = key if key is not None else node
+        start = doc.line_start(doc.index(anchor.start_mark))
+        end = _content_end(node, doc)
+        newline = doc.text.find("\n", end)
+        return start, len(doc.text) if newline < 0 else newline + 1, ""
+
+    raise PatchError(f"unsupported operation: {kind}")
+
+
+def apply_patch(text: str, ops: list[dict], verify: bool = True) -> str:
+    """Apply operations to YAML text, rewriting only the affected node spans.
+
+    Paths must not overlap (as produced by make_patch). With `verify`, the
+    result is re-loaded and compared with the patch applied to the data.
+    """
+    if not ops:
+        return text
+    docs = list(compose_all(text))
+    if len(docs) != 1:
+        raise PatchError(f"expected exactly one YAML document, found {len(docs)}")
+    doc = _Text(text)
+    newline = "\r\n" if "\r\n" in text else "\n"
+    data = safe_load(text)
+    ops = _lift_flow_ops(docs[0], data, ops)
+
+    edits = []
+    for order, op in enumerate(ops):
+        start, end, replacement = _edit_for(docs[0], op, doc)
+        edits.append((start, end, order, replacement.replace("\n", newline)))
+    # An entry added after the last entry of a mapping lands on the line of that
+    # entry; when that line is removed, insert before its line break instead
+    removed = [(start, end) for start, end, _, replacement in edits if end > start and not replacement]
+    for i, (start, end, order, replacement) in enumerate(edits):
+        if start != end:
+            continue
+        moved = True
+        while moved:
+            moved = False
+            for r_start, r_end in removed:
+                if r_start < start < r_end:
+                    start = r_start - 1
+                    if text[start - 1:start] == "\r":
+                        start -= 1
+                    moved = True
+        edits[i] = (start, start, order, replacement)
+    edits.sort(key=lambda e: (e[0], e[2]))
+    for (s1, e1, _, _), (s2, _, _, _) in zip(edits, edits[1:]):
+        if s2 < e1:
+            raise PatchError("overlapping patch operations")
+
+    parts, pos, size, block_ends = [], 0, 0, []
+    for start, end, _, replacement in edits:
+        parts.append(text[pos:start])
+        parts.append(replacement)
+        size += start - pos + len(replacement)
+        if newline in replacement.lstrip(newline):
+            last_line = replacement.rsplit("\n", 1)[-1]
+            block_ends.append((size, len(last_line) - len(last_line.lstrip(" "))))
+        pos = end
+    parts.append(text[pos:])
+    result = "".join(parts)
+    for at, indent in reversed(block_ends):
+        result = _tidy_block_tail(result, at, indent)
+
+    if verify:
+        expected = apply_to_data(data, ops)
+        try:
+            patched = safe_load(result)
+        except YAMLError as e:
+            raise PatchError(f"patched text is not valid YAML: {' '.join(str(e).split())}") from None
+        if patched != expected:
+            raise PatchError("patched text does not load to the expected data")
+    return result
+
+
+def apply_to_data(data: Any, ops: list[dict]) -> Any:
+    """Apply operations to a copy of loaded data and return it."""
+    data = copy.deepcopy(data)
+    for op in ops:
+        tokens = split_pointer(op["path"])
+        target = data
+        for token in tokens[:-1]:
+            target = target[int(token)] if isinstance(target, list) else _key(target, token)
+        last = tokens[-1]
+        if isinstance(target, list):
+            if op["op"] == "add" and last == "-":
+                target.append(op["value"])
+            elif op["op"] == "remove":
+                del target[int(last)]
+            else:
+                target[int(last)] = op["value"]
+        else:
+            key = _key_name(target, last)
+            if op["op"] == "remove":
+                del target[key]
+            else:
+                target[key] = op["value"]
+    return data
+
+
+def _key_name(mapping: dict, token: str) -> Any:
+    for key in mapping:
+        if str(key) == token:
+            return key
+    return token
+
+
+def _key(mapping: dict, token: str) -> Any:
+    return mapping[_key_name(mapping, token)]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Apply a JSON patch to a YAML file, touching only changed nodes.")
+    parser.add_argument("file", type=Path)
+    parser.add_argument("patch", type=Path, help="JSON list of operations, or {file: [operations]}")
+    parser.add_argument("-i", "--in-place", action="store_true", help="Rewrite the file instead of printing it")
+    args = parser.parse_args()
+
+    ops = json.loads(args.patch.read_text(encoding="utf-8"))
+    if isinstance(ops, dict):
+        # A mapping must name the file; an empty list under its key means nothing to do
+        key = next((k for k in ops if k in (str(args.file), args.file.name)
+                    or Path(k).resolve() == args.file.resolve()), None)
+        if key is None:
+            print(f"[ERROR] {args.patch} has no operations for {args.file}; "
+                  f"files in the patch: {', '.join(ops) or '(none)'}", file=sys.stderr)
+            return 1
+        ops = ops[key]
+    with open(args.file, encoding="utf-8", newline="") as f:
+        text = f.read()
+    try:
+        result = apply_patch(text, ops)
+    except PatchError as e:
+        print(f"[ERROR] {args.file}: {e}", file=sys.stderr)
+        return 1
+    if args.in_place:
+        atomic_write(args.file, result)
+        print(f"[OK] {args.file}: {len(ops)} operation(s) applied")
+    else:
+        sys.stdout.write(result)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Round-trip YAML documents: edit the loaded data, write back only what changed.
+
+`RoundTripDocument` keeps the original text next to the loaded data. On
+`dumps()`/`save()` the data is diffed against what was loaded
+(`yaml_patch.make_patch`) and only the changed nodes are spliced into the
+original text, so comments, key order, quoting, blank lines and line endings
+elsewhere survive and the amount written is proportional to the edit. A
+document with no changes is written back byte for byte.
+
+    doc = RoundTripDocument.load(path)
+    doc.data['entities']['LeaveType']['attributes']['created_by'] = {...}
+    doc.save()                      # rewrites one entry, keeps everything else
+
+New documents (`RoundTripDocument.new`) are rendered once in our block style
+with an optional comment header; later saves of the same file then go
+through the minimal-edit path, so hand-added comments are kept on re-runs.
+
+Usage:
+    python3 yaml_roundtrip.py <file.yaml> ...    # check each file round-trips unchanged
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import sys
+from pathlib import Path
+from typing import Any
+
+from fsutil import atomic_write
+from yaml_loader import YAMLError, safe_load
+from yaml_patch import PatchError, apply_patch, make_patch, render_document, summarize
+
+
+class RoundTripDocument:
+    """Loaded YAML data plus the text it came from."""
+
+    def __init__(self, text: str, path: str | Path | None = None):
+        self.path = Path(path) if path is not None else None
+        self.text = text
+        self.data = safe_load(text)
+        self._loaded = copy.deepcopy(self.data)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "RoundTripDocument":
+        # newline='' keeps CRLF files CRLF on the way back out
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            return cls(f.read(), path)
+
+    @classmethod
+    def new(cls, data: Any, path: str | Path | None = None, header: str = "",
+            newline: str = "\n") -> "RoundTripDocument":
+        """A document rendered from scratch, `header` (comment lines) first."""
+        text = header + render_document(data)
+        return cls(text.replace("\n", newline) if newline != "\n" else text, path)
+
+    @classmethod
+    def open(cls, path: str | Path, default: Any, header: str = "") -> "RoundTripDocument":
+        """Load `path` if it exists, else start a new document from `default`."""
+        path = Path(path)
+        if path.exists():
+            return cls.load(path)
+        return cls.new(default, path, header)
+
+    def changes(self) -> list[dict]:
+        """JSON patch from the loaded data to the current data."""
+        return make_patch(self._loaded, self.data)
+
+    @property
+    def modified(self) -> bool:
+        return self.data != self._loaded
+
+    def summary(self) -> dict[str, list[str]]:
+        return summarize(self.changes())
+
+    def dumps(self) -> str:
+        """The original text with only the changed nodes re-serialized."""
+        return apply_patch(self.text, self.changes())
+
+    def save(self, path: str | Path | None = None, force: bool = False) -> bool:
+        """Write the document atomically; returns False when nothing needed writing.
+
+        An unmodified document is only written when it goes to a different
+        path, does not exist yet, or `force` is set.
+        """
+        target = Path(path) if path is not None else self.path
+        if target is None:
+            raise ValueError("no path to save the document to")
+        text = self.dumps()
+        if not force and target == self.path and target.exists() and text == self.text:
+            return False
+        atomic_write(target, text)
+        self.path, self.text, self._loaded = target, text, copy.deepcopy(self.data)
+        return True
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check YAML files round-trip through RoundTripDocument unchanged.")
+    parser.add_argument("paths", nargs="+", type=Path)
+    args = parser.parse_args()
+
+    failures = 0
+    for path in args.paths:
+        try:
+            doc = RoundTripDocument.load(path)
+            same = doc.dumps() == doc.text
+        except (YAMLError, PatchError) as e:
+            print(f"[WARN] {path}: {str(e).splitlines()[0]}")
+            continue
+        failures += not same
+        print(f"[{'OK' if same else 'ERROR'}] {path}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())